@@ -11,6 +11,9 @@ Voraussetzungen:
 - Python 3.x
 - pywin32: pip install pywin32
 
+Ohne SolidWorks (z.B. Linux-CI) kann das Modul mit dem Simulator-Backend
+aus sw_simulator.py verwendet werden.
+
 Verwendung:
     from sw_automation import SolidWorksAutomation
 
@@ -20,16 +23,69 @@ Verwendung:
     sw.save()
 """
 
+import contextlib
+import csv
+import hashlib
+import heapq
+import inspect
+import json
 import math
+import os
+import random
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
 
 try:
     import win32com.client
     import pythoncom
+    import win32api
+    import win32process
+except ImportError:
+    # pywin32 wird erst beim Verbinden über das COM-Backend benötigt
+    win32com = None
+    pythoncom = None
+    win32api = None
+    win32process = None
+
+try:
+    import numpy as np
 except ImportError:
-    raise ImportError("pywin32 nicht installiert. Bitte ausführen: pip install pywin32")
+    # NumPy beschleunigt Geometrie-Abfragen, ist aber optional
+    np = None
+
+try:
+    import psutil
+except ImportError:
+    # Nur für Prozessmessungen (Speicherbudgets, Instanz-Recycling) benötigt
+    psutil = None
 
 # Null-IDispatch für COM-Aufrufe (ersetzt None bei Object-Parametern)
-_COM_NULL = win32com.client.VARIANT(pythoncom.VT_DISPATCH, None)
+_COM_NULL = win32com.client.VARIANT(pythoncom.VT_DISPATCH, None) if win32com else None
+
+# HRESULTs eines beschäftigten COM-Servers (z.B. SolidWorks beim Rebuild)
+RPC_E_CALL_REJECTED = -2147418111          # 0x80010001
+RPC_E_SERVERCALL_RETRYLATER = -2147417846  # 0x8001010A
+
+# HRESULTs einer abgestürzten bzw. beendeten Instanz
+RPC_S_SERVER_UNAVAILABLE = -2147023174     # 0x800706BA
+RPC_S_CALL_FAILED = -2147023170            # 0x800706BE
+RPC_E_DISCONNECTED = -2147417848           # 0x80010108
+
+# HRESULTs für Methoden, die diese SolidWorks-Version nicht kennt
+DISP_E_MEMBERNOTFOUND = -2147352573        # 0x80020003
+DISP_E_UNKNOWNNAME = -2147352570           # 0x80020006
+
+
+def _missing_member(error: Exception) -> bool:
+    """True, wenn error eine fehlende COM-Methode meldet (und keinen anderen Fehler)."""
+    if isinstance(error, AttributeError):
+        return True
+    return getattr(error, "hresult", None) in (DISP_E_MEMBERNOTFOUND, DISP_E_UNKNOWNNAME)
 
 
 def mm_to_m(mm: float) -> float:
@@ -42,6 +98,364 @@ def deg_to_rad(deg: float) -> float:
     return deg * math.pi / 180.0
 
 
+def com_value(obj, name: str):
+    """
+    Liest einen parameterlosen Wert wie GetTitle oder GetType.
+
+    Dynamisches Dispatch liefert diese als Eigenschaft, Early Binding
+    (makepy) als Methode - beide Varianten werden unterstützt.
+    """
+    value = getattr(obj, name)
+    return value() if callable(value) else value
+
+
+# =============================================================================
+# Geometrie-Kernel (Punktgeneratoren)
+# =============================================================================
+#
+# Erzeugt Punktmengen für Sketches in einem Schritt statt Punkt für Punkt.
+# Mit NumPy sind alle Ergebnisse float64-Arrays der Form (n, 2) bzw. (n, 6);
+# ohne NumPy Listen von Tupeln mit denselben Werten. Koordinaten in mm.
+
+
+def to_meters(values):
+    """
+    Konvertiert mm-Werte zu Meter (Skalar, Liste von Punkten oder Array).
+
+    Mit NumPy wird immer ein float64-Array zurückgegeben.
+    """
+    if np is not None:
+        return np.asarray(values, dtype=float) / 1000.0
+    if isinstance(values, (int, float)):
+        return values / 1000.0
+    return [to_meters(v) for v in values]
+
+
+def circle_points(cx: float, cy: float, radius: float, count: int,
+                  start_angle: float = 0.0):
+    """
+    Gleichmäßig verteilte Punkte auf einem Kreis (z.B. Lochkreis).
+
+    Args:
+        cx, cy: Zentrum in mm
+        radius: Radius in mm
+        count: Anzahl Punkte
+        start_angle: Winkel des ersten Punkts in Grad (gegen Uhrzeigersinn)
+    """
+    if np is not None:
+        angles = np.deg2rad(start_angle) + np.arange(count) * (2 * math.pi / count)
+        return np.column_stack((cx + radius * np.cos(angles), cy + radius * np.sin(angles)))
+    start = deg_to_rad(start_angle)
+    step = 2 * math.pi / count
+    return [(cx + radius * math.cos(start + i * step), cy + radius * math.sin(start + i * step))
+            for i in range(count)]
+
+
+def polygon_points(cx: float, cy: float, radius: float, sides: int):
+    """Eckpunkte eines regelmäßigen Polygons (Umkreis radius, erste Ecke unten)."""
+    return circle_points(cx, cy, radius, sides, start_angle=-90.0)
+
+
+def rect_grid(nx: int, ny: int, dx: float, dy: float = None,
+              cx: float = 0.0, cy: float = 0.0):
+    """
+    Rechteckiges Punktraster, zentriert um (cx, cy).
+
+    Args:
+        nx, ny: Anzahl Spalten und Zeilen
+        dx, dy: Abstand in X und Y in mm (dy Standard: dx)
+
+    Reihenfolge: zeilenweise von unten links (X läuft innen).
+    """
+    dy = dx if dy is None else dy
+    x0 = cx - (nx - 1) * dx / 2
+    y0 = cy - (ny - 1) * dy / 2
+    if np is not None:
+        xs, ys = np.meshgrid(x0 + np.arange(nx) * dx, y0 + np.arange(ny) * dy)
+        return np.column_stack((xs.ravel(), ys.ravel()))
+    return [(x0 + i * dx, y0 + j * dy) for j in range(ny) for i in range(nx)]
+
+
+def hex_grid(nx: int, ny: int, pitch: float, cx: float = 0.0, cy: float = 0.0):
+    """
+    Hexagonales Punktraster (jede zweite Zeile um pitch/2 versetzt).
+
+    Args:
+        nx, ny: Punkte pro Zeile und Anzahl Zeilen
+        pitch: Abstand benachbarter Punkte in mm (Zeilenabstand pitch*sqrt(3)/2)
+        cx, cy: Zentrum des Rasters in mm
+    """
+    dy = pitch * math.sqrt(3) / 2
+    shift = pitch / 2 if ny > 1 else 0.0
+    x0 = cx - ((nx - 1) * pitch + shift) / 2
+    y0 = cy - (ny - 1) * dy / 2
+    if np is not None:
+        xs, ys = np.meshgrid(np.arange(nx) * pitch, np.arange(ny) * dy)
+        xs = xs + (np.arange(ny) % 2)[:, None] * shift
+        return np.column_stack((x0 + xs.ravel(), y0 + ys.ravel()))
+    return [(x0 + i * pitch + (j % 2) * shift, y0 + j * dy)
+            for j in range(ny) for i in range(nx)]
+
+
+def _line_rows(points, closed: bool = False) -> list:
+    """Argumente für CreateLine (x1, y1, 0, x2, y2, 0 in m) je Segment."""
+    if np is not None:
+        p = to_meters(points).reshape(-1, 2)
+        q = np.roll(p, -1, axis=0) if closed else p[1:]
+        if not closed:
+            p = p[:-1]
+        zeros = np.zeros(len(p))
+        return np.column_stack((p[:, 0], p[:, 1], zeros, q[:, 0], q[:, 1], zeros)).tolist()
+    p = [(x / 1000.0, y / 1000.0) for x, y in points]
+    q = p[1:] + p[:1] if closed else p[1:]
+    return [(x1, y1, 0.0, x2, y2, 0.0) for (x1, y1), (x2, y2) in zip(p, q)]
+
+
+def _spline_buffer(points):
+    """
+    Flacher Punktpuffer (x, y, z, x, y, z, ...) in m für CreateSpline2.
+
+    Args:
+        points: (x, y)-Paare in mm oder flacher Puffer (x0, y0, x1, y1, ...)
+
+    Mit NumPy entsteht der Puffer in einem Schritt als float64-memoryview;
+    Eingaben mit Buffer-Protokoll werden dabei nicht kopiert. Ohne NumPy
+    wird eine Liste zurückgegeben.
+    """
+    if np is not None:
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xyz = np.zeros((len(xy), 3))
+        np.multiply(xy, 0.001, out=xyz[:, :2])
+        return memoryview(xyz.reshape(-1))
+
+    point_data = []
+    for x, y in _spline_pairs(points):
+        point_data.extend((x / 1000.0, y / 1000.0, 0.0))
+    return point_data
+
+
+def _spline_pairs(points) -> list:
+    """(x, y)-Paare aus einer Punktliste oder einem flachen Double-Puffer."""
+    try:
+        flat = memoryview(points).cast("B").cast("d")
+    except TypeError:
+        return [(x, y) for x, y in points]
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+class DecimationStats:
+    """Ergebnis einer Punktreduktion (siehe decimate_points)."""
+
+    def __init__(self, method: str, tolerance: float, input_points: int,
+                 kept_points: int, max_deviation: float):
+        self.method = method
+        self.tolerance = tolerance
+        self.input_points = input_points
+        self.kept_points = kept_points
+        self.max_deviation = max_deviation
+
+    @property
+    def ratio(self) -> float:
+        """Anteil der behaltenen Punkte (0..1)."""
+        return self.kept_points / self.input_points if self.input_points else 1.0
+
+    def __repr__(self):
+        return (f"DecimationStats({self.method}: {self.kept_points}/{self.input_points} Punkte, "
+                f"max. Abweichung {self.max_deviation:.4f} mm, Toleranz {self.tolerance} mm)")
+
+
+DECIMATION_METHODS = ("douglas-peucker", "curvature")
+
+
+def decimate_points(points, tolerance: float, method: str = "douglas-peucker",
+                    closed: bool = False):
+    """
+    Reduziert eine dichte Punktfolge innerhalb einer Sehnentoleranz.
+
+    Kein entfernter Punkt liegt weiter als tolerance vom Linienzug durch die
+    behaltenen Punkte entfernt; ein Spline durch diese Punkte liegt in der
+    Regel noch näher an der Originalkurve.
+
+    Args:
+        points: (x, y)-Paare in mm oder Array der Form (n, 2)
+        tolerance: Sehnentoleranz in mm
+        method: "douglas-peucker" oder "curvature" (Punktabstand nach lokaler
+                Krümmung, Überschreitungen anschließend per Douglas-Peucker
+                verfeinert)
+        closed: True = geschlossene Kurve (letzter Punkt schließt an den ersten an)
+
+    Returns:
+        (Punkte, DecimationStats) - Punkte als Array (n, 2) mit NumPy,
+        sonst als Liste von Tupeln
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Unbekannte Methode: {method} (verfügbar: {', '.join(DECIMATION_METHODS)})")
+    if tolerance <= 0:
+        raise ValueError("Toleranz muss größer als 0 sein.")
+
+    if np is not None:
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    else:
+        xy = [(float(x), float(y)) for x, y in points]
+    count = len(xy)
+    if count < (4 if closed else 3):
+        return xy, DecimationStats(method, tolerance, count, count, 0.0)
+
+    # Geschlossene Kurven: Startpunkt am Ende wiederholen (wird wieder entfernt)
+    work = (np.vstack((xy, xy[:1])) if np is not None else xy + xy[:1]) if closed else xy
+    last = len(work) - 1
+    if method == "curvature":
+        keep = _curvature_keep(work, tolerance)
+    else:
+        keep = [0, last]
+
+    # Douglas-Peucker für jeden Abschnitt, der die Toleranz überschreitet
+    refined = [0]
+    deviation = 0.0
+    for a, b in zip(keep, keep[1:]):
+        section = _douglas_peucker(work, a, b, tolerance)
+        refined.extend(section[1:])
+        for i, j in zip(section, section[1:]):
+            deviation = max(deviation, _farthest(work, i, j)[1])
+    if closed:
+        refined.pop()
+
+    kept = xy[refined] if np is not None else [xy[i] for i in refined]
+    return kept, DecimationStats(method, tolerance, count, len(refined), deviation)
+
+
+def _farthest(xy, a: int, b: int) -> tuple:
+    """Punkt zwischen a und b mit dem größten Abstand zur Strecke a-b: (Index, Abstand)."""
+    if b - a < 2:
+        return a, 0.0
+    if np is not None:
+        start, d = xy[a], xy[b] - xy[a]
+        p = xy[a + 1:b] - start
+        length2 = float(d @ d)
+        t = np.clip(p @ d / length2, 0.0, 1.0) if length2 > 0 else np.zeros(len(p))
+        dist = np.hypot(p[:, 0] - t * d[0], p[:, 1] - t * d[1])
+        k = int(dist.argmax())
+        return a + 1 + k, float(dist[k])
+
+    (ax, ay), (bx, by) = xy[a], xy[b]
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    best, best_dist = a, -1.0
+    for k in range(a + 1, b):
+        px, py = xy[k][0] - ax, xy[k][1] - ay
+        t = min(1.0, max(0.0, (px * dx + py * dy) / length2)) if length2 > 0 else 0.0
+        dist = math.hypot(px - t * dx, py - t * dy)
+        if dist > best_dist:
+            best, best_dist = k, dist
+    return best, best_dist
+
+
+def _douglas_peucker(xy, a: int, b: int, tolerance: float) -> list:
+    """
+    Douglas-Peucker (iterativ) zwischen den Indizes a und b; sortierte Indizes.
+
+    Liegt der entfernteste Punkt im äußeren Achtel des Abschnitts, wird
+    stattdessen in der Mitte geteilt. Jede Teilung verkürzt den Abschnitt so
+    um mindestens ein Achtel, die Tiefe bleibt O(log n) und die Laufzeit
+    O(n log n) - auch für Eingaben wie einen Zickzack mit wachsender
+    Amplitude, bei denen das klassische Verfahren pro Schritt nur einen
+    Punkt abspaltet (O(n²)). Die Toleranz gilt weiterhin; die zusätzliche
+    Mitte ist höchstens ein Punkt mehr pro unausgewogener Teilung.
+    """
+    keep = {a, b}
+    stack = [(a, b)]
+    while stack:
+        i, j = stack.pop()
+        k, dist = _farthest(xy, i, j)
+        if dist > tolerance:
+            if min(k - i, j - k) < (j - i) // 8:
+                k = (i + j) // 2
+            keep.add(k)
+            stack.append((i, k))
+            stack.append((k, j))
+    return sorted(keep)
+
+
+def _curvature_keep(xy, tolerance: float) -> list:
+    """
+    Wählt Punkte nach lokaler Krümmung.
+
+    Eine Sehne der Länge L über einem Bogen mit Krümmung k weicht um etwa
+    k * L² / 8 ab; der Punktabstand wird daher auf sqrt(8 * tolerance / k)
+    begrenzt.
+    """
+    if np is not None:
+        seg = np.diff(xy, axis=0)
+        lengths = np.hypot(seg[:, 0], seg[:, 1])
+        heading = np.arctan2(seg[:, 1], seg[:, 0])
+        turn = np.abs((np.diff(heading) + math.pi) % (2 * math.pi) - math.pi)
+        curvature = turn / np.maximum((lengths[:-1] + lengths[1:]) / 2, 1e-12)
+        allowed = np.sqrt(8 * tolerance / np.maximum(curvature, 1e-12))
+        lengths, allowed = lengths.tolist(), allowed.tolist()
+    else:
+        lengths, heading = [], []
+        for (x1, y1), (x2, y2) in zip(xy, xy[1:]):
+            lengths.append(math.hypot(x2 - x1, y2 - y1))
+            heading.append(math.atan2(y2 - y1, x2 - x1))
+        allowed = []
+        for i in range(len(heading) - 1):
+            turn = abs((heading[i + 1] - heading[i] + math.pi) % (2 * math.pi) - math.pi)
+            curvature = turn / max((lengths[i] + lengths[i + 1]) / 2, 1e-12)
+            allowed.append(math.sqrt(8 * tolerance / max(curvature, 1e-12)))
+
+    keep = [0]
+    run, limit = 0.0, math.inf
+    for k in range(1, len(lengths)):
+        run += lengths[k - 1]
+        limit = min(limit, allowed[k - 1])
+        if run + lengths[k] > limit:
+            keep.append(k)
+            run, limit = 0.0, math.inf
+    keep.append(len(lengths))
+    return keep
+
+
+def _three_point_arc(x1: float, y1: float, x2: float, y2: float,
+                     x3: float, y3: float) -> tuple:
+    """Bogen durch drei Punkte als Profil-Element ("arc", ...) bzw. Linie."""
+    d = 2 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+    if abs(d) < 1e-12:
+        return ("line", x1, y1, x3, y3)
+    s1, s2, s3 = x1 * x1 + y1 * y1, x2 * x2 + y2 * y2, x3 * x3 + y3 * y3
+    cx = (s1 * (y2 - y3) + s2 * (y3 - y1) + s3 * (y1 - y2)) / d
+    cy = (s1 * (x3 - x2) + s2 * (x1 - x3) + s3 * (x2 - x1)) / d
+    a1, a2, a3 = (math.atan2(y - cy, x - cx) for x, y in ((x1, y1), (x2, y2), (x3, y3)))
+    sweep = (a3 - a1) % (2 * math.pi)
+    if (a2 - a1) % (2 * math.pi) > sweep:
+        sweep -= 2 * math.pi   # Mittelpunkt liegt im Uhrzeigersinn
+    return ("arc", cx, cy, math.hypot(x1 - cx, y1 - cy), a1, sweep)
+
+
+def _double_array(values):
+    """Übergibt Gleitkommazahlen als SAFEARRAY von Double (VT_ARRAY | VT_R8)."""
+    if win32com is None:
+        return values
+    return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, values)
+
+
+def _string_array(values):
+    """Übergibt Zeichenketten als SAFEARRAY von BSTR (VT_ARRAY | VT_BSTR)."""
+    if win32com is None:
+        return tuple(values)
+    return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_BSTR, list(values))
+
+
+def _circle_rows(centers, radius: float) -> list:
+    """Argumente für CreateCircle (Zentrum und Punkt auf dem Kreis in m)."""
+    if np is not None:
+        c = to_meters(centers).reshape(-1, 2)
+        zeros = np.zeros(len(c))
+        return np.column_stack((c[:, 0], c[:, 1], zeros,
+                                c[:, 0] + radius / 1000.0, c[:, 1], zeros)).tolist()
+    r = radius / 1000.0
+    return [(x / 1000.0, y / 1000.0, 0.0, x / 1000.0 + r, y / 1000.0, 0.0) for x, y in centers]
+
+
 # SolidWorks Konstanten (swconst)
 class SwConst:
     """SolidWorks API Konstanten."""
@@ -74,59 +488,1638 @@ class SwConst:
     swSelEDGES = 1
     swSelVERTICES = 3
 
+    # Curve Types (swCurveTypes_e)
+    LINE_TYPE = 3001
+    CIRCLE_TYPE = 3002
+    ELLIPSE_TYPE = 3003
+    BCURVE_TYPE = 3005
+
+    # Sketch Slot (CreateSketchSlot)
+    swSketchSlotCreationType_line = 0
+    swSketchSlotLengthType_CenterCenter = 0
+
+    # User Preference Toggles
+    swSketchInference = 246
+    swInputDimValOnCreate = 10
+
+    # Configurations (swConfigurationOptions2_e, swSetValueInConfiguration_e)
+    swConfigOption_DontActivate = 128
+    swSetValue_InAllConfigurations = 2
+    swSetValue_InSpecificConfigurations = 3
+
+    # Save As Options (swSaveAsOptions_e)
+    swSaveAsOptions_Silent = 1
+    swSaveAsOptions_Copy = 2
+
+    # Rebuild on Activation (ActivateDoc3)
+    swDontRebuildActiveDoc = 1
+
+    # Macro Options (RunMacro2)
+    swRunMacroDefault = 0
+    swRunMacroUnloadAfterRun = 1
+
+
+class ProcessSample:
+    """
+    Ressourcenstand des SolidWorks-Prozesses.
+
+    Attributes:
+        rss: Arbeitsspeicher in Bytes
+        handles: Kernel-Handles (None = unbekannt)
+        gdi: GDI-Objekte (None = unbekannt)
+        user: USER-Objekte (None = unbekannt)
+    """
+
+    __slots__ = ("rss", "handles", "gdi", "user")
+
+    def __init__(self, rss: int, handles: int = None, gdi: int = None, user: int = None):
+        self.rss = rss
+        self.handles = handles
+        self.gdi = gdi
+        self.user = user
+
+    def __repr__(self):
+        return (f"ProcessSample({self.rss / 1024 ** 2:.0f} MB, handles={self.handles}, "
+                f"gdi={self.gdi}, user={self.user})")
+
+
+class SolidWorksBackend:
+    """
+    Basisklasse für Backends unterhalb von SolidWorksConnection.
+
+    Ein Backend liefert das SldWorks.Application-Objekt. Alle weiteren
+    Objekte (ModelDoc2, SketchManager, ...) werden davon abgeleitet.
+    """
+
+    name = "abstract"
+
+    def connect(self):
+        """Gibt das SldWorks.Application-Objekt zurück."""
+        raise NotImplementedError
+
+    def wrap(self, obj, interface: str):
+        """
+        Bindet ein Objekt an ein Interface (z.B. "IModelDoc2").
+
+        Standard: Objekt unverändert zurückgeben.
+        """
+        return obj
+
+    def close(self):
+        """Gibt vom Backend gehaltene Ressourcen frei (Standard: nichts)."""
+
+    def process_sample(self, app) -> ProcessSample:
+        """Misst den SolidWorks-Prozess (Standard: None = nicht messbar)."""
+        return None
+
+
+# Typbibliothek sldworks.tlb (SldWorks 20xx Type Library)
+SW_TYPELIB_GUID = "{83A33D31-27C5-11CE-BFD4-00400513BB57}"
+
+# Standardverzeichnis für vorgenerierte makepy-Wrapper
+DEFAULT_TYPELIB_CACHE = os.environ.get(
+    "SW_TYPELIB_CACHE",
+    os.path.join(os.path.expanduser("~"), ".sw_automation", "gen_py")
+)
+
+
+class ComBackend(SolidWorksBackend):
+    """
+    Backend für eine laufende SolidWorks-Instanz über pywin32 (COM).
+
+    Args:
+        prog_id: ProgID der SolidWorks-Anwendung
+        early_bound: True = vorgenerierte makepy-Wrapper verwenden
+                     (ISldWorks, IModelDoc2, ISketchManager, ...)
+        cache_dir: Basisverzeichnis der Wrapper; pro SolidWorks-Version
+                   wird ein Unterverzeichnis verwendet (z.B. .../31)
+        new_instance: True = eigene SolidWorks-Instanz per DispatchEx
+                      starten (z.B. für Worker-Prozesse); wird beim ersten
+                      connect() erzeugt und mit close() beendet
+        visible: Sichtbarkeit einer neu gestarteten Instanz
+    """
+
+    name = "com"
+
+    def __init__(self, prog_id: str = "SldWorks.Application",
+                 early_bound: bool = False, cache_dir: str = None,
+                 new_instance: bool = False, visible: bool = False):
+        self.prog_id = prog_id
+        self.early_bound = early_bound
+        self.cache_dir = cache_dir or DEFAULT_TYPELIB_CACHE
+        self.new_instance = new_instance
+        self.visible = visible
+        self.binding = "dynamic"
+        self._typelib_module = None
+        self._instance = None
+        self._pid = None
+
+    def connect(self):
+        """Verbindet per Dispatch mit der laufenden SolidWorks-Instanz."""
+        if win32com is None:
+            raise ImportError("pywin32 nicht installiert. Bitte ausführen: pip install pywin32")
+        if self._instance is not None:
+            return self._instance
+        if self.new_instance:
+            app = win32com.client.DispatchEx(self.prog_id)
+            app.Visible = self.visible
+            # Für close(): hängende Instanz notfalls per Prozess-ID beenden
+            with contextlib.suppress(Exception):
+                self._pid = app.GetProcessID()
+        else:
+            app = win32com.client.Dispatch(self.prog_id)
+        self.binding = "dynamic"
+        if self.early_bound:
+            major = self._typelib_version(app)
+            if self._load_typelib(major):
+                self.binding = "early"
+                app = self.wrap(app, "ISldWorks")
+            else:
+                print(f"Kein Typelib-Cache für SolidWorks {major} in {self.cache_dir} "
+                      "- verwende dynamisches Dispatch")
+        if self.new_instance:
+            self._instance = app
+        return app
+
+    def close(self):
+        """
+        Beendet eine mit new_instance=True gestartete Instanz.
+
+        Reagiert die Instanz nicht mehr auf ExitApp, wird der Prozess
+        beendet, sofern seine Prozess-ID (aus connect() bzw.
+        process_sample()) bekannt ist.
+        """
+        if self._instance is not None:
+            try:
+                self._instance.ExitApp()
+            except Exception:
+                if self._pid is None or psutil is None:
+                    raise
+                psutil.Process(self._pid).kill()
+            finally:
+                self._instance = None
+                self._pid = None
+
+    def process_sample(self, app) -> ProcessSample:
+        """
+        Misst Speicher und Handles des SolidWorks-Prozesses.
+
+        Benötigt psutil; GDI-/USER-Objekte werden über pywin32 gelesen.
+        """
+        if psutil is None:
+            return None
+        pid = app.GetProcessID()
+        if self.new_instance:
+            self._pid = pid
+        process = psutil.Process(pid)
+        rss = process.memory_info().rss
+        handles = process.num_handles() if hasattr(process, "num_handles") else None
+        gdi = user = None
+        if win32process is not None:
+            # PROCESS_QUERY_INFORMATION
+            handle = win32api.OpenProcess(0x0400, False, pid)
+            try:
+                gdi = win32process.GetGuiResources(handle, 0)
+                user = win32process.GetGuiResources(handle, 1)
+            finally:
+                handle.Close()
+        return ProcessSample(rss, handles, gdi, user)
+
+    def wrap(self, obj, interface: str):
+        """Castet obj im Early-Binding-Modus auf das Interface."""
+        if self.binding != "early" or obj is None:
+            return obj
+        # Klasse direkt aus dem geladenen Modul: CastTo würde den globalen
+        # gencache-Zustand benötigen, der nach dem Laden wiederhergestellt ist
+        target = getattr(self._typelib_module, interface, None)
+        if target is None:
+            return obj
+        try:
+            return target(getattr(obj, "_oleobj_", obj))
+        except Exception:
+            return obj
+
+    @staticmethod
+    def _typelib_version(app) -> int:
+        """Hauptversion der Typbibliothek (= SolidWorks-Revision, z.B. 31)."""
+        return int(str(app.RevisionNumber()).split(".")[0])
+
+    def _version_dir(self, major: int) -> str:
+        return os.path.join(self.cache_dir, str(major))
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _gen_path(path: str):
+        """
+        Leitet den pywin32-Wrapper-Cache vorübergehend auf path um.
+
+        Danach werden __gen_path__, gen_py.__path__ und die gencache-Tabellen
+        wiederhergestellt, damit andere pywin32-Nutzer im Prozess weiter
+        ihren eigenen Cache sehen.
+        """
+        import win32com.gen_py
+        from win32com.client import gencache
+
+        os.makedirs(path, exist_ok=True)
+        saved = win32com.__gen_path__, list(win32com.gen_py.__path__)
+        win32com.__gen_path__ = path
+        win32com.gen_py.__path__ = [path]
+        gencache.__init__()
+        try:
+            yield gencache
+        finally:
+            win32com.__gen_path__, win32com.gen_py.__path__ = saved
+            gencache.__init__()
+
+    def _load_typelib(self, major: int) -> bool:
+        """Lädt die Wrapper aus dem Cache. False, wenn sie fehlen."""
+        path = self._version_dir(major)
+        if not os.path.isdir(path):
+            return False
+        try:
+            with self._gen_path(path) as gencache:
+                module = gencache.GetModuleForTypelib(SW_TYPELIB_GUID, 0, major, 0)
+        except Exception:
+            return False
+        self._typelib_module = module
+        return module is not None
+
+    def generate_cache(self) -> str:
+        """
+        Erzeugt die makepy-Wrapper für die laufende SolidWorks-Version.
+
+        Returns:
+            Verzeichnis mit den generierten Wrappern
+        """
+        if win32com is None:
+            raise ImportError("pywin32 nicht installiert. Bitte ausführen: pip install pywin32")
+        app = win32com.client.Dispatch(self.prog_id)
+        major = self._typelib_version(app)
+        path = self._version_dir(major)
+        with self._gen_path(path) as gencache:
+            gencache.EnsureModule(SW_TYPELIB_GUID, 0, major, 0)
+        print(f"Typelib-Cache erstellt: {path}")
+        return path
+
+
+class RetryPolicy:
+    """
+    Wiederholt von SolidWorks abgewiesene Aufrufe mit exponentiellem Backoff.
+
+    Während eines Rebuilds weist SolidWorks eingehende Aufrufe mit
+    RPC_E_CALL_REJECTED bzw. RPC_E_SERVERCALL_RETRYLATER ab. Statt fest zu
+    warten, wird erst nach einer Abweisung gewartet - kurz, dann exponentiell
+    länger (mit Zufallsstreuung, damit mehrere Clients nicht im Takt
+    wiederholen). Im Leerlauf kostet die Policy nichts.
+
+    Args:
+        initial: Erste Wartezeit in Sekunden
+        factor: Wachstum der Wartezeit pro Versuch
+        max_delay: Längste einzelne Wartezeit
+        jitter: Zufallsstreuung als Anteil (0.5 = ±50 %)
+        deadline: Höchstdauer eines Aufrufs inklusive Wartezeiten; danach
+                  wird der COM-Fehler weitergereicht (gezählt in gave_up)
+        verbose: True = jeden Abbruch an der Deadline melden
+        clock, sleep, rng: Zeitquelle, Warten und Zufall (für Simulation/Tests)
+    """
+
+    REJECTED = (RPC_E_CALL_REJECTED, RPC_E_SERVERCALL_RETRYLATER)
+
+    def __init__(self, initial: float = 0.1, factor: float = 2.0, max_delay: float = 2.0,
+                 jitter: float = 0.5, deadline: float = 60.0, verbose: bool = False,
+                 clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        self.initial = initial
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.verbose = verbose
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        self.reset()
+
+    def reset(self):
+        """Setzt die Zähler zurück."""
+        self.calls_retried = 0
+        self.retries = 0
+        self.time_lost = 0.0
+        self.gave_up = 0
+        self._filter_expired = False
+
+    def delay(self, attempt: int) -> float:
+        """Wartezeit vor Wiederholung Nummer attempt (0-basiert)."""
+        base = min(self.max_delay, self.initial * self.factor ** attempt)
+        return min(self.max_delay, base * (1 + self.jitter * (2 * self.rng() - 1)))
+
+    @classmethod
+    def rejected(cls, error: Exception) -> bool:
+        """True, wenn error eine Abweisung durch den beschäftigten Server ist."""
+        return getattr(error, "hresult", None) in cls.REJECTED
+
+    def call(self, func, *args, **kwargs):
+        """Ruft func auf und wiederholt abgewiesene Aufrufe bis zur Deadline."""
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if not self.rejected(e) or self._expire():
+                raise
+            error = e
+        start = self.clock()
+        self.calls_retried += 1
+        attempt = 0
+        while True:
+            wait = self.delay(attempt)
+            if self.clock() + wait - start > self.deadline:
+                self._give_up(attempt + 1, self.clock() - start)
+                raise error
+            self.sleep(wait)
+            self.retries += 1
+            self.time_lost += wait
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not self.rejected(e) or self._expire():
+                    raise
+                error = e
+
+    def _give_up(self, attempts: int, seconds: float):
+        """Zählt einen Abbruch an der Deadline (und meldet ihn mit verbose)."""
+        self.gave_up += 1
+        if self.verbose:
+            print(f"Warnung: Aufruf nach {attempts} Versuchen ({seconds:.1f} s) "
+                  "weiter abgewiesen")
+
+    def _expire(self) -> bool:
+        """True, wenn der MessageFilter die Deadline für diesen Aufruf schon ausgeschöpft hat."""
+        expired, self._filter_expired = self._filter_expired, False
+        return expired
+
+    def stats(self) -> dict:
+        """Zähler: wiederholte Aufrufe, Wiederholungen, Wartezeit, Abbrüche."""
+        return {
+            "calls_retried": self.calls_retried,
+            "retries": self.retries,
+            "time_lost": self.time_lost,
+            "gave_up": self.gave_up,
+        }
+
+
+class MessageFilter:
+    """
+    COM-IMessageFilter, der abgewiesene Aufrufe nach RetryPolicy wiederholt.
+
+    Die Wiederholung geschieht in COM selbst, ohne Python-Ausnahme und ohne
+    Proxy - gilt für alle Aufrufe des Threads, der den Filter registriert
+    (Single-Threaded Apartment, d.h. nach pythoncom.CoInitialize()).
+
+    Verwendung:
+        message_filter = MessageFilter.register(RetryPolicy(deadline=120))
+        ...
+        message_filter.revoke()
+    """
+
+    _com_interfaces_ = ["{00000016-0000-0000-C000-000000000046}"]  # IID_IMessageFilter
+    _public_methods_ = ["HandleInComingCall", "RetryRejectedCall", "MessagePending"]
+
+    # SERVERCALL_* bzw. PENDINGMSG_* aus objidl.h
+    _SERVERCALL_ISHANDLED = 0
+    _SERVERCALL_RETRYLATER = 2
+    _PENDINGMSG_WAITDEFPROCESS = 2
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.previous = None
+        self.registered = False
+        self._attempt = 0
+        self._last_tick = None
+
+    @classmethod
+    def register(cls, policy: RetryPolicy = None) -> "MessageFilter":
+        """Registriert einen Filter für den aktuellen Thread."""
+        if pythoncom is None:
+            raise ImportError("pywin32 nicht installiert. Bitte ausführen: pip install pywin32")
+        import win32com.server.util
+
+        message_filter = cls(policy or RetryPolicy())
+        message_filter.previous = pythoncom.CoRegisterMessageFilter(
+            win32com.server.util.wrap(message_filter))
+        message_filter.registered = True
+        return message_filter
+
+    def revoke(self):
+        """Stellt den vorherigen Filter wieder her."""
+        if self.registered:
+            pythoncom.CoRegisterMessageFilter(self.previous)
+            self.registered = False
+
+    def HandleInComingCall(self, call_type, task_caller, tick_count, interface_info):
+        return self._SERVERCALL_ISHANDLED
+
+    def RetryRejectedCall(self, task_callee, tick_count: int, reject_type: int) -> int:
+        """Wartezeit in ms bis zur Wiederholung, -1 = Aufruf abbrechen."""
+        if reject_type != self._SERVERCALL_RETRYLATER:
+            return -1
+        policy = self.policy
+        # tick_count = ms seit Beginn des Aufrufs; kleiner als zuvor = neuer Aufruf
+        if self._last_tick is None or tick_count < self._last_tick:
+            self._attempt = 0
+            policy.calls_retried += 1
+        self._last_tick = tick_count
+        wait = policy.delay(self._attempt)
+        if tick_count / 1000 + wait > policy.deadline:
+            policy._give_up(self._attempt + 1, tick_count / 1000)
+            policy._filter_expired = True
+            self._last_tick = None
+            return -1
+        self._attempt += 1
+        policy.retries += 1
+        policy.time_lost += wait
+        # Werte unter 100 ms bedeuten "sofort wiederholen"
+        return max(100, int(wait * 1000))
+
+    def MessagePending(self, task_callee, tick_count, pending_type):
+        return self._PENDINGMSG_WAITDEFPROCESS
+
+
+class _RetryingOle:
+    """_oleobj_ hinter einem Retry-Proxy (für CachedDispatch mit DISPIDs)."""
+
+    def __init__(self, ole, policy: RetryPolicy):
+        self._ole = ole
+        self._policy = policy
+
+    def GetIDsOfNames(self, name: str):
+        return self._policy.call(self._ole.GetIDsOfNames, name)
+
+    def Invoke(self, dispid: int, *args):
+        return self._policy.call(self._ole.Invoke, dispid, *args)
+
+
+def _retry_target(obj):
+    """Gibt das Objekt hinter einem Retry-Proxy zurück (auch in Listen)."""
+    if isinstance(obj, _RetryingObject):
+        return obj.__dict__["_target"]
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_retry_target(v) for v in obj)
+    return obj
+
+
+class _RetryingObject:
+    """Proxy um ein SolidWorks-Objekt, der abgewiesene Zugriffe wiederholt."""
+
+    def __init__(self, target, policy: RetryPolicy):
+        self.__dict__["_target"] = target
+        self.__dict__["_policy"] = policy
+
+    @staticmethod
+    def wrap(value, policy: RetryPolicy):
+        """Verpackt API-Objekte (auch in Tupeln) in Retry-Proxys."""
+        if isinstance(value, (type(None), bool, int, float, complex, str, bytes,
+                              _RetryingObject)):
+            return value
+        if isinstance(value, (tuple, list)):
+            return type(value)(_RetryingObject.wrap(v, policy) for v in value)
+        return _RetryingObject(value, policy)
+
+    def __getattr__(self, name: str):
+        target = self.__dict__["_target"]
+        policy = self.__dict__["_policy"]
+        if name.startswith("_"):
+            if name == "_oleobj_" and getattr(type(target), "_prop_map_get_", None) is None:
+                ole = getattr(target, "_oleobj_", None)
+                if ole is not None:
+                    return _RetryingOle(ole, policy)
+            elif name == "_get_good_object_":
+                return lambda value: _RetryingObject.wrap(target._get_good_object_(value), policy)
+            raise AttributeError(name)
+
+        value = policy.call(getattr, target, name)
+        if not (inspect.ismethod(value) or inspect.isfunction(value)
+                or inspect.isbuiltin(value)):
+            return _RetryingObject.wrap(value, policy)
+
+        def call(*args):
+            args = [_retry_target(a) for a in args]
+            return _RetryingObject.wrap(policy.call(value, *args), policy)
+        return call
+
+    def __setattr__(self, name: str, value):
+        self.__dict__["_policy"].call(setattr, self.__dict__["_target"], name,
+                                      _retry_target(value))
+
+    def __eq__(self, other):
+        return self.__dict__["_target"] == _retry_target(other)
+
+    def __hash__(self):
+        return hash(self.__dict__["_target"])
+
+    def __repr__(self):
+        return f"<retrying {self.__dict__['_target']!r}>"
+
+
+class RetryingBackend(SolidWorksBackend):
+    """
+    Backend-Wrapper, der abgewiesene Aufrufe nach einer RetryPolicy wiederholt.
+
+    Alle API-Objekte werden durch Proxys ersetzt, die RPC_E_CALL_REJECTED
+    und RPC_E_SERVERCALL_RETRYLATER abfangen. Unter COM wird zusätzlich ein
+    MessageFilter registriert, der die meisten Abweisungen schon in COM
+    wiederholt; der Proxy fängt den Rest ab (andere Threads, Backends ohne
+    Filter wie der Simulator).
+
+    Verwendung:
+        policy = RetryPolicy(initial=0.05, deadline=120)
+        sw = SolidWorksAutomation(backend=RetryingBackend(ComBackend(), policy))
+        ...
+        print(policy.stats())
+
+    Args:
+        backend: Eigentliches Backend
+        policy: RetryPolicy (Standard: RetryPolicy())
+        message_filter: True = unter COM einen MessageFilter registrieren
+    """
+
+    def __init__(self, backend: SolidWorksBackend, policy: RetryPolicy = None,
+                 message_filter: bool = True):
+        self.backend = backend
+        self.policy = policy or RetryPolicy()
+        self.message_filter = message_filter
+        self.filter = None
+        self.name = backend.name
+
+    def connect(self):
+        app = self.policy.call(self.backend.connect)
+        if (self.message_filter and self.filter is None and pythoncom is not None
+                and isinstance(self.backend, ComBackend)):
+            self.filter = MessageFilter.register(self.policy)
+        return _RetryingObject.wrap(app, self.policy)
+
+    def wrap(self, obj, interface: str):
+        return _RetryingObject.wrap(self.backend.wrap(_retry_target(obj), interface),
+                                    self.policy)
+
+    def process_sample(self, app) -> ProcessSample:
+        return self.backend.process_sample(_retry_target(app))
+
+    def close(self):
+        if self.filter is not None:
+            self.filter.revoke()
+            self.filter = None
+        self.backend.close()
+
+
+_default_backend = None
+
+
+def set_default_backend(backend: SolidWorksBackend = None):
+    """
+    Setzt das Backend für alle Verbindungen ohne explizites Backend.
+
+    Betrifft auch die quick_*-Funktionen. None stellt COM wieder her.
+
+    Args:
+        backend: SolidWorksBackend-Instanz oder None
+    """
+    global _default_backend
+    _default_backend = backend
+
+
+def get_default_backend() -> SolidWorksBackend:
+    """Gibt das aktuelle Standard-Backend zurück (Standard: COM)."""
+    return _default_backend if _default_backend is not None else ComBackend()
+
+
+class MacroBatch:
+    """
+    Sammelt API-Aufrufe und kompiliert sie zu einem SolidWorks-Basic-Makro.
+
+    Statt jeden Aufruf einzeln über COM zu senden, werden die Aufrufe
+    einer Sketch-Sitzung als .swb-Makro (Text) geschrieben und mit einem
+    einzigen RunMacro2-Aufruf in SolidWorks ausgeführt.
+    """
+
+    # Variablenname im Makro -> Ausdruck zum Auflösen
+    TARGETS = {
+        "swModel": "swApp.ActiveDoc",
+        "swSketchMgr": "swModel.SketchManager",
+        "swExt": "swModel.Extension",
+        "swFeatMgr": "swModel.FeatureManager",
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def __len__(self):
+        return len(self.calls)
+
+    def record(self, target: str, method: str, args: tuple):
+        """Zeichnet einen Aufruf target.method(*args) auf."""
+        if target not in self.TARGETS:
+            raise ValueError(f"Unbekanntes Makro-Ziel: {target}")
+        self.calls.append((target, method, tuple(args)))
+
+    def proxy(self, target: str):
+        """Gibt ein Objekt zurück, dessen Methodenaufrufe aufgezeichnet werden."""
+        return _MacroProxy(self, target)
+
+    def clear(self):
+        """Verwirft alle aufgezeichneten Aufrufe."""
+        self.calls = []
+
+    @staticmethod
+    def _literal(value) -> str:
+        """Formatiert einen Python-Wert als Basic-Literal."""
+        if value is None or value is _COM_NULL:
+            return "Nothing"
+        if isinstance(value, bool):
+            return "True" if value else "False"
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, float):
+            return repr(value).upper()
+        if isinstance(value, str):
+            return '"' + value.replace('"', '""') + '"'
+        raise TypeError(f"Nicht unterstützter Makro-Parameter: {value!r}")
+
+    def compile(self, procedure: str = "main") -> str:
+        """
+        Erzeugt den Makro-Quelltext.
+
+        Args:
+            procedure: Name der Einstiegsprozedur
+
+        Returns:
+            Makro-Quelltext (SolidWorks Basic / VBA-kompatibel)
+        """
+        used = {target for target, _, _ in self.calls}
+        if used - {"swModel"}:
+            used.add("swModel")
+
+        lines = [
+            "' Automatisch erzeugt von sw_automation.MacroBatch",
+            "Dim swApp As Object",
+        ]
+        lines += [f"Dim {name} As Object" for name in self.TARGETS if name in used]
+        lines += ["", f"Sub {procedure}()", "    Set swApp = Application.SldWorks"]
+        lines += [
+            f"    Set {name} = {expr}"
+            for name, expr in self.TARGETS.items() if name in used
+        ]
+
+        arrays = 0
+        for target, method, args in self.calls:
+            rendered = []
+            for arg in args:
+                if isinstance(arg, (list, tuple)):
+                    arrays += 1
+                    name = f"arr{arrays}"
+                    lines.append(f"    Dim {name}({len(arg) - 1}) As Double")
+                    lines += [
+                        f"    {name}({i}) = {self._literal(float(v))}"
+                        for i, v in enumerate(arg)
+                    ]
+                    lines.append(f"    Dim v{name} As Variant")
+                    lines.append(f"    v{name} = {name}")
+                    rendered.append(f"v{name}")
+                else:
+                    rendered.append(self._literal(arg))
+            call = f"    {target}.{method}"
+            if rendered:
+                call += " " + ", ".join(rendered)
+            lines.append(call)
+
+        lines += ["End Sub", ""]
+        return "\n".join(lines)
+
+
+class _MacroProxy:
+    """Stellvertreter für ein API-Objekt im Batch-Modus."""
+
+    def __init__(self, batch: MacroBatch, target: str):
+        self._batch = batch
+        self._target = target
+
+    def __getattr__(self, method: str):
+        def record(*args):
+            self._batch.record(self._target, method, args)
+        return record
+
+
+# IDispatch::Invoke Flags
+_DISPATCH_METHOD = 1
+_DISPATCH_PROPERTYGET = 2
+
+
+class CachedDispatch:
+    """
+    Wrapper um ein Manager-Objekt (SketchManager, FeatureManager, ...).
+
+    Bei COM-Objekten wird die DISPID jeder Methode einmalig per
+    GetIDsOfNames aufgelöst; danach ist jeder Aufruf ein einzelnes Invoke.
+    Nicht-COM-Objekte (z.B. Simulator) werden unverändert durchgereicht.
+
+    Hinweis: Attribute werden als Methoden aufgerufen, Eigenschaften
+    daher mit handle.Name() lesen.
+    """
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._ole = getattr(obj, "_oleobj_", None)
+        if getattr(type(obj), "_prop_map_get_", None) is not None:
+            # makepy-Klasse (Early Binding): DISPIDs sind bereits bekannt
+            self._ole = None
+        self._methods = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._ole is None:
+            return getattr(self._obj, name)
+        method = self._methods.get(name)
+        if method is None:
+            dispid = self._ole.GetIDsOfNames(name)
+            method = self._methods[name] = _DispatchMethod(self, dispid)
+        return method
+
+    @property
+    def wrapped(self):
+        """Das ursprüngliche (ungecachte) Objekt."""
+        return self._obj
+
+
+class _DispatchMethod:
+    """Aufruf einer Methode über ihre zwischengespeicherte DISPID."""
+
+    def __init__(self, handle: CachedDispatch, dispid: int):
+        self._handle = handle
+        self._dispid = dispid
+
+    def __call__(self, *args):
+        result = self._handle._ole.Invoke(
+            self._dispid, 0, _DISPATCH_METHOD | _DISPATCH_PROPERTYGET, True, *args
+        )
+        # Rückgabewerte (z.B. IDispatch) wie pywin32 selbst verpacken
+        return self._handle._obj._get_good_object_(result)
+
 
 class SolidWorksConnection:
     """Verwaltet die Verbindung zu SolidWorks."""
 
-    def __init__(self):
+    def __init__(self, backend: SolidWorksBackend = None, cache_handles: bool = True):
+        """
+        Args:
+            backend: Optionales Backend (Standard: get_default_backend())
+            cache_handles: True = Manager-Objekte und DISPIDs zwischenspeichern
+        """
+        self.backend = backend or get_default_backend()
+        self.cache_handles = cache_handles
         self.app = None
-        self.model = None
+        self._model = None
+        self._handles = {}
+        self._batch = None
+        self.last_macro = None
+        # Zuletzt gezeichnetes Profil und Prüfmodus (None, "warn", "strict")
+        self.sketch_profile = None
+        self.sketch_validation = "warn"
+        # Beim Zeichnen/Erzeugen registrierte Bemaßungen (siehe update())
+        self.dimensions = DimensionRegistry()
+        self.sketch_dimensions = False
         self._connect()
 
     def _connect(self):
         """Stellt Verbindung zu laufender SolidWorks-Instanz her."""
         try:
-            self.app = win32com.client.Dispatch("SldWorks.Application")
+            self.app = self.backend.connect()
+        except ImportError:
+            raise
         except Exception as e:
             raise ConnectionError(
                 f"Konnte nicht zu SolidWorks verbinden: {e}\n"
                 "Stellen Sie sicher, dass SolidWorks läuft."
             )
 
-        self.model = self.app.ActiveDoc
-        if self.model is None:
+        active = self.app.ActiveDoc
+        if active is None:
             raise ValueError(
                 "Kein aktives Dokument in SolidWorks.\n"
                 "Bitte öffnen Sie ein Part-Dokument."
             )
+        self.model = active
 
         # Prüfen ob es ein Part ist
-        doc_type = self.model.GetType
+        doc_type = com_value(self.model, "GetType")
         if doc_type != 1:  # 1 = Part, 2 = Assembly, 3 = Drawing
             raise ValueError(
                 f"Aktives Dokument ist kein Part (Typ: {doc_type}).\n"
                 "Dieser Skill funktioniert nur mit Part-Dokumenten."
             )
 
+    @property
+    def model(self):
+        """Das aktuelle ModelDoc2-Objekt."""
+        if self._model is None:
+            raise ValueError(
+                "Kein Dokument verbunden (alle Dokumente geschlossen).\n"
+                "Bitte ein Part öffnen oder mit new_part() erzeugen."
+            )
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        # Handles und Bemaßungen gehören zum Dokument: bei Wechsel neu anlegen
+        # (DocumentSession hält die alten für einen späteren Rückwechsel)
+        self._model = self.backend.wrap(model, "IModelDoc2")
+        self._handles = {}
+        self.dimensions = DimensionRegistry()
+        self.sketch_profile = None
+
+    def attach(self, model, handles: dict, dimensions: "DimensionRegistry"):
+        """
+        Wechselt auf ein bereits bekanntes Dokument samt seinen Handles.
+
+        Args:
+            model: Gebundenes ModelDoc2 (wie von conn.model geliefert)
+            handles: Handle-Cache des Dokuments (wird weiter befüllt)
+            dimensions: Bemaßungsregistrierung des Dokuments
+        """
+        if self.batch_active:
+            raise RuntimeError("Dokumentwechsel während eines Batch-Makros")
+        self._model = model
+        self._handles = handles
+        self.dimensions = dimensions
+        self.sketch_profile = None
+
+    def detach(self):
+        """
+        Löst die Verbindung vom geschlossenen Dokument.
+
+        Danach werfen Zugriffe auf model und die Manager einen ValueError,
+        bis über model/attach wieder ein Dokument gesetzt wird.
+        """
+        if self.batch_active:
+            raise RuntimeError("Dokumentwechsel während eines Batch-Makros")
+        self._model = None
+        self._handles = {}
+        self.dimensions = DimensionRegistry()
+        self.sketch_profile = None
+
+    def sync_active_document(self) -> bool:
+        """
+        Übernimmt das aktive Dokument von SolidWorks.
+
+        Returns:
+            True, wenn sich das Dokument geändert hat (Handles verworfen)
+        """
+        active = self.app.ActiveDoc
+        if active is None or active == self._model:
+            return False
+        self.model = active
+        return True
+
+    # Manager-Eigenschaft -> Interface für Early Binding
+    _INTERFACES = {
+        "SketchManager": "ISketchManager",
+        "FeatureManager": "IFeatureManager",
+        "SelectionManager": "ISelectionMgr",
+        "Extension": "IModelDocExtension",
+    }
+
+    def _handle(self, name: str):
+        """Gibt das (zwischengespeicherte) Manager-Objekt name zurück."""
+        if not self.cache_handles:
+            return self.backend.wrap(getattr(self.model, name), self._INTERFACES[name])
+        handle = self._handles.get(name)
+        if handle is None:
+            obj = self.backend.wrap(getattr(self.model, name), self._INTERFACES[name])
+            handle = self._handles[name] = CachedDispatch(obj)
+        return handle
+
     @property
     def sketch_manager(self):
-        """Gibt den SketchManager zurück."""
-        return self.model.SketchManager
+        """Gibt den SketchManager zurück (im Batch-Modus: Aufzeichnung)."""
+        if self._batch is not None:
+            return self._batch.proxy("swSketchMgr")
+        return self._handle("SketchManager")
 
     @property
     def feature_manager(self):
         """Gibt den FeatureManager zurück."""
-        return self.model.FeatureManager
+        return self._handle("FeatureManager")
 
     @property
     def selection_manager(self):
         """Gibt den SelectionManager zurück."""
-        return self.model.SelectionManager
+        return self._handle("SelectionManager")
 
     @property
     def extension(self):
-        """Gibt die ModelDocExtension zurück."""
-        return self.model.Extension
+        """Gibt die ModelDocExtension zurück (im Batch-Modus: Aufzeichnung)."""
+        if self._batch is not None:
+            return self._batch.proxy("swExt")
+        return self._handle("Extension")
+
+    @property
+    def batch_active(self) -> bool:
+        """True, wenn Aufrufe gerade als Makro aufgezeichnet werden."""
+        return self._batch is not None
+
+    def begin_batch(self):
+        """Startet die Aufzeichnung von Sketch-Aufrufen als Makro."""
+        if self._batch is None:
+            self._batch = MacroBatch()
+
+    def flush_batch(self, procedure: str = "main"):
+        """
+        Führt alle aufgezeichneten Aufrufe mit einem RunMacro2-Aufruf aus.
+
+        Die Aufzeichnung bleibt aktiv. Der erzeugte Quelltext steht danach
+        in last_macro.
+        """
+        if self._batch is None or not len(self._batch):
+            return
+        source = self._batch.compile(procedure)
+        self._batch.clear()
+        self.last_macro = source
+
+        fd, path = tempfile.mkstemp(prefix="sw_batch_", suffix=".swb")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(source)
+            result = self.app.RunMacro2(
+                path, "", procedure, SwConst.swRunMacroUnloadAfterRun, 0
+            )
+        finally:
+            os.remove(path)
+
+        # pywin32 liefert Out-Parameter als Tupel (Rückgabewert, Fehler)
+        ok, error = result if isinstance(result, tuple) else (result, 0)
+        if not ok:
+            raise RuntimeError(f"Makro-Ausführung fehlgeschlagen (Fehler {error}).")
+
+    def end_batch(self):
+        """Führt ausstehende Aufrufe aus und beendet den Batch-Modus."""
+        try:
+            self.flush_batch()
+        finally:
+            self._batch = None
+
+
+# =============================================================================
+# Sketch-Prüfung (Pre-Flight)
+# =============================================================================
+#
+# SketchOperations zeichnet die Geometrie jedes Sketches zusätzlich lokal auf
+# (SketchProfile, mm). Vor extrude/cut/revolve wird das Profil geprüft, damit
+# offene oder sich überschneidende Profile nicht erst nach einem teuren
+# Rebuild in SolidWorks scheitern.
+
+# Fangradius für Endpunkte und Berührungen (mm)
+VALIDATION_TOLERANCE = 1e-4
+
+# Segmente für Kreise und Ellipsen bei der Schnittprüfung (Bögen anteilig)
+CURVE_SEGMENTS = 32
+
+
+class SketchValidationError(ValueError):
+    """Profil ist für das Feature ungültig (validate_sketches="strict")."""
+
+    def __init__(self, message: str, report: "SketchReport"):
+        super().__init__(message)
+        self.report = report
+
+
+class SketchProfile:
+    """
+    Geometrie eines Sketches, wie sie über SketchOperations gezeichnet wurde.
+
+    Elemente (Koordinaten in mm, Winkel in Radiant):
+        ("line", x1, y1, x2, y2)
+        ("arc", cx, cy, r, start, sweep)      sweep < 0 = im Uhrzeigersinn
+        ("circle", cx, cy, r)
+        ("ellipse", cx, cy, a, b)
+        ("spline", points, closed)
+    """
+
+    def __init__(self, plane: str = None):
+        self.plane = plane
+        self.entities = []
+
+    def add(self, kind: str, *params):
+        self.entities.append((kind,) + params)
+
+    def add_polyline(self, points, closed: bool = False):
+        """Zeichnet einen Linienzug als einzelne Linien auf."""
+        points = points.tolist() if hasattr(points, "tolist") else list(points)
+        segments = zip(points, points[1:] + points[:1] if closed else points[1:])
+        for (x1, y1), (x2, y2) in segments:
+            self.entities.append(("line", x1, y1, x2, y2))
+
+    def validate(self, revolve_axis: str = None,
+                 tolerance: float = VALIDATION_TOLERANCE) -> "SketchReport":
+        """Prüft das Profil (siehe validate_profile)."""
+        return validate_profile(self, revolve_axis, tolerance)
+
+    def __len__(self):
+        return len(self.entities)
+
+
+class SketchReport:
+    """Ergebnis von validate_profile()."""
+
+    def __init__(self, entities: int):
+        self.entities = entities
+        self.loops = 0
+        self.axis = None
+        self.open_points = []
+        self.branch_points = []
+        self.intersections = []
+        self.errors = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __repr__(self):
+        status = "OK" if self.ok else "; ".join(self.errors)
+        return f"SketchReport({self.entities} Elemente, {self.loops} Konturen: {status})"
+
+
+def _entity_endpoints(entity):
+    """Start- und Endpunkt offener Elemente, None für geschlossene."""
+    kind = entity[0]
+    if kind == "line":
+        return (entity[1], entity[2]), (entity[3], entity[4])
+    if kind == "arc":
+        _, cx, cy, r, start, sweep = entity
+        return ((cx + r * math.cos(start), cy + r * math.sin(start)),
+                (cx + r * math.cos(start + sweep), cy + r * math.sin(start + sweep)))
+    if kind == "spline" and not entity[2]:
+        points = entity[1]
+        return tuple(points[0]), tuple(points[-1])
+    return None
+
+
+def _entity_box(entity) -> tuple:
+    """Bounding-Box (xmin, ymin, xmax, ymax); für Bögen die des Vollkreises."""
+    kind = entity[0]
+    if kind == "line":
+        _, x1, y1, x2, y2 = entity
+        return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+    if kind in ("arc", "circle"):
+        cx, cy, r = entity[1:4]
+        return (cx - r, cy - r, cx + r, cy + r)
+    if kind == "ellipse":
+        _, cx, cy, a, b = entity
+        return (cx - a, cy - b, cx + a, cy + b)
+    if np is not None:
+        points = np.asarray(entity[1], dtype=float).reshape(-1, 2)
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+    xs = [x for x, _ in entity[1]]
+    ys = [y for _, y in entity[1]]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _entity_polyline(entity) -> list:
+    """Näherung als Linienzug; geschlossene Elemente enden mit dem Startpunkt."""
+    kind = entity[0]
+    if kind == "line":
+        return [(entity[1], entity[2]), (entity[3], entity[4])]
+    if kind == "spline":
+        points = entity[1]
+        points = points.tolist() if hasattr(points, "tolist") else list(points)
+        points = [tuple(p) for p in points]
+        return points + points[:1] if entity[2] else points
+    if kind == "arc":
+        _, cx, cy, r, start, sweep = entity
+        count = max(2, math.ceil(abs(sweep) / (2 * math.pi) * CURVE_SEGMENTS))
+        rx = ry = r
+    else:
+        cx, cy, rx = entity[1:4]
+        ry = entity[4] if kind == "ellipse" else rx
+        start, sweep, count = 0.0, 2 * math.pi, CURVE_SEGMENTS
+    points = [(cx + rx * math.cos(start + sweep * i / count),
+               cy + ry * math.sin(start + sweep * i / count)) for i in range(count + 1)]
+    if kind == "arc":
+        # Endpunkte exakt wie _entity_endpoints (für die Knotenzuordnung)
+        points[0], points[-1] = _entity_endpoints(entity)
+    else:
+        points[-1] = points[0]
+    return points
+
+
+class _NodeIndex:
+    """Fasst Endpunkte innerhalb der Toleranz zu Knoten zusammen (Raster-Hash)."""
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.cells = {}
+        self.points = []
+
+    def node(self, point: tuple) -> int:
+        x, y = point
+        cx, cy = math.floor(x / self.tolerance), math.floor(y / self.tolerance)
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for node in self.cells.get((i, j), ()):
+                    px, py = self.points[node]
+                    if math.hypot(px - x, py - y) <= self.tolerance:
+                        return node
+        self.points.append((x, y))
+        self.cells.setdefault((cx, cy), []).append(len(self.points) - 1)
+        return len(self.points) - 1
+
+
+def _sweep_pairs(boxes: list, tolerance: float):
+    """
+    Sweep-Line über X: liefert alle Paare (i, j) sich überlappender Boxen.
+
+    Aufwand O(n log n + Paare) statt O(n²).
+    """
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+    active = []   # Heap aus (xmax, Index)
+    alive = set()
+    for i in order:
+        xmin, ymin, _, ymax = boxes[i]
+        while active and active[0][0] < xmin - tolerance:
+            alive.discard(heapq.heappop(active)[1])
+        for j in alive:
+            box = boxes[j]
+            if box[1] <= ymax + tolerance and ymin <= box[3] + tolerance:
+                yield (j, i) if j < i else (i, j)
+        heapq.heappush(active, (boxes[i][2], i))
+        alive.add(i)
+
+
+def _segment_contact(p1, p2, q1, q2, tolerance: float):
+    """
+    Berührpunkt zweier Strecken oder None.
+
+    Returns:
+        (x, y, overlap) - overlap ist True, wenn die Strecken sich über mehr
+        als die Toleranz kollinear überdecken
+    """
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    ex, ey = q2[0] - q1[0], q2[1] - q1[1]
+    fx, fy = q1[0] - p1[0], q1[1] - p1[1]
+    len_d, len_e = math.hypot(dx, dy), math.hypot(ex, ey)
+    if len_d < tolerance or len_e < tolerance:
+        return None
+    denom = dx * ey - dy * ex
+    if abs(denom) > 1e-12 * len_d * len_e:
+        t = (fx * ey - fy * ex) / denom
+        u = (fx * dy - fy * dx) / denom
+        tt, tu = tolerance / len_d, tolerance / len_e
+        if -tt <= t <= 1 + tt and -tu <= u <= 1 + tu:
+            t = min(1.0, max(0.0, t))
+            return p1[0] + t * dx, p1[1] + t * dy, False
+        return None
+    # Parallel: nur kollineare Strecken können sich berühren
+    if abs(fx * dy - fy * dx) / len_d > tolerance:
+        return None
+    s0 = (fx * dx + fy * dy) / len_d
+    s1 = s0 + (ex * dx + ey * dy) / len_d
+    lo, hi = max(0.0, min(s0, s1)), min(len_d, max(s0, s1))
+    if lo > hi + tolerance:
+        return None
+    mid = (lo + hi) / 2 / len_d
+    return p1[0] + mid * dx, p1[1] + mid * dy, hi - lo > tolerance
+
+
+def _polyline_contacts(a: list, b: list, tolerance: float, same: bool = False,
+                       closed: bool = False) -> list:
+    """Berührpunkte zweier Linienzüge (same=True: Selbstschnitte von a)."""
+    segs_a = list(zip(a, a[1:]))
+    segs_b = segs_a if same else list(zip(b, b[1:]))
+    boxes = [(min(p[0], q[0]), min(p[1], q[1]), max(p[0], q[0]), max(p[1], q[1]))
+             for p, q in segs_a + ([] if same else segs_b)]
+    offset = 0 if same else len(segs_a)
+    last = len(segs_a) - 1
+    contacts = []
+    for i, j in _sweep_pairs(boxes, tolerance):
+        if same:
+            # Benachbarte Segmente teilen ihren Endpunkt
+            if j - i == 1 or (closed and i == 0 and j == last):
+                continue
+        elif (i < offset) == (j < offset):
+            continue
+        else:
+            j -= offset
+        contact = _segment_contact(*segs_a[i], *segs_b[j], tolerance)
+        if contact is not None:
+            contacts.append(contact)
+    return contacts
+
+
+def validate_profile(profile: SketchProfile, revolve_axis: str = None,
+                     tolerance: float = VALIDATION_TOLERANCE) -> SketchReport:
+    """
+    Prüft ein Sketch-Profil vor einem Feature.
+
+    Geprüft werden:
+        - Endpunkte: jeder Endpunkt muss genau ein Gegenstück haben
+          (offene Enden und Verzweigungen sind Fehler)
+        - Konturen: mindestens eine geschlossene Kontur
+        - Überschneidungen: Sweep-Line über die Bounding-Boxen, danach
+          exakte Streckentests (Kurven als Linienzug genähert)
+        - Drehachse (revolve_axis "X"/"Y", "auto" = beide): frei stehende
+          Linien auf der Achse gelten als Mittellinie; das Profil darf die
+          Achse berühren, aber nicht kreuzen
+
+    Args:
+        profile: Aufgezeichnetes Profil (SketchProfile)
+        revolve_axis: None, "X", "Y" oder "auto"
+        tolerance: Fangradius in mm
+
+    Returns:
+        SketchReport (report.ok, report.errors)
+    """
+    entities = []
+    for entity in profile.entities:
+        box = _entity_box(entity)
+        if max(box[2] - box[0], box[3] - box[1]) >= tolerance:
+            entities.append(entity)
+    report = SketchReport(len(entities))
+
+    # Endpunkt-Graph
+    nodes = _NodeIndex(tolerance)
+    ends = {}
+    degree = Counter()
+    for index, entity in enumerate(entities):
+        endpoints = _entity_endpoints(entity)
+        if endpoints is not None:
+            ends[index] = tuple(nodes.node(p) for p in endpoints)
+            degree.update(ends[index])
+
+    # Mittellinie: frei stehende Linie auf der Drehachse
+    axes = ("X", "Y") if revolve_axis == "auto" else (revolve_axis,)
+    for axis in axes:
+        if axis not in ("X", "Y"):
+            continue
+        coord = 2 if axis == "X" else 1   # X-Achse: y = 0, Y-Achse: x = 0
+        centerlines = [
+            i for i, entity in enumerate(entities)
+            if entity[0] == "line" and abs(entity[coord]) <= tolerance
+            and abs(entity[coord + 2]) <= tolerance
+            and all(degree[n] == 1 for n in ends[i])
+        ]
+        if centerlines or revolve_axis == axis:
+            report.axis = axis
+            for i in centerlines:
+                degree.subtract(ends.pop(i))
+            break
+    keep = [i for i in range(len(entities)) if report.axis is None or
+            i in ends or _entity_endpoints(entities[i]) is None]
+    if len(keep) < len(entities):
+        entities = [entities[i] for i in keep]
+        ends = {new: ends[old] for new, old in enumerate(keep) if old in ends}
+        report.entities = len(entities)
+
+    report.open_points = [nodes.points[n] for n, d in degree.items() if d == 1]
+    report.branch_points = [nodes.points[n] for n, d in degree.items() if d > 2]
+
+    # Geschlossene Konturen: Komponenten, deren Knoten alle Grad 2 haben
+    parent = {}
+
+    def find(n):
+        while parent.setdefault(n, n) != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
+    for a, b in ends.values():
+        parent[find(a)] = find(b)
+    open_roots = {find(n) for n, d in degree.items() if d != 2}
+    roots = {find(n) for a, b in ends.values() for n in (a, b)}
+    report.loops = len(roots - open_roots) + (len(entities) - len(ends))
+
+    # Überschneidungen (Broad Phase über Element-Boxen)
+    boxes = [_entity_box(entity) for entity in entities]
+    polylines = {}
+
+    def polyline(i):
+        if i not in polylines:
+            polylines[i] = _entity_polyline(entities[i])
+        return polylines[i]
+
+    for i, j in _sweep_pairs(boxes, tolerance):
+        shared = [nodes.points[n] for n in set(ends.get(i, ())) & set(ends.get(j, ()))]
+        if entities[i][0] == "line" and entities[j][0] == "line":
+            contact = _segment_contact(entities[i][1:3], entities[i][3:5],
+                                       entities[j][1:3], entities[j][3:5], tolerance)
+            contacts = [contact] if contact is not None else []
+        else:
+            contacts = _polyline_contacts(polyline(i), polyline(j), tolerance)
+        for x, y, overlap in contacts:
+            if overlap or not any(math.hypot(x - px, y - py) <= 2 * tolerance
+                                  for px, py in shared):
+                report.intersections.append((x, y))
+    for i, entity in enumerate(entities):
+        if entity[0] == "spline":
+            closed = bool(entity[2])
+            contacts = _polyline_contacts(polyline(i), None, tolerance, same=True, closed=closed)
+            report.intersections.extend((x, y) for x, y, _ in contacts)
+
+    def where(points):
+        x, y = points[0]
+        return f"z.B. bei ({x:.3f}, {y:.3f})"
+
+    if report.open_points:
+        report.errors.append(f"{len(report.open_points)} offene Endpunkte, {where(report.open_points)}")
+    if report.branch_points:
+        report.errors.append(f"{len(report.branch_points)} Verzweigungen, {where(report.branch_points)}")
+    if report.intersections:
+        report.errors.append(f"{len(report.intersections)} Überschneidungen, {where(report.intersections)}")
+    if not report.loops:
+        report.errors.append("keine geschlossene Kontur")
+
+    # Drehachse darf nicht gekreuzt werden
+    if report.axis is not None:
+        coord = 0 if report.axis == "Y" else 1
+        low = high = False
+        for i, box in enumerate(boxes):
+            if box[coord] < -tolerance and box[coord + 2] > tolerance:
+                values = [p[coord] for p in polyline(i)]
+                low = low or min(values) < -tolerance
+                high = high or max(values) > tolerance
+            else:
+                low = low or box[coord + 2] < -tolerance
+                high = high or box[coord] > tolerance
+        if low and high:
+            report.errors.append(f"Profil kreuzt die Drehachse ({report.axis})")
+
+    return report
+
+
+# =============================================================================
+# Bemaßungen (parametrische Varianten)
+# =============================================================================
+#
+# FeatureOperations (und SketchOperations mit sketch_dimensions=True)
+# registrieren die Bemaßungen, die sie erzeugen, unter kurzen Aliasen wie
+# "extrude1.depth" oder "circle2.diameter". SolidWorksAutomation.update()
+# setzt sie direkt über IDimension.SystemValue und baut einmal neu auf -
+# eine Variante kostet so einen Rebuild statt eines kompletten Neuaufbaus.
+
+class DimensionRef:
+    """
+    Eine registrierte Bemaßung.
+
+    Attributes:
+        alias: Kurzname, z.B. "extrude1.depth"
+        owner: Feature (bzw. DisplayDimension bei Sketch-Bemaßungen)
+        dim: Bemaßungsname im Feature, z.B. "D1"
+        value: Zuletzt gesetzter Wert (mm bzw. Grad)
+        angle: True = Winkel (Grad), sonst Länge (mm)
+    """
+
+    __slots__ = ("alias", "owner", "dim", "value", "angle", "sketch", "_name", "_dimension")
+
+    def __init__(self, alias: str, owner, dim: str = None, value: float = None,
+                 angle: bool = False, sketch: bool = False):
+        self.alias = alias
+        self.owner = owner
+        self.dim = dim
+        self.value = value
+        self.angle = angle
+        self.sketch = sketch
+        self._name = None
+        self._dimension = None
+
+    @property
+    def name(self) -> str:
+        """SolidWorks-Name, z.B. "D1@Boss-Extrude1" (erster Zugriff: ein Aufruf)."""
+        if self._name is None:
+            if self.sketch:
+                # FullName = "D1@Sketch1@Teil1" -> ohne Dokumentname
+                full = self.dimension(None).FullName
+                self._name = "@".join(full.split("@")[:2])
+            else:
+                self._name = f"{self.dim}@{self.owner.Name}"
+        return self._name
+
+    def dimension(self, model):
+        """IDimension-Objekt (wird nach dem ersten Abruf zwischengespeichert)."""
+        if self._dimension is None:
+            if self.sketch:
+                dimension = self.owner.GetDimension2(0)
+            else:
+                dimension = model.Parameter(self.name)
+            if dimension is None:
+                raise ValueError(f"Bemaßung nicht gefunden: {self.alias}")
+            self._dimension = dimension
+        return self._dimension
+
+    def system_value(self, value: float) -> float:
+        """Rechnet einen Wert in mm bzw. Grad in SolidWorks-Einheiten um."""
+        return deg_to_rad(value) if self.angle else mm_to_m(value)
+
+    def __repr__(self):
+        unit = "°" if self.angle else " mm"
+        value = "?" if self.value is None else f"{self.value:g}{unit}"
+        return f"DimensionRef({self.alias} = {value})"
+
+
+class DimensionRegistry:
+    """
+    Bemaßungen eines Dokuments, nach Alias geordnet.
+
+    Verwendung:
+        sw.feature.extrude(20)                 # registriert "extrude1.depth"
+        sw.dimensions["extrude1.depth"].name   # "D1@Boss-Extrude1"
+    """
+
+    def __init__(self):
+        self._refs = {}
+        self._by_name = {}
+        self._counts = Counter()
+
+    def add(self, kind: str, owner, dims: dict, sketch: bool = False) -> list:
+        """
+        Registriert die Bemaßungen eines Features.
+
+        Args:
+            kind: Feature-Art, wird mit laufender Nummer zum Alias-Präfix
+            owner: Feature-Objekt (oder DisplayDimension, wenn sketch=True)
+            dims: {Parameter: (Bemaßungsname, Wert, Winkel?)}
+
+        Returns:
+            Liste der vergebenen Aliase
+        """
+        if owner is None:
+            return []
+        self._counts[kind] += 1
+        aliases = []
+        for param, (dim, value, angle) in dims.items():
+            alias = f"{kind}{self._counts[kind]}.{param}"
+            self._refs[alias] = DimensionRef(alias, owner, dim, value, angle, sketch)
+            aliases.append(alias)
+        return aliases
+
+    def find(self, key: str) -> DimensionRef:
+        """
+        Sucht eine Bemaßung über Alias oder SolidWorks-Namen ("D1@Boss-Extrude1").
+
+        Nicht registrierte SolidWorks-Namen werden als Längenbemaßung übernommen.
+        """
+        ref = self._refs.get(key) or self._by_name.get(key)
+        if ref is not None:
+            return ref
+        if "@" not in key:
+            raise ValueError(f"Unbekannte Bemaßung: {key}")
+        for ref in self._refs.values():
+            self._by_name[ref.name] = ref
+            if ref.name == key:
+                return ref
+        ref = DimensionRef(key, None)
+        ref._name = key
+        self._by_name[key] = ref
+        return ref
+
+    def clear(self):
+        """Verwirft alle Bemaßungen (z.B. bei Dokumentwechsel)."""
+        self._refs.clear()
+        self._by_name.clear()
+        self._counts.clear()
+
+    def values(self) -> dict:
+        """Aktuelle Werte aller Aliase (mm bzw. Grad)."""
+        return {alias: ref.value for alias, ref in self._refs.items()}
+
+    def __getitem__(self, key: str) -> DimensionRef:
+        return self.find(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._refs or key in self._by_name
+
+    def __iter__(self):
+        return iter(self._refs)
+
+    def __len__(self):
+        return len(self._refs)
+
+    def __repr__(self):
+        return f"DimensionRegistry({len(self._refs)} Bemaßungen)"
+
+
+# =============================================================================
+# Teilefamilien (Konfigurationen)
+# =============================================================================
+#
+# Statt pro Größe ein Dokument neu aufzubauen, wird das Basisteil einmal
+# erzeugt und jede Tabellenzeile als Konfiguration angelegt. Die Bemaßungen
+# werden je Wert (nicht je Zeile) mit SetSystemValue3 für alle betroffenen
+# Konfigurationen auf einmal gesetzt.
+
+def read_family_table(source, name_column: str = "name") -> list:
+    """
+    Liest eine Parametertabelle (CSV) für create_configurations().
+
+    Die Spalte name_column enthält den Konfigurationsnamen, alle weiteren
+    Spalten sind Bemaßungen (Alias wie "extrude1.depth" oder SolidWorks-Name)
+    in mm bzw. Grad. Trennzeichen "," oder ";" (dann auch mit Dezimalkomma);
+    leere Zellen übernehmen den Wert des Basisteils.
+
+    Args:
+        source: Dateipfad oder iterierbare Zeilen (z.B. offene Datei)
+
+    Returns:
+        Liste von (Konfigurationsname, {Spalte: Wert})
+    """
+    if isinstance(source, str):
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            return read_family_table(f, name_column)
+
+    lines = [line for line in source if line.strip()]
+    if not lines:
+        return []
+    delimiter = ";" if lines[0].count(";") > lines[0].count(",") else ","
+    reader = csv.DictReader(lines, delimiter=delimiter)
+    if name_column not in reader.fieldnames:
+        raise ValueError(f"Spalte fehlt: {name_column}")
+
+    rows = []
+    for number, record in enumerate(reader, start=2):
+        if None in record:
+            raise ValueError(f"Zeile {number}: mehr Werte als Spalten")
+        name = (record.pop(name_column) or "").strip()
+        params = {}
+        for column, cell in record.items():
+            cell = (cell or "").strip()
+            if not cell:
+                continue
+            if delimiter == ";":
+                cell = cell.replace(",", ".")
+            try:
+                params[column.strip()] = float(cell)
+            except ValueError:
+                raise ValueError(f"Zeile {number}, Spalte {column}: keine Zahl: {cell!r}")
+        rows.append((name, params))
+    return rows
+
+
+class FamilyPlan:
+    """
+    Ausführungsplan für eine Teilefamilie (ohne SolidWorks erzeugbar).
+
+    Attributes:
+        configurations: Konfigurationsnamen in Tabellenreihenfolge
+        columns: Bemaßungsspalten (Alias oder SolidWorks-Name)
+        assignments: [(Spalte, Wert, [Konfigurationen])] - je Eintrag ein
+                     SetSystemValue3-Aufruf
+    """
+
+    def __init__(self, configurations: list, columns: list, assignments: list):
+        self.configurations = configurations
+        self.columns = columns
+        self.assignments = assignments
+
+    @property
+    def calls(self) -> int:
+        """API-Aufrufe für Anlegen und Bemaßen (ohne Auflösen der Bemaßungen)."""
+        return len(self.configurations) + len(self.assignments)
+
+    def __repr__(self):
+        return (f"FamilyPlan({len(self.configurations)} Konfigurationen, "
+                f"{len(self.columns)} Bemaßungen, {len(self.assignments)} Zuweisungen)")
+
+
+def plan_family(rows: list, base: dict = None) -> FamilyPlan:
+    """
+    Erzeugt den Plan für create_configurations().
+
+    Args:
+        rows: Liste von (Konfigurationsname, {Spalte: Wert}),
+              z.B. aus read_family_table()
+        base: Aktuelle Werte des Basisteils {Spalte: Wert}; gleiche Werte
+              werden nicht gesetzt (neue Konfigurationen übernehmen sie)
+
+    Returns:
+        FamilyPlan; Zuweisungen gleicher Werte sind zusammengefasst
+    """
+    base = base or {}
+    names = []
+    seen = set()
+    columns = []
+    groups = {}
+    for name, params in rows:
+        if not name:
+            raise ValueError("Konfiguration ohne Namen")
+        if name in seen:
+            raise ValueError(f"Doppelte Konfiguration: {name}")
+        seen.add(name)
+        names.append(name)
+        for column, value in params.items():
+            if column not in columns:
+                columns.append(column)
+            current = base.get(column)
+            if current is not None and abs(current - value) < 1e-9:
+                continue
+            groups.setdefault((column, value), []).append(name)
+    assignments = [(column, value, targets) for (column, value), targets in groups.items()]
+    return FamilyPlan(names, columns, assignments)
 
 
 class SketchOperations:
@@ -134,6 +2127,64 @@ class SketchOperations:
 
     def __init__(self, connection: SolidWorksConnection):
         self.conn = connection
+        # Native SketchManager-Methoden, die diese SolidWorks-Version nicht kennt
+        self._unsupported = set()
+        # Gesicherter Wert von swInputDimValOnCreate während Sketch-Bemaßungen
+        self._dim_prompt = None
+
+    def _native(self, method: str, *args) -> bool:
+        """
+        Ruft eine native SketchManager-Methode auf (z.B. CreatePolygon).
+
+        Returns:
+            False, wenn die Methode fehlt oder keine Geometrie erzeugt hat;
+            der Aufrufer zeichnet die Geometrie dann selbst. Andere Fehler
+            (z.B. eine Abweisung durch den beschäftigten Server) werden
+            weitergereicht.
+        """
+        if method in self._unsupported:
+            return False
+        manager = self.conn.sketch_manager
+        if self.conn.batch_active:
+            # Im Makro steht das Ergebnis erst bei der Ausführung fest
+            getattr(manager, method)(*args)
+            return True
+        try:
+            result = getattr(manager, method)(*args)
+        except Exception as e:
+            if not _missing_member(e):
+                raise
+            self._unsupported.add(method)
+            return False
+        return bool(result)
+
+    def _record(self, kind: str, *params):
+        """Zeichnet ein Element für die Sketch-Prüfung auf."""
+        if self.conn.sketch_profile is not None:
+            self.conn.sketch_profile.add(kind, *params)
+
+    def _dimension(self, segment, kind: str, param: str, value: float,
+                   x: float, y: float):
+        """
+        Bemaßt ein Skizzenelement und registriert die Bemaßung (nur mit
+        conn.sketch_dimensions; im Batch-Modus gibt es kein Segment-Objekt).
+
+        Args:
+            segment: Von CreateCircle & Co. zurückgegebenes SketchSegment
+            x, y: Position des Bemaßungstexts in mm
+        """
+        if segment is None or self.conn.batch_active:
+            return
+        app = self.conn.app
+        if self._dim_prompt is None:
+            # Kein Eingabedialog für den Bemaßungswert (bis end_sketch)
+            self._dim_prompt = app.GetUserPreferenceToggle(SwConst.swInputDimValOnCreate)
+            app.SetUserPreferenceToggle(SwConst.swInputDimValOnCreate, False)
+        segment.Select4(False, _COM_NULL)
+        display = self.conn.model.AddDimension2(mm_to_m(x), mm_to_m(y), 0)
+        if display is None:
+            return
+        self.conn.dimensions.add(kind, display, {param: (None, value, False)}, sketch=True)
 
     def start_sketch(self, plane: str = "Front"):
         """
@@ -155,16 +2206,21 @@ class SketchOperations:
         plane_name = plane_map.get(plane, plane)
 
         # Ebene selektieren
-        self.conn.model.Extension.SelectByID2(
+        self.conn.extension.SelectByID2(
             plane_name, "PLANE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
         )
 
         # Sketch starten
         self.conn.sketch_manager.InsertSketch(True)
+        self.conn.sketch_profile = SketchProfile(plane)
 
     def end_sketch(self):
         """Beendet den aktiven Sketch."""
         self.conn.sketch_manager.InsertSketch(True)
+        if self._dim_prompt is not None:
+            self.conn.app.SetUserPreferenceToggle(SwConst.swInputDimValOnCreate,
+                                                  self._dim_prompt)
+            self._dim_prompt = None
 
     def line(self, x1: float, y1: float, x2: float, y2: float):
         """
@@ -174,6 +2230,7 @@ class SketchOperations:
             x1, y1: Startpunkt in mm
             x2, y2: Endpunkt in mm
         """
+        self._record("line", x1, y1, x2, y2)
         self.conn.sketch_manager.CreateLine(
             mm_to_m(x1), mm_to_m(y1), 0,
             mm_to_m(x2), mm_to_m(y2), 0
@@ -187,6 +2244,9 @@ class SketchOperations:
             cx, cy: Zentrum in mm (Standard: Ursprung)
             diameter: Durchmesser in mm
             radius: Radius in mm (alternativ zu diameter)
+
+        Mit sketch_dimensions=True wird der Durchmesser bemaßt und als
+        "circleN.diameter" registriert.
         """
         if diameter is not None:
             r = diameter / 2
@@ -196,10 +2256,13 @@ class SketchOperations:
             raise ValueError("Entweder diameter oder radius muss angegeben werden.")
 
         # CreateCircle braucht Zentrum und einen Punkt auf dem Kreis
-        self.conn.sketch_manager.CreateCircle(
+        self._record("circle", cx, cy, r)
+        segment = self.conn.sketch_manager.CreateCircle(
             mm_to_m(cx), mm_to_m(cy), 0,
             mm_to_m(cx + r), mm_to_m(cy), 0
         )
+        if self.conn.sketch_dimensions:
+            self._dimension(segment, "circle", "diameter", 2 * r, cx + r, cy + r)
 
     def rectangle(self, x1: float, y1: float, x2: float, y2: float):
         """
@@ -209,6 +2272,8 @@ class SketchOperations:
             x1, y1: Erste Ecke in mm
             x2, y2: Gegenüberliegende Ecke in mm
         """
+        if self.conn.sketch_profile is not None:
+            self.conn.sketch_profile.add_polyline([(x1, y1), (x2, y1), (x2, y2), (x1, y2)], True)
         self.conn.sketch_manager.CreateCornerRectangle(
             mm_to_m(x1), mm_to_m(y1), 0,
             mm_to_m(x2), mm_to_m(y2), 0
@@ -252,6 +2317,7 @@ class SketchOperations:
 
         # Direction: 1 = counter-clockwise, -1 = clockwise
         direction = 1 if end_angle > start_angle else -1
+        self._record("arc", cx, cy, radius, start_rad, end_rad - start_rad)
 
         self.conn.sketch_manager.CreateArc(
             mm_to_m(cx), mm_to_m(cy), 0,
@@ -269,18 +2335,57 @@ class SketchOperations:
             radius: Radius (Umkreis) in mm
             sides: Anzahl der Seiten (3 = Dreieck, 6 = Sechseck, etc.)
         """
-        points = []
-        for i in range(sides):
-            angle = 2 * math.pi * i / sides - math.pi / 2  # Start oben
-            x = cx + radius * math.cos(angle)
-            y = cy + radius * math.sin(angle)
-            points.append((x, y))
+        # Nativ: ein Aufruf, SolidWorks legt die Beziehungen selbst an
+        # (Inscribed=False: Eckpunkte liegen auf dem Umkreis)
+        angle = -math.pi / 2
+        if self._native(
+            "CreatePolygon",
+            mm_to_m(cx), mm_to_m(cy), 0,
+            mm_to_m(cx + radius * math.cos(angle)), mm_to_m(cy + radius * math.sin(angle)), 0,
+            sides, False
+        ):
+            if self.conn.sketch_profile is not None:
+                self.conn.sketch_profile.add_polyline(polygon_points(cx, cy, radius, sides), True)
+            return
+
+        # Fallback: einzelne Linien
+        self.polyline(polygon_points(cx, cy, radius, sides), closed=True)
+
+    def polyline(self, points, closed: bool = False):
+        """
+        Zeichnet einen Linienzug.
+
+        Args:
+            points: Liste von (x, y) in mm oder Array der Form (n, 2),
+                    z.B. aus polygon_points() oder rect_grid()
+            closed: True = letzten mit erstem Punkt verbinden
+        """
+        if self.conn.sketch_profile is not None:
+            self.conn.sketch_profile.add_polyline(points, closed)
+        create_line = self.conn.sketch_manager.CreateLine
+        for row in _line_rows(points, closed):
+            create_line(*row)
 
-        # Linien zeichnen
-        for i in range(sides):
-            x1, y1 = points[i]
-            x2, y2 = points[(i + 1) % sides]
-            self.line(x1, y1, x2, y2)
+    def circles(self, centers, diameter: float = None, radius: float = None):
+        """
+        Zeichnet gleich große Kreise an vielen Positionen.
+
+        Args:
+            centers: Liste von (x, y) in mm oder Array der Form (n, 2),
+                     z.B. aus circle_points(), rect_grid() oder hex_grid()
+            diameter: Durchmesser in mm
+            radius: Radius in mm (alternativ zu diameter)
+        """
+        if diameter is not None:
+            radius = diameter / 2
+        elif radius is None:
+            raise ValueError("Entweder diameter oder radius muss angegeben werden.")
+        if self.conn.sketch_profile is not None:
+            for x, y in (centers.tolist() if hasattr(centers, "tolist") else centers):
+                self.conn.sketch_profile.add("circle", x, y, radius)
+        create_circle = self.conn.sketch_manager.CreateCircle
+        for row in _circle_rows(centers, radius):
+            create_circle(*row)
 
     def slot(self, x1: float, y1: float, x2: float, y2: float, width: float):
         """
@@ -291,9 +2396,6 @@ class SketchOperations:
             x2, y2: Endpunkt der Mittellinie in mm
             width: Breite des Langlochs in mm
         """
-        # SolidWorks hat CreateSketchSlot, aber Parameter sind komplex
-        # Vereinfachte Version mit Linien und Bögen
-
         dx = x2 - x1
         dy = y2 - y1
         length = math.sqrt(dx*dx + dy*dy)
@@ -316,14 +2418,33 @@ class SketchOperations:
         p2 = (x1 - px * r, y1 - py * r)
         p3 = (x2 - px * r, y2 - py * r)
         p4 = (x2 + px * r, y2 + py * r)
+        start_angle = math.degrees(math.atan2(py, px))
 
-        # Linien
+        # Nativ: gerades Langloch, Länge von Mittelpunkt zu Mittelpunkt
+        if self._native(
+            "CreateSketchSlot",
+            SwConst.swSketchSlotCreationType_line,
+            SwConst.swSketchSlotLengthType_CenterCenter,
+            mm_to_m(width),
+            mm_to_m(x1), mm_to_m(y1), 0,
+            mm_to_m(x2), mm_to_m(y2), 0,
+            0, 0, 0,  # dritter Punkt nur für Bogen-Langlöcher
+            1,        # CenterArcDirection
+            False     # AddDimension
+        ):
+            # Gleiche Elemente wie der Fallback
+            start_rad = deg_to_rad(start_angle)
+            self._record("line", p1[0], p1[1], p4[0], p4[1])
+            self._record("line", p2[0], p2[1], p3[0], p3[1])
+            self._record("arc", x1, y1, r, start_rad, math.pi)
+            self._record("arc", x2, y2, r, start_rad + math.pi, math.pi)
+            return
+
+        # Fallback: zwei Linien und zwei Bögen
         self.line(p1[0], p1[1], p4[0], p4[1])
         self.line(p2[0], p2[1], p3[0], p3[1])
 
         # Halbkreise an den Enden
-        # Start-Ende
-        start_angle = math.degrees(math.atan2(py, px))
         self.arc(x1, y1, r, start_angle, start_angle + 180)
         self.arc(x2, y2, r, start_angle + 180, start_angle + 360)
 
@@ -355,6 +2476,8 @@ class SketchOperations:
         else:
             raise ValueError("minor_radius oder minor_diameter muss angegeben werden.")
 
+        self._record("ellipse", cx, cy, major_r, minor_r)
+
         # CreateEllipse(Xc, Yc, Zc, Xa, Ya, Za, Xb, Yb, Zb)
         # Xa, Ya, Za = Punkt auf Hauptachse
         # Xb, Yb, Zb = Punkt auf Nebenachse
@@ -376,6 +2499,11 @@ class SketchOperations:
         half_w = width / 2
         half_h = height / 2
 
+        if self.conn.sketch_profile is not None:
+            self.conn.sketch_profile.add_polyline(
+                [(cx - half_w, cy - half_h), (cx + half_w, cy - half_h),
+                 (cx + half_w, cy + half_h), (cx - half_w, cy + half_h)], True)
+
         # CreateCenterRectangle(Xc, Yc, Zc, Xp, Yp, Zp)
         # Xc, Yc, Zc = Zentrum
         # Xp, Yp, Zp = Eckpunkt
@@ -394,27 +2522,51 @@ class SketchOperations:
             x2, y2: Mittelpunkt (auf dem Bogen) in mm
             x3, y3: Endpunkt in mm
         """
+        self._record(*_three_point_arc(x1, y1, x2, y2, x3, y3))
         self.conn.sketch_manager.Create3PointArc(
             mm_to_m(x1), mm_to_m(y1), 0,
             mm_to_m(x2), mm_to_m(y2), 0,
             mm_to_m(x3), mm_to_m(y3), 0
         )
 
-    def spline(self, points: list, closed: bool = False):
+    def spline(self, points, closed: bool = False, tolerance: float = None,
+               method: str = "douglas-peucker"):
         """
         Zeichnet einen Spline durch Punktliste.
 
         Args:
-            points: Liste von (x, y) Tupeln in mm
+            points: Liste von (x, y) Tupeln in mm, Array der Form (n, 2) oder
+                    flacher float64-Puffer (x0, y0, x1, y1, ...), z.B.
+                    NumPy-Array oder array.array("d")
             closed: True für geschlossenen Spline
+            tolerance: Optionale Sehnentoleranz in mm; dichte Punktfolgen
+                       werden vorher reduziert (siehe decimate_points)
+            method: Reduktionsverfahren, "douglas-peucker" oder "curvature"
+
+        Returns:
+            DecimationStats bei Reduktion, sonst None
         """
+        stats = None
+        if tolerance is not None:
+            points, stats = decimate_points(points, tolerance, method, closed)
+
+        if self.conn.sketch_profile is not None:
+            if np is not None:
+                self._record("spline", np.asarray(points, dtype=float).reshape(-1, 2), closed)
+            else:
+                self._record("spline", _spline_pairs(points), closed)
+
         # Punktarray für API erstellen (x, y, z, x, y, z, ...)
-        point_data = []
-        for x, y in points:
-            point_data.extend([mm_to_m(x), mm_to_m(y), 0])
+        point_data = _spline_buffer(points)
 
-        # CreateSpline2 erwartet ein Variant-Array
+        if self.conn.batch_active:
+            # Makro-Parameter werden als Basic-Array ausgeschrieben
+            point_data = list(point_data)
+        else:
+            # CreateSpline2 erwartet ein Variant-Array (hier typisiert als Double-Array)
+            point_data = _double_array(point_data)
         self.conn.sketch_manager.CreateSpline2(point_data, closed)
+        return stats
 
     def add_relation(self, relation_type: str):
         """
@@ -450,6 +2602,8 @@ class SketchOperations:
         if rel_const is None:
             raise ValueError(f"Unbekannte Beziehung: {relation_type}")
 
+        # Beziehungen wirken auf die aktuelle Selektion: Batch vorher ausführen
+        self.conn.flush_batch()
         self.conn.model.SketchAddConstraints(rel_const)
 
 
@@ -459,6 +2613,36 @@ class FeatureOperations:
     def __init__(self, connection: SolidWorksConnection):
         self.conn = connection
 
+    def _preflight(self, feature: str, revolve_axis: str = None):
+        """
+        Prüft das zuletzt gezeichnete Profil, bevor das Feature ausgeführt wird.
+
+        Modus über conn.sketch_validation: "warn" gibt die Fehler aus,
+        "strict" löst SketchValidationError aus, None prüft nicht.
+        """
+        mode = self.conn.sketch_validation
+        profile = self.conn.sketch_profile
+        if not mode or not profile:
+            return
+        report = profile.validate(revolve_axis)
+        if report.ok:
+            return
+        message = f"Sketch-Prüfung vor {feature}: " + "; ".join(report.errors)
+        if mode == "strict":
+            raise SketchValidationError(message, report)
+        print(f"Warnung: {message}")
+
+    def _register(self, kind: str, feature, **dims):
+        """
+        Registriert die Bemaßungen eines neuen Features für update().
+
+        Args:
+            dims: Parameter=(Bemaßungsname, Wert, Winkel?), z.B.
+                  depth=("D1", 20, False) -> "extrude1.depth"
+        """
+        self.conn.dimensions.add(kind, feature, dims)
+        return feature
+
     def extrude(self, depth: float, direction: int = 1, draft_angle: float = 0):
         """
         Extrudiert den aktuellen Sketch.
@@ -467,6 +2651,9 @@ class FeatureOperations:
             depth: Tiefe in mm
             direction: 1 = normal, -1 = umgekehrt, 0 = beidseitig
             draft_angle: Anzugswinkel in Grad (optional)
+
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
         """
         # FeatureExtrusion3 Parameter:
         # Sd (Single direction), Flip, Dir (direction),
@@ -475,12 +2662,13 @@ class FeatureOperations:
         # OffsetReverse1, OffsetReverse2, TranslateSurface1, TranslateSurface2,
         # Merge, UseFeatScope, UseAutoSelect, T0 (start type), StartOffset, FlipStartOffset
 
+        self._preflight("extrude")
         depth_m = mm_to_m(depth)
         draft_rad = deg_to_rad(draft_angle)
 
         if direction == 0:
             # Beidseitig
-            self.conn.feature_manager.FeatureExtrusion3(
+            feature = self.conn.feature_manager.FeatureExtrusion3(
                 False,  # Sd - not single direction
                 False,  # Flip
                 False,  # Dir
@@ -502,9 +2690,12 @@ class FeatureOperations:
                 0,      # StartOffset
                 False   # FlipStartOffset
             )
+            return self._register("extrude", feature,
+                                  depth1=("D1", depth / 2, False),
+                                  depth2=("D2", depth / 2, False))
         else:
             # Einseitig
-            self.conn.feature_manager.FeatureExtrusion3(
+            feature = self.conn.feature_manager.FeatureExtrusion3(
                 True,   # Sd - single direction
                 direction < 0,  # Flip
                 False,  # Dir
@@ -526,6 +2717,7 @@ class FeatureOperations:
                 0,      # StartOffset
                 False   # FlipStartOffset
             )
+            return self._register("extrude", feature, depth=("D1", depth, False))
 
     def cut(self, depth: float = 10.0, direction: int = 1, through_all: bool = False):
         """
@@ -535,15 +2727,18 @@ class FeatureOperations:
             depth: Tiefe in mm (ignoriert wenn through_all=True)
             direction: 1 = normal, -1 = umgekehrt
             through_all: True = durch alles schneiden
+
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
         """
+        self._preflight("cut")
         depth_m = mm_to_m(depth)
 
         # End type: 0 = Blind, 1 = Through All
         end_type = 1 if through_all else 0
 
         flip = 1 if direction < 0 else 0
-        fm = self.conn.model.FeatureManager
-        fm.FeatureCut(
+        feature = self.conn.feature_manager.FeatureCut(
             1,          # Sd - single direction
             flip,       # Flip
             0,          # Dir
@@ -554,6 +2749,9 @@ class FeatureOperations:
             0, 0, 0, 0, # Dchk1, Dchk2, Ddir1, Ddir2
             0.0, 0.0    # Dang1, Dang2
         )
+        if through_all:
+            return self._register("cut", feature)
+        return self._register("cut", feature, depth=("D1", depth, False))
 
     def chamfer(self, distance: float, angle: float = 45):
         """
@@ -563,6 +2761,9 @@ class FeatureOperations:
             distance: Fasenabstand in mm
             angle: Fasenwinkel in Grad (Standard: 45)
 
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
+
         Hinweis: Kanten müssen vorher selektiert sein!
         """
         distance_m = mm_to_m(distance)
@@ -572,7 +2773,7 @@ class FeatureOperations:
         # Options, ChamferType, Distance, Angle, OtherDistance,
         # VertexChamDist1, VertexChamDist2, VertexChamDist3
 
-        self.conn.feature_manager.InsertFeatureChamfer(
+        feature = self.conn.feature_manager.InsertFeatureChamfer(
             2,  # Options: 2 = use selections
             1,  # ChamferType: 1 = Angle-Distance
             distance_m,
@@ -580,6 +2781,9 @@ class FeatureOperations:
             0,  # OtherDistance (for symmetric)
             0, 0, 0  # Vertex distances
         )
+        return self._register("chamfer", feature,
+                              distance=("D1", distance, False),
+                              angle=("D2", angle, True))
 
     def fillet(self, radius: float):
         """
@@ -588,13 +2792,16 @@ class FeatureOperations:
         Args:
             radius: Verrundungsradius in mm
 
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
+
         Hinweis: Kanten müssen vorher selektiert sein!
         """
         radius_m = mm_to_m(radius)
 
         # FeatureFillet3 Parameter sind komplex
         # Vereinfachte Version mit SimpleFilletFeature
-        self.conn.feature_manager.FeatureFillet3(
+        feature = self.conn.feature_manager.FeatureFillet3(
             195,    # Options
             radius_m,
             0,      # Fillet type
@@ -610,10 +2817,11 @@ class FeatureOperations:
             False,  # Zebra
             False   # Faceted
         )
+        return self._register("fillet", feature, radius=("D1", radius, False))
 
     def circular_hole_pattern(self, num_holes: int, hole_diameter: float,
                                pitch_circle_diameter: float, hole_depth: float,
-                               start_angle: float = 0):
+                               start_angle: float = 0, mode: str = "separate"):
         """
         Erstellt ein kreisförmiges Bohrungsmuster.
 
@@ -623,36 +2831,94 @@ class FeatureOperations:
             pitch_circle_diameter: Lochkreisdurchmesser in mm
             hole_depth: Bohrtiefe in mm
             start_angle: Startwinkel in Grad
+            mode: "separate" = ein Sketch und ein Schnitt pro Bohrung
+                  "sketch"   = alle Kreise in einem Sketch, ein Schnitt
+                  "pattern"  = eine Bohrung plus Kreismuster-Feature
+
+        Bei "sketch" und "pattern" bleibt die Anzahl der Features (und
+        damit die Rebuild-Zeit) unabhängig von num_holes.
+
+        Returns:
+            Zuletzt erzeugtes Feature ("separate": letzter Schnitt,
+            "sketch": der Schnitt, "pattern": das Kreismuster)
         """
         r = pitch_circle_diameter / 2
-        angle_step = 360 / num_holes
+        hole_r = hole_diameter / 2
+
+        positions = circle_points(0, 0, r, num_holes, start_angle)
+
+        if mode == "separate":
+            feature = None
+            for x, y in positions:
+                self._hole_sketch([(x, y)], hole_r)
+                feature = self.cut(hole_depth)
+            return feature
+        elif mode == "sketch":
+            self._hole_sketch(positions, hole_r)
+            return self.cut(hole_depth)
+        elif mode == "pattern":
+            self._hole_sketch(positions[:1], hole_r)
+            seed = self.cut(hole_depth)
+            if seed is None or num_holes < 2:
+                return seed
+            return self._circular_pattern(seed, num_holes)
+        else:
+            raise ValueError(f"Unbekannter Modus: {mode}")
 
-        for i in range(num_holes):
-            angle = start_angle + i * angle_step
-            angle_rad = deg_to_rad(angle)
+    def _hole_sketch(self, positions: list, hole_r: float):
+        """Zeichnet Kreise (Radius hole_r) in einem Sketch auf der Front-Ebene."""
+        self.conn.extension.SelectByID2(
+            "Front Plane", "PLANE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
+        )
+        self.conn.sketch_manager.InsertSketch(True)
+        self.conn.sketch_profile = profile = SketchProfile("Front")
 
-            # Position berechnen
-            x = r * math.cos(angle_rad)
-            y = r * math.sin(angle_rad)
+        create_circle = self.conn.sketch_manager.CreateCircle
+        for row in _circle_rows(positions, hole_r):
+            profile.add("circle", row[0] * 1000.0, row[1] * 1000.0, hole_r)
+            create_circle(*row)
 
-            # Sketch für diese Bohrung
-            self.conn.model.Extension.SelectByID2(
-                "Front Plane", "PLANE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
-            )
-            self.conn.sketch_manager.InsertSketch(True)
+        self.conn.sketch_manager.InsertSketch(True)
 
-            # Kreis zeichnen
-            hole_r = hole_diameter / 2
-            self.conn.sketch_manager.CreateCircle(
-                mm_to_m(x), mm_to_m(y), 0,
-                mm_to_m(x + hole_r), mm_to_m(y), 0
-            )
+    def _circular_pattern(self, seed, count: int):
+        """
+        Mustert das Feature seed count-mal um die Z-Achse (gleichmäßig 360°).
 
-            # Sketch beenden
-            self.conn.sketch_manager.InsertSketch(True)
+        Die Achse wird als Schnitt von Top- und Right-Ebene erzeugt.
+        """
+        model = self.conn.model
+        self.conn.extension.SelectByID2(
+            "Top Plane", "PLANE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
+        )
+        self.conn.extension.SelectByID2(
+            "Right Plane", "PLANE", 0.0, 0.0, 0.0, True, 0, _COM_NULL, 0
+        )
+        model.InsertAxis2(True)
+        axis = model.FeatureByPositionReverse(0)
 
-            # Cut erstellen
-            self.cut(hole_depth)
+        # Mark 1 = Musterachse, Mark 4 = zu musterndes Feature
+        self.conn.extension.SelectByID2(
+            axis.Name, "AXIS", 0.0, 0.0, 0.0, False, 1, _COM_NULL, 0
+        )
+        self.conn.extension.SelectByID2(
+            seed.Name, "BODYFEATURE", 0.0, 0.0, 0.0, True, 4, _COM_NULL, 0
+        )
+        return self.conn.feature_manager.FeatureCircularPattern5(
+            count,              # Number
+            deg_to_rad(360),    # Spacing (Gesamtwinkel)
+            False,              # FlipDirection
+            "NULL",             # DName
+            False,              # GeometryPattern
+            True,               # EqualSpacing
+            False,              # VaryInstance
+            False,              # SyncSubAssemblies
+            False,              # BDir2
+            False,              # BSymmetric
+            1,                  # Number2
+            0.0,                # Spacing2
+            "NULL",             # DName2
+            False               # EqualSpacing2
+        )
 
     def linear_pattern(self, direction: str, count: int, spacing: float):
         """
@@ -696,8 +2962,12 @@ class FeatureOperations:
             axis: Drehachse - "X", "Y", "Z" oder Achsenname
             direction: 1 = normal, -1 = umgekehrt, 0 = beidseitig
 
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
+
         Hinweis: Sketch muss eine Mittellinie oder Achse enthalten!
         """
+        self._preflight("revolve", axis.upper() if axis.upper() in ("X", "Y") else "auto")
         angle_rad = deg_to_rad(angle)
 
         # Achse auswählen (falls nicht bereits selektiert)
@@ -709,7 +2979,7 @@ class FeatureOperations:
 
         if direction == 0:
             # Beidseitig (MidPlane)
-            self.conn.feature_manager.FeatureRevolve2(
+            feature = self.conn.feature_manager.FeatureRevolve2(
                 False,  # SingleDir
                 True,   # IsSolid
                 False,  # IsThin
@@ -728,7 +2998,7 @@ class FeatureOperations:
             )
         else:
             # Einseitig
-            self.conn.feature_manager.FeatureRevolve2(
+            feature = self.conn.feature_manager.FeatureRevolve2(
                 True,   # SingleDir
                 True,   # IsSolid
                 False,  # IsThin
@@ -745,6 +3015,7 @@ class FeatureOperations:
                 True,   # UseFeatScope
                 True    # UseAutoSelect
             )
+        return self._register("revolve", feature, angle=("D1", angle, True))
 
     def revolve_cut(self, angle: float = 360, direction: int = 1):
         """
@@ -753,10 +3024,14 @@ class FeatureOperations:
         Args:
             angle: Drehwinkel in Grad (Standard: 360)
             direction: 1 = normal, -1 = umgekehrt
+
+        Returns:
+            Feature-Objekt (None, wenn SolidWorks das Feature ablehnt)
         """
+        self._preflight("revolve_cut", "auto")
         angle_rad = deg_to_rad(angle)
 
-        self.conn.feature_manager.FeatureRevolve2(
+        feature = self.conn.feature_manager.FeatureRevolve2(
             True,   # SingleDir
             True,   # IsSolid
             False,  # IsThin
@@ -773,6 +3048,7 @@ class FeatureOperations:
             True,   # UseFeatScope
             True    # UseAutoSelect
         )
+        return self._register("revolve_cut", feature, angle=("D1", angle, True))
 
     def reference_plane(self, offset: float, base_plane: str = "Front"):
         """
@@ -794,7 +3070,7 @@ class FeatureOperations:
 
         plane_name = plane_map.get(base_plane, base_plane)
 
-        self.conn.model.Extension.SelectByID2(
+        self.conn.extension.SelectByID2(
             plane_name, "PLANE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
         )
 
@@ -829,7 +3105,7 @@ class FeatureOperations:
         plane_name = plane_map.get(plane, plane)
 
         # Spiegelebene zur Selektion hinzufügen
-        self.conn.model.Extension.SelectByID2(
+        self.conn.extension.SelectByID2(
             plane_name, "PLANE", 0.0, 0.0, 0.0, True, 0, _COM_NULL, 0
         )
 
@@ -847,6 +3123,8 @@ class SelectionHelper:
 
     def __init__(self, connection: SolidWorksConnection):
         self.conn = connection
+        # API-Methoden, die diese SolidWorks-Version nicht kennt
+        self._unsupported = set()
 
     def select_by_id(self, name: str, obj_type: str, append: bool = False):
         """
@@ -857,7 +3135,7 @@ class SelectionHelper:
             obj_type: Typ ("PLANE", "FACE", "EDGE", "VERTEX", "BODYFEATURE")
             append: True = zur Selektion hinzufügen, False = ersetzen
         """
-        return self.conn.model.Extension.SelectByID2(
+        return self.conn.extension.SelectByID2(
             name, obj_type, 0.0, 0.0, 0.0, append, 0, _COM_NULL, 0
         )
 
@@ -880,7 +3158,7 @@ class SelectionHelper:
 
         sel_type = type_map.get(obj_type.upper(), SwConst.swSelFACES)
 
-        return self.conn.model.Extension.SelectByRay(
+        return self.conn.extension.SelectByRay(
             mm_to_m(x), mm_to_m(y), mm_to_m(z),
             dx, dy, dz,
             0.001,  # Radius
@@ -906,28 +3184,438 @@ class SelectionHelper:
         Für komplexe Selektion B-Rep traversieren.
         """
         # Alle Körper durchlaufen
+        edges = []
         bodies = self.conn.model.GetBodies2(0, True)  # 0 = Solid bodies
         if bodies:
             for body in bodies:
-                edges = body.GetEdges()
-                if edges:
-                    for edge in edges:
-                        edge.Select4(True, _COM_NULL)
+                edges.extend(body.GetEdges() or ())
+        return self.select_many(edges, append=True)
+
+    def select_many(self, entities, append: bool = False, mark: int = 0,
+                    bulk: bool = True) -> int:
+        """
+        Selektiert viele Objekte (Kanten, Flächen, ...) mit einem Aufruf.
+
+        Die Objekte werden als ein Array von IDispatch-Zeigern an
+        Extension.MultiSelect2 übergeben. Fehlt die Methode, wird jedes
+        Objekt einzeln per Select4 selektiert; andere Fehler werden
+        weitergereicht.
+
+        Args:
+            entities: SolidWorks-Objekte oder BRepEntity (auch EntitySet)
+            append: True = zur Selektion hinzufügen, False = ersetzen
+            mark: Selektionsmarke (z.B. für Features mit mehreren Listen)
+            bulk: False = Einzelselektion erzwingen
+
+        Returns:
+            Anzahl der selektierten Objekte
+        """
+        objects = [e.obj if isinstance(e, BRepEntity) else e for e in entities]
+        if not objects:
+            if not append:
+                self.conn.model.ClearSelection2(True)
+            return 0
+
+        data = _COM_NULL
+        if mark:
+            data = self.conn.selection_manager.CreateSelectData()
+            data.Mark = mark
+
+        if bulk and "MultiSelect2" not in self._unsupported:
+            try:
+                return self.conn.extension.MultiSelect2(_dispatch_array(objects), append, data)
+            except Exception as e:
+                if not _missing_member(e):
+                    raise
+                self._unsupported.add("MultiSelect2")
+
+        count = 0
+        for i, obj in enumerate(objects):
+            if obj.Select4(append or i > 0, data):
+                count += 1
+        return count
+
+    def get_selection_count(self) -> int:
+        """Gibt die Anzahl der selektierten Objekte zurück."""
+        return self.conn.selection_manager.GetSelectedObjectCount2(-1)
+
+    def clear_selection(self):
+        """Hebt alle Selektionen auf."""
+        self.conn.model.ClearSelection2(True)
+
+    def get_body(self):
+        """Gibt den ersten Solid-Körper zurück."""
+        bodies = self.conn.model.GetBodies2(0, True)
+        if bodies and len(bodies) > 0:
+            return bodies[0]
+        return None
+
+    def snapshot(self, persistent: bool = False) -> "BRepSnapshot":
+        """
+        Liest Flächen und Kanten aller Solid-Körper einmalig ein.
+
+        Args:
+            persistent: True = zusätzlich persistente IDs abrufen
+                        (ein weiterer Aufruf pro Element)
+
+        Verwendung:
+            snap = sw.selection.snapshot()
+            top = snap.faces.facing((0, 0, 1)).extreme("z")
+            snap.edges.on_face(top[0]).of_type("line").select()
+        """
+        return BRepSnapshot.capture(self, persistent)
+
+
+def _dispatch_array(objects: list):
+    """Übergibt Objekte als SAFEARRAY von IDispatch (VT_ARRAY | VT_DISPATCH)."""
+    if win32com is None:
+        return tuple(objects)
+    return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_DISPATCH, list(objects))
+
+
+def _unpack_ints(value: float) -> tuple:
+    """Entpackt die zwei Integer eines PackedDouble der API."""
+    return struct.unpack("<ii", struct.pack("<d", value))
+
+
+def _unit(vector) -> tuple:
+    """Normiert einen Vektor (Nullvektor bleibt Nullvektor)."""
+    length = math.sqrt(sum(c * c for c in vector))
+    if length == 0:
+        return (0.0, 0.0, 0.0)
+    return tuple(c / length for c in vector)
+
+
+def _dot(a, b) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+# Kurventyp (swCurveTypes_e) -> Name im Snapshot
+_CURVE_NAMES = {
+    SwConst.LINE_TYPE: "line",
+    SwConst.CIRCLE_TYPE: "circle",
+    SwConst.ELLIPSE_TYPE: "ellipse",
+    SwConst.BCURVE_TYPE: "spline",
+}
+
+_AXES = {"x": 0, "y": 1, "z": 2}
+
+
+class BRepEntity:
+    """
+    Fläche oder Kante eines B-Rep-Snapshots (Koordinaten in mm).
+
+    Attribute:
+        kind: "face" oder "edge"
+        obj: SolidWorks-Objekt (IFace2 / IEdge) für die Selektion
+        box: (xmin, ymin, zmin, xmax, ymax, zmax)
+        vector: Normale ebener Flächen, Richtung von Linien, Achse von
+                Kreisen (sonst Nullvektor)
+        curve: "plane"/"surface" bzw. "line"/"circle"/"ellipse"/"spline"/"other"
+        start, end: Endpunkte (nur Kanten)
+        center, radius: Kreismittelpunkt und Radius (nur Kreiskanten)
+        persist_id: Persistente ID (bytes) oder None
+    """
+
+    __slots__ = ("kind", "index", "obj", "box", "vector", "curve",
+                 "start", "end", "center", "radius", "persist_id")
+
+    def __init__(self, kind: str, index: int, obj, box: tuple, vector: tuple, curve: str,
+                 start: tuple = None, end: tuple = None, center: tuple = None,
+                 radius: float = None, persist_id: bytes = None):
+        self.kind = kind
+        self.index = index
+        self.obj = obj
+        self.box = box
+        self.vector = vector
+        self.curve = curve
+        self.start = start
+        self.end = end
+        self.center = center
+        self.radius = radius
+        self.persist_id = persist_id
+
+    @property
+    def midpoint(self) -> tuple:
+        """Mittelpunkt der Box."""
+        b = self.box
+        return ((b[0] + b[3]) / 2, (b[1] + b[4]) / 2, (b[2] + b[5]) / 2)
+
+    def __repr__(self):
+        mid = ", ".join(f"{c:.3g}" for c in self.midpoint)
+        return f"BRepEntity({self.kind} #{self.index} {self.curve} @ ({mid}))"
+
+
+class _BVH:
+    """Bounding-Volume-Hierarchie über Boxen (Median-Teilung, reines Python)."""
+
+    LEAF_SIZE = 8
+
+    def __init__(self, boxes: list):
+        self.boxes = boxes
+        self.root = self._build(list(range(len(boxes)))) if boxes else None
+
+    def _build(self, indices: list):
+        b = self.boxes
+        box = (min(b[i][0] for i in indices), min(b[i][1] for i in indices),
+               min(b[i][2] for i in indices), max(b[i][3] for i in indices),
+               max(b[i][4] for i in indices), max(b[i][5] for i in indices))
+        if len(indices) <= self.LEAF_SIZE:
+            return box, indices, None
+        axis = max(range(3), key=lambda a: box[a + 3] - box[a])
+        indices.sort(key=lambda i: b[i][axis] + b[i][axis + 3])
+        mid = len(indices) // 2
+        return box, None, (self._build(indices[:mid]), self._build(indices[mid:]))
+
+    @staticmethod
+    def _overlaps(box: tuple, lo: tuple, hi: tuple) -> bool:
+        return (box[0] <= hi[0] and box[1] <= hi[1] and box[2] <= hi[2]
+                and box[3] >= lo[0] and box[4] >= lo[1] and box[5] >= lo[2])
+
+    def query(self, lo: tuple, hi: tuple) -> list:
+        """Indizes aller Boxen, die [lo, hi] schneiden."""
+        result = []
+        stack = [self.root] if self.root else []
+        while stack:
+            box, indices, children = stack.pop()
+            if not self._overlaps(box, lo, hi):
+                continue
+            if children:
+                stack.extend(children)
+            else:
+                result.extend(i for i in indices if self._overlaps(self.boxes[i], lo, hi))
+        return sorted(result)
+
+
+class EntitySet:
+    """
+    Auswahl von Snapshot-Elementen mit verkettbaren Filtern.
+
+    Alle Filter laufen lokal ohne API-Aufrufe; erst select() selektiert
+    die verbleibenden Elemente in SolidWorks.
+    """
+
+    def __init__(self, snapshot: "BRepSnapshot", entities: list):
+        self.snapshot = snapshot
+        self.entities = list(entities)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EntitySet(self.snapshot, self.entities[index])
+        return self.entities[index]
+
+    def __repr__(self):
+        return f"EntitySet({len(self.entities)} Elemente)"
+
+    @property
+    def objects(self) -> list:
+        """Die SolidWorks-Objekte der Auswahl."""
+        return [e.obj for e in self.entities]
+
+    def where(self, predicate) -> "EntitySet":
+        """Filtert mit einer Funktion predicate(entity) -> bool."""
+        return EntitySet(self.snapshot, [e for e in self.entities if predicate(e)])
+
+    def of_type(self, *curves: str) -> "EntitySet":
+        """Filtert nach Geometrietyp, z.B. of_type("line") oder of_type("plane")."""
+        return self.where(lambda e: e.curve in curves)
+
+    def _angles(self, direction) -> list:
+        """Kosinus zwischen vector und direction für alle Elemente."""
+        d = _unit(direction)
+        if np is not None and self.entities:
+            vectors = self.snapshot._vectors[[e.index for e in self.entities]]
+            return (vectors @ np.array(d)).tolist()
+        return [_dot(e.vector, d) for e in self.entities]
+
+    def parallel_to(self, direction, tolerance: float = 1.0) -> "EntitySet":
+        """
+        Elemente, deren vector (Linienrichtung, Kreisachse, Flächennormale)
+        parallel zu direction ist (beide Orientierungen, tolerance in Grad).
+        """
+        limit = math.cos(math.radians(tolerance))
+        cosines = self._angles(direction)
+        return EntitySet(self.snapshot, [e for e, c in zip(self.entities, cosines)
+                                         if abs(c) >= limit])
+
+    def perpendicular_to(self, direction, tolerance: float = 1.0) -> "EntitySet":
+        """Elemente, deren vector senkrecht zu direction ist."""
+        limit = math.sin(math.radians(tolerance))
+        cosines = self._angles(direction)
+        return EntitySet(self.snapshot, [e for e, c in zip(self.entities, cosines)
+                                         if abs(c) <= limit and any(e.vector)])
+
+    def facing(self, direction, tolerance: float = 1.0) -> "EntitySet":
+        """Ebene Flächen, deren Normale in Richtung direction zeigt."""
+        limit = math.cos(math.radians(tolerance))
+        cosines = self._angles(direction)
+        return EntitySet(self.snapshot, [e for e, c in zip(self.entities, cosines)
+                                         if c >= limit])
+
+    def in_box(self, lo: tuple, hi: tuple, inside: bool = True) -> "EntitySet":
+        """
+        Elemente in der Box [lo, hi] (mm).
+
+        Args:
+            inside: True = vollständig enthalten, False = Box wird berührt
+        """
+        found = self.snapshot._query(lo, hi)
+        if inside:
+            found = [e for e in found
+                     if all(lo[a] <= e.box[a] and e.box[a + 3] <= hi[a] for a in range(3))]
+        members = {id(e) for e in self.entities}
+        return EntitySet(self.snapshot, [e for e in found if id(e) in members])
+
+    def near(self, point: tuple, distance: float) -> "EntitySet":
+        """Elemente, deren Box höchstens distance (mm) von point entfernt ist."""
+        lo = tuple(c - distance for c in point)
+        hi = tuple(c + distance for c in point)
+
+        def gap(e):
+            return math.sqrt(sum(max(e.box[a] - point[a], 0.0, point[a] - e.box[a + 3]) ** 2
+                                 for a in range(3)))
+        return self.in_box(lo, hi, inside=False).where(lambda e: gap(e) <= distance)
+
+    def on_face(self, face: BRepEntity, tolerance: float = 0.01) -> "EntitySet":
+        """Kanten, die auf der Fläche face liegen (geometrisch bestimmt)."""
+        lo = tuple(c - tolerance for c in face.box[:3])
+        hi = tuple(c + tolerance for c in face.box[3:])
+        result = self.in_box(lo, hi)
+        if face.curve == "plane":
+            origin = face.midpoint
+            normal = face.vector
+
+            def on_plane(e):
+                points = [p for p in (e.start, e.end, e.center) if p is not None]
+                return all(abs(_dot([p[a] - origin[a] for a in range(3)], normal)) <= tolerance
+                           for p in points)
+            result = result.where(on_plane)
+        return result
+
+    def extreme(self, axis: str, largest: bool = True, tolerance: float = 0.01) -> "EntitySet":
+        """Elemente mit dem größten (bzw. kleinsten) Mittelpunkt entlang axis."""
+        if not self.entities:
+            return self
+        a = _AXES[axis.lower()]
+        values = [e.midpoint[a] for e in self.entities]
+        target = max(values) if largest else min(values)
+        return EntitySet(self.snapshot, [e for e, v in zip(self.entities, values)
+                                         if abs(v - target) <= tolerance])
+
+    def select(self, append: bool = False, mark: int = 0) -> int:
+        """Selektiert alle Elemente mit einem Aufruf; gibt deren Anzahl zurück."""
+        return self.snapshot.selection.select_many(self.entities, append, mark)
+
+
+class BRepSnapshot:
+    """
+    Lokale Kopie der Flächen und Kanten aller Solid-Körper.
 
-    def get_selection_count(self) -> int:
-        """Gibt die Anzahl der selektierten Objekte zurück."""
-        return self.conn.selection_manager.GetSelectedObjectCount2(-1)
+    capture() holt Boxen, Normalen und Kurvenparameter einmalig ab; Abfragen
+    über faces/edges laufen danach lokal über einen räumlichen Index (NumPy,
+    sonst BVH). Der Snapshot gilt bis zur nächsten Modelländerung.
+    """
 
-    def clear_selection(self):
-        """Hebt alle Selektionen auf."""
-        self.conn.model.ClearSelection2(True)
+    def __init__(self, selection: SelectionHelper, entities: list):
+        self.selection = selection
+        self.conn = selection.conn
+        self.entities = entities
+        boxes = [e.box for e in entities]
+        if np is not None:
+            self._boxes = np.array(boxes, dtype=float).reshape(-1, 6)
+            self._vectors = np.array([e.vector for e in entities], dtype=float).reshape(-1, 3)
+            self._bvh = None
+        else:
+            self._bvh = _BVH(boxes)
+
+    @classmethod
+    def capture(cls, selection: SelectionHelper, persistent: bool = False):
+        """Liest die Topologie des aktiven Modells ein."""
+        connection = selection.conn
+        extension = connection.extension if persistent else None
+        entities = []
+
+        def persist(obj):
+            if extension is None:
+                return None
+            value = extension.GetPersistReference3(obj)
+            return bytes(value) if value is not None else None
+
+        for body in connection.model.GetBodies2(0, True) or ():  # 0 = Solid bodies
+            faces = body.GetFaces() or ()
+            edges = body.GetEdges() or ()
+            for face in faces:
+                box = tuple(v * 1000.0 for v in face.GetBox())
+                normal = _unit(face.Normal or (0.0, 0.0, 0.0))
+                curve = "plane" if any(normal) else "surface"
+                entities.append(BRepEntity("face", len(entities), face, box, normal, curve,
+                                           persist_id=persist(face)))
+            for edge in edges:
+                entities.append(cls._edge(edge, len(entities), persist))
+        return cls(selection, entities)
+
+    @staticmethod
+    def _edge(edge, index: int, persist) -> BRepEntity:
+        params = edge.GetCurveParams2()
+        start = tuple(v * 1000.0 for v in params[0:3])
+        end = tuple(v * 1000.0 for v in params[3:6])
+        curve = _CURVE_NAMES.get(_unpack_ints(params[8])[0], "other")
+        points = [start, end]
+        vector = _unit([end[a] - start[a] for a in range(3)]) if curve == "line" else (0.0, 0.0, 0.0)
+        center = radius = None
+        if curve == "circle":
+            circle = edge.GetCurve().CircleParams
+            if circle:
+                center = tuple(v * 1000.0 for v in circle[0:3])
+                vector = _unit(circle[3:6])
+                radius = circle[6] * 1000.0
+                # Ausdehnung eines Kreises um die Achse: r * sqrt(1 - a_i^2)
+                extent = [radius * math.sqrt(max(0.0, 1.0 - c * c)) for c in vector]
+                points += [tuple(center[a] - extent[a] for a in range(3)),
+                           tuple(center[a] + extent[a] for a in range(3))]
+        box = (min(p[0] for p in points), min(p[1] for p in points), min(p[2] for p in points),
+               max(p[0] for p in points), max(p[1] for p in points), max(p[2] for p in points))
+        return BRepEntity("edge", index, edge, box, vector, curve, start, end, center, radius,
+                          persist(edge))
 
-    def get_body(self):
-        """Gibt den ersten Solid-Körper zurück."""
-        bodies = self.conn.model.GetBodies2(0, True)
-        if bodies and len(bodies) > 0:
-            return bodies[0]
-        return None
+    @property
+    def faces(self) -> EntitySet:
+        """Alle Flächen."""
+        return EntitySet(self, [e for e in self.entities if e.kind == "face"])
+
+    @property
+    def edges(self) -> EntitySet:
+        """Alle Kanten."""
+        return EntitySet(self, [e for e in self.entities if e.kind == "edge"])
+
+    def _query(self, lo: tuple, hi: tuple) -> list:
+        """Elemente, deren Box [lo, hi] schneidet."""
+        if self._bvh is not None:
+            return [self.entities[i] for i in self._bvh.query(lo, hi)]
+        if not self.entities:
+            return []
+        b = self._boxes
+        mask = (np.all(b[:, :3] <= np.array(hi), axis=1)
+                & np.all(b[:, 3:] >= np.array(lo), axis=1))
+        return [self.entities[i] for i in np.nonzero(mask)[0]]
+
+    def select(self, entities, append: bool = False, mark: int = 0) -> int:
+        """Selektiert Elemente mit einem Aufruf (siehe SelectionHelper.select_many)."""
+        return self.selection.select_many(entities, append, mark)
+
+    def stats(self) -> dict:
+        """Umfang des Snapshots (Flächen, Kanten, räumlicher Index)."""
+        return {
+            "faces": sum(e.kind == "face" for e in self.entities),
+            "edges": sum(e.kind == "edge" for e in self.entities),
+            "index": "bvh" if self._bvh is not None else "numpy",
+        }
 
 
 class DocumentManager:
@@ -935,6 +3623,8 @@ class DocumentManager:
 
     def __init__(self, app):
         self.app = app
+        # Optionaler DocumentPool für new_part() (siehe DocumentPool)
+        self.pool = None
         # Standard-Templates (können je nach Installation variieren)
         self._templates = {
             "part": r"C:\ProgramData\SolidWorks\SOLIDWORKS 2023\templates\Part.prtdot",
@@ -963,6 +3653,8 @@ class DocumentManager:
             ModelDoc2 Objekt
         """
         template_path = template or self._templates.get("part", "")
+        if self.pool is not None and template_path == self.pool.template:
+            return self.pool.acquire()
 
         # Versuche Standard-Template oder leeres Dokument
         try:
@@ -972,7 +3664,7 @@ class DocumentManager:
             model = self.app.NewPart()
 
         if model:
-            print(f"Neues Part erstellt: {model.GetTitle}")
+            print(f"Neues Part erstellt: {com_value(model, 'GetTitle')}")
         return model
 
     def new_assembly(self, template: str = None):
@@ -993,7 +3685,7 @@ class DocumentManager:
             model = self.app.NewAssembly()
 
         if model:
-            print(f"Neue Baugruppe erstellt: {model.GetTitle}")
+            print(f"Neue Baugruppe erstellt: {com_value(model, 'GetTitle')}")
         return model
 
     def open(self, file_path: str):
@@ -1028,7 +3720,7 @@ class DocumentManager:
         )
 
         if model:
-            print(f"Dokument geöffnet: {model.GetTitle}")
+            print(f"Dokument geöffnet: {com_value(model, 'GetTitle')}")
         else:
             print(f"Fehler beim Öffnen: Error={errors}, Warning={warnings}")
 
@@ -1045,14 +3737,969 @@ class DocumentManager:
         if model:
             if save:
                 model.Save3(1, 0, 0)
-            title = model.GetTitle
+            title = com_value(model, "GetTitle")
             self.app.CloseDoc(title)
             print(f"Dokument geschlossen: {title}")
 
     def close_all(self, save: bool = False):
-        """Schließt alle geöffneten Dokumente."""
-        while self.app.ActiveDoc:
-            self.close(save)
+        """
+        Schließt alle geöffneten Dokumente mit einem CloseAllDocuments-Aufruf.
+
+        Args:
+            save: True = vorher jedes Dokument speichern
+        """
+        if save:
+            for model in self.app.GetDocuments() or ():
+                model.Save3(1, 0, 0)
+        try:
+            closed = self.app.CloseAllDocuments(True)
+        except Exception:
+            closed = False
+        if not closed:
+            # Fallback: einzeln schließen
+            while self.app.ActiveDoc:
+                self.close(save)
+        print("Alle Dokumente geschlossen")
+
+
+class DocumentPool:
+    """
+    Vorrat leerer Part-Dokumente, damit new_part() nicht auf NewDocument wartet.
+
+    Der Pool hält size Dokumente aus dem Template bereit. Aufgefüllt wird in
+    Leerlaufzeiten über maintain() (z.B. aus der Daemon-Schleife zwischen
+    zwei Anfragen). Nach idle_timeout Sekunden ohne acquire() schließt
+    maintain() überzählige Dokumente bis auf idle_size.
+
+    Auffüllen und acquire() laufen bewusst im selben Thread: NewDocument
+    macht das neue Dokument kurz aktiv, parallel laufender Code (acquire(),
+    sync_document(), Sketch-Aufrufe) sähe sonst ein leeres Pool-Part als
+    ActiveDoc. Zähler werden unter _lock geändert, damit metrics() auch aus
+    anderen Threads gelesen werden kann.
+
+    Verwendung:
+        pool = DocumentPool(sw.app, size=3)   # Template wie DocumentManager
+        sw.documents.pool = pool               # new_part() bedient sich aus dem Pool
+        pool.refill()
+        model = sw.documents.new_part()
+        pool.maintain(limit=1)                 # im Leerlauf zwischen zwei Aufträgen
+        print(pool.metrics())
+    """
+
+    def __init__(self, app, size: int = 2, template: str = None,
+                 idle_timeout: float = 300.0, idle_size: int = 0, clock=time.monotonic):
+        """
+        Args:
+            app: SldWorks.Application
+            size: Anzahl bereitgehaltener Dokumente
+            template: Part-Template (Standard: Template von DocumentManager)
+            idle_timeout: Sekunden ohne acquire(), nach denen verkleinert wird
+            idle_size: Poolgröße im Leerlauf
+            clock: Zeitquelle für den Leerlauf (für Tests austauschbar)
+        """
+        self.app = app
+        self.size = size
+        self.template = template or DocumentManager(app)._templates["part"]
+        self.idle_timeout = idle_timeout
+        self.idle_size = idle_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.closed = 0
+        self._ready = deque()
+        self._latencies = deque(maxlen=1000)
+        self._last_acquire = clock()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ready)
+
+    def _create(self, app):
+        """Erzeugt ein Dokument und aktiviert das vorher aktive wieder."""
+        active = app.ActiveDoc
+        model = app.NewDocument(self.template, 0, 0, 0)
+        if not model:
+            return None
+        if active is not None:
+            app.ActivateDoc3(com_value(active, "GetTitle"), False,
+                             SwConst.swDontRebuildActiveDoc, 0)
+        with self._lock:
+            self.created += 1
+        return com_value(model, "GetTitle")
+
+    def acquire(self):
+        """
+        Gibt ein leeres Part zurück (aktiviert) - aus dem Pool oder neu erzeugt.
+
+        Returns:
+            ModelDoc2 Objekt
+        """
+        start = time.perf_counter()
+        with self._lock:
+            title = self._ready.popleft() if self._ready else None
+            self._last_acquire = self.clock()
+        model = None
+        if title is not None:
+            model = self.app.ActivateDoc3(title, False, SwConst.swDontRebuildActiveDoc, 0)
+        hit = bool(model)
+        if not hit:
+            # Pool leer (oder Dokument inzwischen geschlossen): synchron erzeugen
+            model = self.app.NewDocument(self.template, 0, 0, 0)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.created += 1
+            self._latencies.append(time.perf_counter() - start)
+        return model
+
+    def refill(self, app=None, limit: int = None) -> int:
+        """
+        Füllt den Pool bis size auf.
+
+        Args:
+            app: Application (Standard: self.app)
+            limit: Höchstens so viele Dokumente erzeugen (z.B. 1 pro Leerlauf-Tick)
+
+        Returns:
+            Anzahl erzeugter Dokumente
+        """
+        app = app or self.app
+        count = 0
+        while len(self) < self.size and (limit is None or count < limit):
+            title = self._create(app)
+            if title is None:
+                break
+            with self._lock:
+                self._ready.append(title)
+            count += 1
+        return count
+
+    def trim(self, keep: int = 0, app=None) -> int:
+        """
+        Schließt überzählige Dokumente, bis höchstens keep bereitstehen.
+
+        Returns:
+            Anzahl geschlossener Dokumente
+        """
+        app = app or self.app
+        count = 0
+        while True:
+            with self._lock:
+                if len(self._ready) <= keep:
+                    break
+                title = self._ready.pop()
+            app.CloseDoc(title)
+            with self._lock:
+                self.closed += 1
+            count += 1
+        return count
+
+    def maintain(self, app=None, limit: int = None) -> int:
+        """
+        Leerlauf-Arbeit: auffüllen bzw. nach idle_timeout verkleinern.
+
+        Returns:
+            Anzahl erzeugter (positiv) bzw. geschlossener (negativ) Dokumente
+        """
+        with self._lock:
+            idle = self.clock() - self._last_acquire
+        if idle >= self.idle_timeout:
+            return -self.trim(self.idle_size, app)
+        return self.refill(app, limit)
+
+    def close(self):
+        """Schließt alle Pool-Dokumente."""
+        self.trim(0)
+
+    def metrics(self) -> dict:
+        """Trefferquote und Latenz von acquire() (Millisekunden)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            ready = len(self._ready)
+            hits, misses, created, closed = self.hits, self.misses, self.created, self.closed
+        requests = hits + misses
+
+        def percentile(q):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+        return {
+            "size": self.size,
+            "ready": ready,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / requests if requests else 0.0,
+            "created": created,
+            "closed": closed,
+            "acquire_ms_mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "acquire_ms_p50": percentile(0.5),
+            "acquire_ms_p95": percentile(0.95),
+            "acquire_ms_max": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OpenDocument:
+    """
+    Ein von DocumentSession verwaltetes Dokument.
+
+    Hält ModelDoc2, Handle-Cache und Bemaßungen, damit ein Rückwechsel ohne
+    erneutes Dispatch der Manager-Objekte auskommt.
+    """
+
+    __slots__ = ("title", "path", "model", "handles", "dimensions", "pinned")
+
+    def __init__(self, title: str, path: str, model, handles: dict,
+                 dimensions: "DimensionRegistry"):
+        self.title = title
+        self.path = path
+        self.model = model
+        self.handles = handles
+        self.dimensions = dimensions
+        self.pinned = False
+
+    def __repr__(self):
+        flags = " pinned" if self.pinned else ""
+        return f"OpenDocument({self.title!r}, path={self.path!r}{flags})"
+
+
+class DocumentSession:
+    """
+    Verwaltet viele offene Dokumente einer SolidWorksAutomation-Sitzung.
+
+    Wechsel zwischen bekannten Dokumenten übernehmen deren Handles (kein
+    erneutes Dispatch). Über max_documents bzw. max_memory_mb hinaus werden
+    die am längsten nicht benutzten Dokumente geschlossen - vorher
+    gespeichert, sofern geändert. Nie gespeicherte Dokumente (ohne Pfad),
+    angeheftete und das aktuelle Dokument werden nicht verdrängt.
+
+    Verwendung:
+        session = sw.document_session(max_documents=6, max_memory_mb=6000)
+        session.open("C:/teile/welle.sldprt")
+        session.new_part()
+        session.activate("welle.sldprt")    # Titel oder Pfad
+        session.close_all()                 # ein CloseAllDocuments-Aufruf
+    """
+
+    def __init__(self, sw: "SolidWorksAutomation", max_documents: int = 8,
+                 max_memory_mb: float = None, save_on_evict: bool = True,
+                 memory_probe=None):
+        """
+        Args:
+            sw: SolidWorksAutomation mit Dokumentverbindung
+            max_documents: Höchstzahl offener Dokumente
+            max_memory_mb: Speicherbudget des SolidWorks-Prozesses (MB);
+                           benötigt psutil oder memory_probe
+            save_on_evict: Geänderte Dokumente vor dem Verdrängen speichern
+            memory_probe: Funktion() -> Bytes (Standard: RSS aus
+                          backend.process_sample())
+        """
+        if sw._connection is None:
+            raise ValueError("DocumentSession benötigt eine Dokumentverbindung")
+        self.sw = sw
+        self.conn = sw._connection
+        self.max_documents = max_documents
+        self.max_memory = max_memory_mb * 1024 ** 2 if max_memory_mb else None
+        self.save_on_evict = save_on_evict
+        self.memory_probe = memory_probe
+        self.opened = 0
+        self.reused = 0
+        self.switches = 0
+        self.evicted = 0
+        self._documents = OrderedDict()   # Titel -> OpenDocument, LRU zuerst
+        model = self.conn.model
+        self.current = self._remember(com_value(model, "GetTitle"), None)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    @property
+    def documents(self) -> list:
+        """Offene Dokumente, zuletzt benutztes zuletzt."""
+        return list(self._documents.values())
+
+    def _remember(self, title: str, path: str) -> OpenDocument:
+        """Übernimmt das Dokument der Verbindung als aktuelles Dokument."""
+        conn = self.conn
+        doc = OpenDocument(title, path, conn.model, conn._handles, conn.dimensions)
+        self._documents[title] = doc
+        return doc
+
+    def _find(self, key: str) -> OpenDocument:
+        """Sucht ein Dokument über Titel oder Pfad."""
+        doc = self._documents.get(key)
+        if doc is not None:
+            return doc
+        path = os.path.normcase(os.path.abspath(key)) if key else None
+        for doc in self._documents.values():
+            if doc.path and os.path.normcase(os.path.abspath(doc.path)) == path:
+                return doc
+        return None
+
+    def _track(self, model, path: str, cacheable: bool) -> OpenDocument:
+        """Nimmt ein gerade geöffnetes/erzeugtes (aktives) Dokument auf."""
+        if not model:
+            raise ValueError(f"Dokument konnte nicht geöffnet werden: {path or 'neu'}")
+        self.conn.model = model
+        self.current = self._remember(com_value(model, "GetTitle"), path)
+        self.sw._document_changed(cacheable)
+        self.opened += 1
+        self._enforce()
+        return self.current
+
+    def open(self, path: str):
+        """
+        Öffnet ein Dokument oder wechselt darauf, falls es schon offen ist.
+
+        Returns:
+            ModelDoc2 Objekt
+        """
+        doc = self._find(path)
+        if doc is not None:
+            self.reused += 1
+            return self.activate(doc.title)
+        self.sw.flush()
+        # Inhalt stammt aus der Datei, nicht aus dem IR: nicht cachebar
+        return self._track(self.sw.documents.open(path), path, cacheable=False).model
+
+    def new_part(self, template: str = None):
+        """Erzeugt ein neues Part (ggf. aus dem DocumentPool) und wechselt darauf."""
+        self.sw.flush()
+        return self._track(self.sw.documents.new_part(template), None, cacheable=True).model
+
+    def activate(self, key: str):
+        """
+        Wechselt auf ein offenes Dokument (Titel oder Pfad).
+
+        Returns:
+            ModelDoc2 Objekt
+        """
+        doc = self._find(key)
+        if doc is None:
+            raise ValueError(f"Dokument nicht in der Sitzung: {key}")
+        self._documents.move_to_end(doc.title)
+        if doc is self.current:
+            return doc.model
+        self.sw.flush()
+        self.conn.attach(doc.model, doc.handles, doc.dimensions)
+        self.conn.app.ActivateDoc3(doc.title, False, SwConst.swDontRebuildActiveDoc, 0)
+        self.sw._document_changed(cacheable=False)
+        self.current = doc
+        self.switches += 1
+        return doc.model
+
+    def pin(self, key: str, pinned: bool = True):
+        """Schützt ein Dokument vor dem Verdrängen (oder hebt den Schutz auf)."""
+        doc = self._find(key)
+        if doc is None:
+            raise ValueError(f"Dokument nicht in der Sitzung: {key}")
+        doc.pinned = pinned
+
+    def save(self, path: str = None):
+        """Speichert das aktuelle Dokument (mit path: Pfad wird übernommen)."""
+        self.sw.save(path)
+        if path:
+            self.current.path = path
+
+    def close(self, key: str = None, save: bool = False):
+        """Schließt ein Dokument (Standard: das aktuelle)."""
+        doc = self._find(key) if key else self.current
+        if doc is None:
+            raise ValueError(f"Dokument nicht in der Sitzung: {key}")
+        if doc is self.current:
+            self.sw.flush()
+        self._close(doc, save)
+        if doc is self.current:
+            self.current = None
+            if self._documents:
+                self.activate(next(reversed(self._documents)))
+            else:
+                self._detach()
+
+    def _close(self, doc: OpenDocument, save: bool):
+        if save:
+            doc.model.Save3(1, 0, 0)
+        self.conn.app.CloseDoc(doc.title)
+        del self._documents[doc.title]
+
+    def close_all(self, save: bool = False):
+        """Schließt alle Dokumente mit einem CloseAllDocuments-Aufruf."""
+        self.sw.flush()
+        self.sw.documents.close_all(save)
+        self._documents.clear()
+        self.current = None
+        self._detach()
+
+    def _detach(self):
+        """Kein Dokument mehr offen: Verbindung und IR-Verlauf lösen."""
+        self.conn.detach()
+        self.sw._document_changed(cacheable=False)
+
+    def memory(self) -> int:
+        """Speicherbedarf des SolidWorks-Prozesses in Bytes (None = unbekannt)."""
+        if self.memory_probe is not None:
+            return self.memory_probe()
+        sample = self.conn.backend.process_sample(self.conn.app)
+        return sample.rss if sample is not None else None
+
+    def _evict_one(self) -> bool:
+        """Schließt das am längsten unbenutzte verdrängbare Dokument."""
+        for doc in self._documents.values():
+            if doc is self.current or doc.pinned or not doc.path:
+                continue
+            if self.save_on_evict and doc.model.GetSaveFlag():
+                doc.model.Save3(1, 0, 0)
+            self._close(doc, save=False)
+            self.evicted += 1
+            return True
+        return False
+
+    def _enforce(self):
+        """Hält Dokumentanzahl und Speicherbudget ein."""
+        while len(self._documents) > self.max_documents:
+            if not self._evict_one():
+                print(f"Warnung: {len(self._documents)} Dokumente offen, "
+                      f"keines verdrängbar (Budget {self.max_documents})")
+                return
+        if self.max_memory is None:
+            return
+        while True:
+            used = self.memory()
+            if used is None or used <= self.max_memory:
+                return
+            if not self._evict_one():
+                print(f"Warnung: SolidWorks belegt {used / 1024 ** 2:.0f} MB, "
+                      "kein Dokument verdrängbar")
+                return
+
+    def stats(self) -> dict:
+        """Zähler der Sitzung."""
+        return {
+            "open": len(self._documents),
+            "opened": self.opened,
+            "reused": self.reused,
+            "switches": self.switches,
+            "evicted": self.evicted,
+        }
+
+
+# Operationen, die im IR-Modus aufgezeichnet statt sofort ausgeführt werden
+IR_SKETCH_OPS = (
+    "line", "circle", "rectangle", "rectangle_centered", "arc", "polygon",
+    "slot", "ellipse", "center_rectangle", "three_point_arc", "spline",
+    "polyline", "circles",
+)
+IR_FEATURE_OPS = ("extrude", "cut", "revolve", "revolve_cut")
+
+# Features, deren Profile in einem gemeinsamen Sketch zusammengefasst werden dürfen
+FUSABLE_FEATURES = ("extrude", "cut")
+
+# Toleranz für Koordinatenvergleiche im Optimierer (mm)
+IR_TOLERANCE = 1e-6
+
+
+class SketchOp:
+    """
+    Eine Operation der Zwischendarstellung (IR) des Operationsstroms.
+
+    Args:
+        kind: "sketch" (name "begin"/"end"), "entity" oder "feature"
+        name: Methodenname (z.B. "circle", "cut")
+        params: Vollständige Parameter (inkl. Standardwerten)
+    """
+
+    __slots__ = ("kind", "name", "params")
+
+    def __init__(self, kind: str, name: str, params: dict = None):
+        self.kind = kind
+        self.name = name
+        self.params = dict(params or {})
+
+    @classmethod
+    def bind(cls, kind: str, method, args: tuple, kwargs: dict) -> "SketchOp":
+        """Erstellt eine Operation aus einem Methodenaufruf (Parameter normalisiert)."""
+        bound = inspect.signature(method).bind(*args, **kwargs)
+        bound.apply_defaults()
+        return cls(kind, method.__name__, bound.arguments)
+
+    def key(self) -> tuple:
+        """Vergleichsschlüssel (Koordinaten auf IR_TOLERANCE gerundet)."""
+        return (self.kind, self.name,
+                tuple(sorted((k, _ir_normalize(v)) for k, v in self.params.items())))
+
+    def __eq__(self, other):
+        return isinstance(other, SketchOp) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self.params.items())
+        return f"{self.kind}.{self.name}({args})"
+
+
+def _ir_normalize(value):
+    """Macht Parameter hashbar und rundet Zahlen (20 und 20.0 sind gleich)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if isinstance(value, float):
+        return round(value / IR_TOLERANCE) * IR_TOLERANCE
+    if isinstance(value, (list, tuple)):
+        return tuple(_ir_normalize(v) for v in value)
+    if hasattr(value, "tolist"):
+        # NumPy-Arrays, memoryview, array.array
+        return _ir_normalize(value.tolist())
+    return value
+
+
+def _entity_bbox(op: SketchOp):
+    """
+    Bounding-Box (xmin, ymin, xmax, ymax) eines geschlossenen Profils in mm.
+
+    Returns:
+        None für offene Elemente (Linie, Bogen, offener Spline)
+    """
+    p = op.params
+    if op.name == "circle":
+        r = p["diameter"] / 2 if p["diameter"] is not None else p["radius"]
+        return (p["cx"] - r, p["cy"] - r, p["cx"] + r, p["cy"] + r)
+    if op.name == "rectangle":
+        return (min(p["x1"], p["x2"]), min(p["y1"], p["y2"]),
+                max(p["x1"], p["x2"]), max(p["y1"], p["y2"]))
+    if op.name in ("rectangle_centered", "center_rectangle"):
+        hw, hh = abs(p["width"]) / 2, abs(p["height"]) / 2
+        return (p["cx"] - hw, p["cy"] - hh, p["cx"] + hw, p["cy"] + hh)
+    if op.name == "polygon":
+        r = p["radius"]
+        return (p["cx"] - r, p["cy"] - r, p["cx"] + r, p["cy"] + r)
+    if op.name == "slot":
+        r = p["width"] / 2
+        return (min(p["x1"], p["x2"]) - r, min(p["y1"], p["y2"]) - r,
+                max(p["x1"], p["x2"]) + r, max(p["y1"], p["y2"]) + r)
+    if op.name == "ellipse":
+        a = p["major_diameter"] / 2 if p["major_diameter"] is not None else p["major_radius"]
+        b = p["minor_diameter"] / 2 if p["minor_diameter"] is not None else p["minor_radius"]
+        if a is None or b is None:
+            return None
+        return (p["cx"] - a, p["cy"] - b, p["cx"] + a, p["cy"] + b)
+    if op.name == "spline" and p["closed"]:
+        data = _spline_buffer(p["points"])
+        xs, ys = data[0::3], data[1::3]
+        return (min(xs) * 1000.0, min(ys) * 1000.0, max(xs) * 1000.0, max(ys) * 1000.0)
+    return None
+
+
+def _bbox_overlap(a: tuple, b: tuple) -> bool:
+    """True, wenn sich zwei Bounding-Boxen berühren oder überlappen."""
+    return not (a[2] < b[0] - IR_TOLERANCE or b[2] < a[0] - IR_TOLERANCE or
+                a[3] < b[1] - IR_TOLERANCE or b[3] < a[1] - IR_TOLERANCE)
+
+
+def _is_degenerate(op: SketchOp) -> bool:
+    """True für Elemente ohne Ausdehnung (z.B. Linien der Länge 0)."""
+    if op.kind != "entity":
+        return False
+    p = op.params
+    if op.name == "line":
+        return math.hypot(p["x2"] - p["x1"], p["y2"] - p["y1"]) < IR_TOLERANCE
+    if op.name == "circle":
+        r = p["diameter"] / 2 if p["diameter"] is not None else p["radius"]
+        return r is not None and abs(r) < IR_TOLERANCE
+    if op.name == "rectangle":
+        return (abs(p["x2"] - p["x1"]) < IR_TOLERANCE or
+                abs(p["y2"] - p["y1"]) < IR_TOLERANCE)
+    if op.name in ("rectangle_centered", "center_rectangle"):
+        return abs(p["width"]) < IR_TOLERANCE or abs(p["height"]) < IR_TOLERANCE
+    return False
+
+
+def _split_blocks(ops: list) -> list:
+    """
+    Zerlegt den Operationsstrom in Einheiten.
+
+    Eine Profil-Einheit ist [begin, Elemente..., end, Feature]; alle anderen
+    Operationen bilden Einzel-Einheiten.
+    """
+    units = []
+    i = 0
+    while i < len(ops):
+        op = ops[i]
+        if op.kind == "sketch" and op.name == "begin":
+            j = i + 1
+            while j < len(ops) and ops[j].kind == "entity":
+                j += 1
+            if j < len(ops) and ops[j].kind == "sketch" and ops[j].name == "end":
+                end = j + 1
+                if end < len(ops) and ops[end].kind == "feature":
+                    end += 1
+                units.append(ops[i:end])
+                i = end
+                continue
+        units.append([op])
+        i += 1
+    return units
+
+
+def _is_profile_unit(unit: list) -> bool:
+    return (len(unit) >= 3 and unit[0].kind == "sketch" and unit[0].name == "begin"
+            and unit[-1].kind == "feature")
+
+
+def optimize_ops(ops: list) -> list:
+    """
+    Optimiert einen IR-Operationsstrom, bevor er an SolidWorks geht.
+
+    Durchläufe:
+    1. Degenerierte Elemente (Linien der Länge 0, Kreise mit Radius 0) entfernen
+    2. Identische Elemente innerhalb eines Sketches entfernen
+    3. Leere Sketches samt Feature entfernen
+    4. Aufeinanderfolgende Profil-Einheiten mit gleicher Ebene und gleichem
+       Feature (extrude/cut mit identischen Parametern) zu einem Sketch mit
+       mehreren Profilen und einem Feature verschmelzen. Voraussetzung:
+       alle Profile geschlossen und ihre Bounding-Boxen disjunkt (sonst
+       würden z.B. verschachtelte Kreise einen Ring statt einer Bohrung
+       ergeben). Identische Profile werden dabei verworfen.
+
+    Args:
+        ops: Liste von SketchOp
+
+    Returns:
+        Neue, optimierte Liste von SketchOp
+    """
+    # 1. + 2. Degenerierte und doppelte Elemente
+    cleaned, seen = [], set()
+    for op in ops:
+        if op.kind == "sketch":
+            seen = set()
+        if _is_degenerate(op):
+            continue
+        if op.kind == "entity":
+            if op in seen:
+                continue
+            seen.add(op)
+        cleaned.append(op)
+
+    # 3. Leere Sketches
+    units = []
+    for unit in _split_blocks(cleaned):
+        if _is_profile_unit(unit) and not any(op.kind == "entity" for op in unit):
+            continue
+        units.append(unit)
+
+    # 4. Profil-Einheiten verschmelzen
+    result = []
+    current = None  # (begin, Elemente, end, Feature, Boxen)
+    for unit in units:
+        merged = False
+        if _is_profile_unit(unit) and unit[-1].name in FUSABLE_FEATURES:
+            begin, entities, end, feature = unit[0], unit[1:-2], unit[-2], unit[-1]
+            boxes = [_entity_bbox(op) for op in entities]
+            if None not in boxes:
+                if (current is not None and current[0] == begin and current[3] == feature):
+                    new = [(op, box) for op, box in zip(entities, boxes)
+                           if op not in current[1]]
+                    if all(not _bbox_overlap(box, other)
+                           for _, box in new for other in current[4]):
+                        current[1].extend(op for op, _ in new)
+                        current[4].extend(box for _, box in new)
+                        merged = True
+                if not merged:
+                    if current is not None:
+                        result += [current[0], *current[1], current[2], current[3]]
+                    current = (begin, list(entities), end, feature, boxes)
+                    merged = True
+        if not merged:
+            if current is not None:
+                result += [current[0], *current[1], current[2], current[3]]
+                current = None
+            result.extend(unit)
+    if current is not None:
+        result += [current[0], *current[1], current[2], current[3]]
+    return result
+
+
+def _tool_version() -> str:
+    """Kurzer Hash dieses Moduls (ändert sich mit jeder Code-Änderung)."""
+    global _TOOL_VERSION
+    if _TOOL_VERSION is None:
+        with open(__file__, "rb") as f:
+            _TOOL_VERSION = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _TOOL_VERSION
+
+
+_TOOL_VERSION = None
+
+
+class PartCache:
+    """
+    Inhaltsadressierter Cache für gespeicherte Part-Dateien.
+
+    Der Schlüssel ist ein Hash über den normalisierten Operationsstrom
+    (IR), die Einheiten, das Template, die SolidWorks-Version und die
+    Version dieses Moduls. Bei einem Treffer kopiert save(path) die
+    zwischengespeicherte Datei, statt das Part neu aufzubauen.
+
+    Args:
+        directory: Cache-Verzeichnis
+        max_bytes: Speicherbudget; älteste (LRU) Einträge werden verdrängt
+        link: True = Hardlink statt Kopie (Ziel darf nicht verändert werden)
+
+    Treffer aktualisieren den LRU-Zeitstempel nur im Speicher; der Index
+    wird bei store(), clear() und close() geschrieben.
+    """
+
+    INDEX = "index.json"
+    UNITS = "mm"
+
+    def __init__(self, directory: str, max_bytes: int = 1024 ** 3, link: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._entries = self._load_index()
+        self._dirty = False
+
+    def _load_index(self) -> dict:
+        path = os.path.join(self.directory, self.INDEX)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Einträge ohne Datei verwerfen
+        return {k: v for k, v in entries.items() if os.path.exists(self._path(k, v["ext"]))}
+
+    def _save_index(self):
+        path = os.path.join(self.directory, self.INDEX)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, path)
+        self._dirty = False
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, key + ext)
+
+    def key(self, ops: list, template: str = "", revision: str = "") -> str:
+        """
+        Berechnet den Cache-Schlüssel eines Operationsstroms.
+
+        Args:
+            ops: Liste von SketchOp
+            template: Verwendetes Part-Template
+            revision: SolidWorks-Version (RevisionNumber)
+        """
+        payload = {
+            "ops": [[op.kind, op.name, [list(item) for item in op.key()[2]]] for op in ops],
+            "units": self.UNITS,
+            "template": template,
+            "revision": revision,
+            "tool": _tool_version(),
+        }
+        data = json.dumps(payload, sort_keys=True, default=repr)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str):
+        """Gibt den Pfad des Eintrags zurück (oder None) und zählt Treffer."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["used"] = time.time()
+        self._dirty = True
+        return self._path(key, entry["ext"])
+
+    def restore(self, key: str, target: str) -> bool:
+        """Kopiert (bzw. verlinkt) den Eintrag key nach target."""
+        source = self.lookup(key)
+        if source is None:
+            return False
+        if not os.path.exists(source):
+            # Datei wurde außerhalb des Caches gelöscht
+            self.hits -= 1
+            self.misses += 1
+            del self._entries[key]
+            self._save_index()
+            return False
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(target)
+        if self.link:
+            try:
+                os.link(source, target)
+                return True
+            except OSError:
+                pass
+        shutil.copy2(source, target)
+        return True
+
+    def store(self, key: str, source: str):
+        """Legt die Datei source unter key ab und verdrängt ggf. alte Einträge."""
+        ext = os.path.splitext(source)[1].lower() or ".sldprt"
+        target = self._path(key, ext)
+        shutil.copy2(source, target)
+        self._entries[key] = {"ext": ext, "size": os.path.getsize(target), "used": time.time()}
+        self.stores += 1
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        """Verdrängt die am längsten unbenutzten Einträge bis zum Budget."""
+        total = sum(e["size"] for e in self._entries.values())
+        for key, entry in sorted(self._entries.items(), key=lambda kv: kv[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path(key, entry["ext"]))
+            del self._entries[key]
+            total -= entry["size"]
+            self.evictions += 1
+
+    def clear(self):
+        """Entfernt alle Einträge."""
+        for key, entry in self._entries.items():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path(key, entry["ext"]))
+        self._entries = {}
+        self._save_index()
+
+    def close(self):
+        """Schreibt den Index, falls Treffer seit dem letzten Schreiben vorliegen."""
+        if self._dirty:
+            self._save_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Belegter Speicher in Bytes."""
+        return sum(e["size"] for e in self._entries.values())
+
+    def stats(self) -> dict:
+        """Treffer-/Fehlzugriffs-Statistik."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+_default_part_cache = None
+
+
+def set_default_part_cache(cache: PartCache = None):
+    """Setzt den Part-Cache für alle neuen SolidWorksAutomation-Instanzen."""
+    global _default_part_cache
+    _default_part_cache = cache
+
+
+class DeferredResult:
+    """
+    Ergebnis einer im IR aufgezeichneten Sketch- oder Feature-Operation.
+
+    Die Operation läuft erst beim nächsten flush(); bis dahin steht dieser
+    Platzhalter für ihr Ergebnis. Jeder Attributzugriff (oder value) führt
+    die ausstehenden Operationen aus und reicht an das echte Ergebnis
+    weiter. Für COM-Aufrufe, die das Objekt als Argument erwarten,
+    value übergeben.
+
+    Vom Optimierer verschmolzene Features liefern das gemeinsame Feature,
+    entfernte Elemente (doppelt, degeneriert, leerer Sketch) None.
+    """
+
+    __slots__ = ("_sw", "_value", "_done")
+
+    def __init__(self, sw: "SolidWorksAutomation"):
+        self._sw = sw
+        self._value = None
+        self._done = False
+
+    def _set(self, value):
+        self._value = value
+        self._done = True
+
+    @property
+    def value(self):
+        """Das Ergebnis der Operation (führt ausstehende IR aus)."""
+        if not self._done:
+            self._sw.flush()
+        return self._value
+
+    def __getattr__(self, name: str):
+        return getattr(self.value, name)
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __repr__(self) -> str:
+        if not self._done:
+            return "<DeferredResult (ausstehend)>"
+        return f"<DeferredResult {self._value!r}>"
+
+
+class _DeferredOperations:
+    """
+    Stellvertreter für SketchOperations/FeatureOperations im IR-Modus.
+
+    Aufzeichenbare Methoden werden als SketchOp gespeichert und liefern ein
+    DeferredResult; alle anderen führen zuerst die ausstehenden Operationen
+    aus und laufen dann direkt.
+    """
+
+    def __init__(self, sw: "SolidWorksAutomation", target, kind: str, deferred: tuple):
+        self._sw = sw
+        self._target = target
+        self._kind = kind
+        self._deferred = deferred
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+        if name in self._deferred:
+            def record(*args, **kwargs):
+                op = SketchOp.bind(self._kind, attr, args, kwargs)
+                self._sw._ops.append(op)
+                return self._sw._pending_result(op)
+            return record
+
+        def run(*args, **kwargs):
+            # Nicht aufzeichenbar: Ergebnis hängt nicht mehr nur vom IR ab
+            self._sw._cacheable = False
+            self._sw.flush()
+            return attr(*args, **kwargs)
+        return run
+
+
+# Für apply() freigegebene Operationen
+APPLY_OPERATIONS = ("new_sketch", "end_sketch", "update")
+APPLY_NAMESPACES = ("sketch", "feature", "selection")
 
 
 class SolidWorksAutomation:
@@ -1066,29 +4713,61 @@ class SolidWorksAutomation:
         sw.save()
     """
 
-    def __init__(self, require_document: bool = True):
+    def __init__(self, require_document: bool = True, backend: SolidWorksBackend = None,
+                 batch_sketches: bool = False, optimize_ops: bool = False,
+                 part_cache: PartCache = None, validate_sketches: str = "warn",
+                 sketch_dimensions: bool = False):
         """
         Initialisiert die SolidWorks-Verbindung.
 
         Args:
             require_document: True = Fehler wenn kein Dokument offen
                               False = Erlaubt Start ohne offenes Dokument
+            backend: Optionales Backend (Standard: COM bzw. set_default_backend)
+            batch_sketches: True = jede Sketch-Sitzung (new_sketch bis
+                            end_sketch) als ein Makro ausführen
+            optimize_ops: True = Sketch- und Profil-Feature-Aufrufe als IR
+                          sammeln und optimiert ausführen (siehe flush())
+            part_cache: PartCache für save(path) (Standard:
+                        set_default_part_cache); sammelt ebenfalls IR
+            validate_sketches: Profilprüfung vor extrude/cut/revolve:
+                               "warn" (Standard), "strict" (Fehler) oder None
+            sketch_dimensions: True = Kreisdurchmesser im Sketch bemaßen und
+                               für update() registrieren (Feature-Bemaßungen
+                               werden immer registriert)
         """
-        self._connection = SolidWorksConnection() if require_document else None
+        self.batch_sketches = batch_sketches
+        self.optimize_ops = optimize_ops
+        self.part_cache = part_cache or _default_part_cache
+        self._ops = [] if optimize_ops or self.part_cache else None
+        self._history = []
+        self._cacheable = True
+        # Bei einem Cache-Treffer übersprungene Operationen (Modell nicht aufgebaut)
+        self._unbuilt = []
+        # id(SketchOp) -> DeferredResult der noch nicht ausgeführten Operationen
+        self._results = {}
+        self.last_ir = None
+        self._fast_mode_depth = 0
+        backend = backend or get_default_backend()
+        self._connection = SolidWorksConnection(backend) if require_document else None
         self._app = None
 
         if self._connection:
+            self._connection.sketch_validation = validate_sketches
+            self._connection.sketch_dimensions = sketch_dimensions
             self._app = self._connection.app
             self._sketch = SketchOperations(self._connection)
             self._feature = FeatureOperations(self._connection)
             self._selection = SelectionHelper(self._connection)
             print("Verbunden mit SolidWorks")
-            print(f"Aktives Dokument: {self._connection.model.GetTitle}")
+            print(f"Aktives Dokument: {com_value(self._connection.model, 'GetTitle')}")
         else:
             # Nur App-Verbindung ohne Dokument
             try:
-                self._app = win32com.client.Dispatch("SldWorks.Application")
+                self._app = backend.connect()
                 print("Verbunden mit SolidWorks (kein Dokument)")
+            except ImportError:
+                raise
             except Exception as e:
                 raise ConnectionError(f"Konnte nicht zu SolidWorks verbinden: {e}")
 
@@ -1097,16 +4776,21 @@ class SolidWorksAutomation:
     @property
     def sketch(self) -> SketchOperations:
         """Zugriff auf Sketch-Operationen."""
+        if self._ops is not None:
+            return _DeferredOperations(self, self._sketch, "entity", IR_SKETCH_OPS)
         return self._sketch
 
     @property
     def feature(self) -> FeatureOperations:
         """Zugriff auf Feature-Operationen."""
+        if self._ops is not None:
+            return _DeferredOperations(self, self._feature, "feature", IR_FEATURE_OPS)
         return self._feature
 
     @property
     def selection(self) -> SelectionHelper:
-        """Zugriff auf Selektions-Hilfsfunktionen."""
+        """Zugriff auf Selektions-Hilfsfunktionen (führt ausstehende IR aus)."""
+        self.flush()
         return self._selection
 
     @property
@@ -1117,6 +4801,10 @@ class SolidWorksAutomation:
     @property
     def model(self):
         """Direkter Zugriff auf das ModelDoc2 Objekt."""
+        # Änderungen am rohen Modell sind nicht im IR: Part-Cache aus
+        self._cacheable = False
+        if self._unbuilt:
+            self.flush()
         if self._connection:
             return self._connection.model
         return self._app.ActiveDoc
@@ -1132,15 +4820,237 @@ class SolidWorksAutomation:
 
         Args:
             plane: "Front", "Top", "Right"
+
+        Im Batch-Modus (batch_sketches=True) werden alle Aufrufe bis
+        end_sketch() aufgezeichnet und gemeinsam als Makro ausgeführt.
         """
+        if self._ops is not None:
+            self._ops.append(SketchOp("sketch", "begin", {"plane": plane}))
+            return
+        if self.batch_sketches:
+            self._connection.begin_batch()
         self._sketch.start_sketch(plane)
 
     def end_sketch(self):
-        """Beendet den aktuellen Sketch."""
+        """Beendet den aktuellen Sketch (und führt einen Batch aus)."""
+        if self._ops is not None:
+            self._ops.append(SketchOp("sketch", "end"))
+            return
         self._sketch.end_sketch()
+        if self._connection.batch_active:
+            self._connection.end_batch()
+
+    @property
+    def ir(self) -> list:
+        """Noch nicht ausgeführte IR-Operationen (Kopie)."""
+        return list(self._ops or [])
+
+    def flush(self, optimize: bool = None):
+        """
+        Optimiert und führt alle gesammelten IR-Operationen aus.
+
+        Wird automatisch vor save(), rebuild(), Selektionen und allen nicht
+        aufzeichenbaren Operationen aufgerufen. Danach enthält last_ir das
+        Paar (IR vorher, IR nachher). Wurde das Modell bei einem Cache-Treffer
+        von save() nicht aufgebaut, wird das zuerst nachgeholt.
+
+        Args:
+            optimize: False = Operationen unverändert ausführen
+                      (Standard: Einstellung optimize_ops)
+        """
+        if optimize is None:
+            optimize = self.optimize_ops
+        if self._unbuilt:
+            # Nach einem Cache-Treffer: Modell vor allem Weiteren aufbauen
+            unbuilt, self._unbuilt = self._unbuilt, []
+            pending, self._ops = self._ops, []
+            try:
+                self._execute(unbuilt, optimize)
+            finally:
+                self._ops = pending
+        if not self._ops:
+            return
+        before = self._ops
+        self._history.extend(before)
+        self._execute(before, optimize)
+
+    def _execute(self, before: list, optimize: bool):
+        """Führt IR-Operationen aus (ohne sie in den Verlauf aufzunehmen)."""
+        after = optimize_ops(before) if optimize else list(before)
+        self._ops = None
+        values = {}
+        try:
+            for op in after:
+                if op.kind == "sketch" and op.name == "begin":
+                    self.new_sketch(op.params["plane"])
+                elif op.kind == "sketch":
+                    self.end_sketch()
+                elif op.kind == "entity":
+                    values[id(op)] = getattr(self._sketch, op.name)(**op.params)
+                else:
+                    values[id(op)] = getattr(self._feature, op.name)(**op.params)
+        finally:
+            self._ops = []
+            self.last_ir = (before, after)
+            self._resolve_results(before, values)
+
+    def _pending_result(self, op: SketchOp) -> DeferredResult:
+        """Legt den Platzhalter für das Ergebnis einer aufgezeichneten Operation an."""
+        result = self._results[id(op)] = DeferredResult(self)
+        return result
+
+    def _resolve_results(self, before: list, values: dict):
+        """
+        Übergibt die Ergebnisse eines flush() an die DeferredResults.
+
+        Der Optimierer behält die Objekte der ausgeführten Operationen; ein
+        fehlendes Feature wurde entweder mit dem vorherigen gleichen Feature
+        verschmolzen (Sketch mit Elementen) oder samt leerem Sketch entfernt.
+        """
+        previous = None
+        for unit in _split_blocks(before):
+            drawn = any(op.kind == "entity" and not _is_degenerate(op) for op in unit)
+            for op in unit:
+                if id(op) in values:
+                    value = values[id(op)]
+                    if op.kind == "feature":
+                        previous = op
+                elif (op.kind == "feature" and drawn and previous is not None
+                      and previous == op):
+                    value = values[id(previous)]
+                else:
+                    value = None
+                result = self._results.pop(id(op), None)
+                if result is not None:
+                    result._set(value)
+            if not _is_profile_unit(unit):
+                previous = None
+
+    @property
+    def sketch_profile(self) -> SketchProfile:
+        """Zuletzt gezeichnetes Profil für die Sketch-Prüfung (oder None)."""
+        self.flush()
+        return self._connection.sketch_profile
+
+    @property
+    def dimensions(self) -> DimensionRegistry:
+        """Registrierte Bemaßungen des aktiven Dokuments (führt ausstehende IR aus)."""
+        self.flush()
+        return self._connection.dimensions
+
+    def update(self, params: dict, rebuild: bool = True) -> int:
+        """
+        Ändert Bemaßungen des bestehenden Modells und baut einmal neu auf.
+
+        Args:
+            params: {Alias oder SolidWorks-Name: Wert}, z.B.
+                    {"extrude1.depth": 25, "D1@Boss-Extrude1": 25,
+                     "revolve1.angle": 180}; Längen in mm, Winkel in Grad
+            rebuild: False = nur Werte setzen (z.B. für mehrere update()-Aufrufe
+                     vor einem gemeinsamen rebuild())
+
+        Returns:
+            Anzahl geänderter Bemaßungen (unveränderte Werte werden übersprungen)
+        """
+        self.flush()
+        registry = self._connection.dimensions
+        model = self._connection.model
+        changes = []
+        for key, value in params.items():
+            ref = registry.find(key)
+            if ref.value is not None and abs(ref.value - value) < 1e-9:
+                continue
+            changes.append((ref, value, ref.dimension(model)))
+        if changes:
+            # Modell weicht jetzt vom IR-Verlauf ab: nicht mehr cachebar
+            self._cacheable = False
+        for ref, value, dimension in changes:
+            dimension.SystemValue = ref.system_value(value)
+            ref.value = value
+        if changes and rebuild:
+            model.ForceRebuild3(False)
+        return len(changes)
+
+    def create_configurations(self, table, name_column: str = "name") -> FamilyPlan:
+        """
+        Legt jede Tabellenzeile als Konfiguration des aktiven Teils an.
+
+        Das Basisteil wird vorher einmal aufgebaut; die Tabellenspalten
+        verweisen auf dessen registrierte Bemaßungen (siehe update()).
+
+        Args:
+            table: CSV-Pfad bzw. Zeilen (read_family_table) oder Liste von
+                   (Konfigurationsname, {Spalte: Wert})
+            name_column: Spalte mit dem Konfigurationsnamen (nur CSV)
+
+        Returns:
+            Ausgeführter FamilyPlan
+        """
+        self.flush()
+        if isinstance(table, (list, tuple)) and not (table and isinstance(table[0], str)):
+            rows = list(table)
+        else:
+            rows = read_family_table(table, name_column)
+        registry = self._connection.dimensions
+        model = self._connection.model
+        plan = plan_family(rows, base=registry.values())
+        # Alle Bemaßungen auflösen, bevor das Modell verändert wird
+        refs = {column: registry.find(column) for column in plan.columns}
+        dimensions = {column: ref.dimension(model) for column, ref in refs.items()}
+
+        # Konfigurationen stehen nicht im IR-Verlauf: nicht mehr cachebar
+        self._cacheable = False
+        manager = model.ConfigurationManager
+        for name in plan.configurations:
+            # Nicht aktivieren: jeder Wechsel der Konfiguration kostet einen Rebuild
+            manager.AddConfiguration2(name, "", "", SwConst.swConfigOption_DontActivate,
+                                      "", "", False)
+        for column, value, names in plan.assignments:
+            dimensions[column].SetSystemValue3(
+                refs[column].system_value(value),
+                SwConst.swSetValue_InSpecificConfigurations,
+                _string_array(names)
+            )
+        print(f"{len(plan.configurations)} Konfigurationen angelegt "
+              f"({len(plan.assignments)} Wertzuweisungen)")
+        return plan
+
+    def export_configurations(self, configurations, directory: str, ext: str = "step") -> list:
+        """
+        Aktiviert jede Konfiguration und speichert eine Kopie.
+
+        Args:
+            configurations: Namen oder FamilyPlan aus create_configurations()
+            directory: Zielverzeichnis; Dateiname = Konfigurationsname
+            ext: Dateiendung, bestimmt das Format (z.B. "step", "x_t", "sldprt")
+
+        Returns:
+            Liste der geschriebenen Pfade
+        """
+        self.flush()
+        names = getattr(configurations, "configurations", configurations)
+        model = self._connection.model
+        extension = self._connection.extension
+        options = SwConst.swSaveAsOptions_Silent | SwConst.swSaveAsOptions_Copy
+        paths = []
+        # Danach ist die letzte Konfiguration aktiv - nicht mehr der IR-Stand
+        self._cacheable = False
+        for name in names:
+            model.ShowConfiguration2(name)
+            path = os.path.join(directory, f"{name}.{ext.lstrip('.')}")
+            extension.SaveAs(path, 0, options, _COM_NULL, 0, 0)
+            paths.append(path)
+        print(f"{len(paths)} Konfigurationen exportiert nach {directory}")
+        return paths
+
+    @property
+    def last_macro(self) -> str:
+        """Quelltext des zuletzt ausgeführten Batch-Makros (oder None)."""
+        return self._connection.last_macro
 
     def rebuild(self):
         """Baut das Modell neu auf."""
+        self.flush()
         self._connection.model.ForceRebuild3(False)
 
     def save(self, path: str = None):
@@ -1149,16 +5059,40 @@ class SolidWorksAutomation:
 
         Args:
             path: Optionaler Speicherpfad. Wenn None, wird überschrieben.
+
+        Mit Part-Cache wird bei bekanntem Operationsstrom die Datei aus dem
+        Cache kopiert; das Modell in SolidWorks wird dann erst aufgebaut,
+        wenn es gebraucht wird (nächstes flush(), model, Selektion, ...).
         """
+        key = None
+        if path and self.part_cache is not None and self._cacheable:
+            key = self.part_cache.key(
+                self._history + self._ops,
+                template=self._documents._templates.get("part", ""),
+                revision=str(self._app.RevisionNumber())
+            )
+            if self.part_cache.restore(key, path):
+                self._history.extend(self._ops)
+                self._unbuilt.extend(self._ops)
+                self._ops = []
+                print(f"Modell aus Cache: {path}")
+                return
+
+        self.flush()
         if path:
             self._connection.model.SaveAs(path)
+            if key is not None and os.path.exists(path):
+                self.part_cache.store(key, path)
         else:
             self._connection.model.Save3(1, 0, 0)
         print("Modell gespeichert")
 
     def select_face(self, face_name: str):
         """Selektiert eine Fläche nach Name."""
-        self._connection.model.Extension.SelectByID2(
+        # Folgende Features hängen von der Selektion ab, die das IR nicht kennt
+        self._cacheable = False
+        self.flush()
+        self._connection.extension.SelectByID2(
             face_name, "FACE", 0.0, 0.0, 0.0, False, 0, _COM_NULL, 0
         )
 
@@ -1170,15 +5104,142 @@ class SolidWorksAutomation:
         Dies erfordert manuelle Selektion oder Ray-Casting.
         """
         # Vereinfacht - normalerweise würde man SelectByRay verwenden
-        pass
+        self._cacheable = False
 
     def clear_selection(self):
         """Hebt alle Selektionen auf."""
+        self.flush()
         self._connection.model.ClearSelection2(True)
 
+    def sync_document(self) -> bool:
+        """
+        Übernimmt das aktive SolidWorks-Dokument (z.B. nach documents.new_part()).
+
+        Returns:
+            True, wenn sich das Dokument geändert hat
+        """
+        self.flush()
+        if not self._connection.sync_active_document():
+            return False
+        self._document_changed()
+        return True
+
+    def _document_changed(self, cacheable: bool = True):
+        """Setzt den dokumentbezogenen IR-Verlauf nach einem Dokumentwechsel zurück."""
+        self._history = []
+        self._unbuilt = []
+        self._cacheable = cacheable
+
+    def document_session(self, max_documents: int = 8, max_memory_mb: float = None,
+                         **kwargs) -> "DocumentSession":
+        """
+        Erzeugt einen DocumentSession-Manager für diese Sitzung.
+
+        Args:
+            max_documents: Höchstzahl offener Dokumente
+            max_memory_mb: Speicherbudget des SolidWorks-Prozesses (MB)
+            **kwargs: Weitere Argumente für DocumentSession
+        """
+        return DocumentSession(self, max_documents, max_memory_mb, **kwargs)
+
+    def apply(self, ops: list) -> list:
+        """
+        Führt eine Operationsliste aus.
+
+        Args:
+            ops: Liste von (methode, args, kwargs); methode ist ein Pfad
+                 relativ zu dieser Instanz, z.B.
+                 [("new_sketch", ("Front",)),
+                  ("sketch.circle", (0, 0, 25)),
+                  ("end_sketch",),
+                  ("feature.extrude", (20,))]
+
+        Erlaubt sind nur APPLY_OPERATIONS und die öffentlichen Methoden von
+        APPLY_NAMESPACES (z.B. "sketch.circle"), da Operationslisten auch
+        von außen kommen (Daemon, Farm-Jobs).
+
+        Returns:
+            Liste der Rückgabewerte
+        """
+        results = []
+        for op in ops:
+            method, args, kwargs = (tuple(op) + ((), {})[len(op) - 1:])[:3]
+            namespace, _, name = method.rpartition(".")
+            if (method not in APPLY_OPERATIONS and
+                    (namespace not in APPLY_NAMESPACES or name.startswith("_"))):
+                raise ValueError(f"Ungültige Operation: {method}")
+            target = getattr(self, namespace) if namespace else self
+            results.append(getattr(target, name)(*args, **kwargs))
+        return results
+
+    @contextmanager
+    def fast_mode(self):
+        """
+        Performance-Modus für umfangreiche Aufbauten.
+
+        Schaltet Grafik-Updates, FeatureManager-Baum, Sketch-Anzeige und
+        Sketch-Inferenz ab und stellt den vorherigen Zustand beim Verlassen
+        wieder her (auch bei Fehlern). Verschachtelte Aufrufe sind erlaubt.
+
+        Verwendung:
+            with sw.fast_mode():
+                for x, y in positions:
+                    sw.sketch.circle(cx=x, cy=y, diameter=5)
+        """
+        if self._connection is None:
+            raise ValueError(
+                "Kein Dokument verbunden (require_document=False).\n"
+                "fast_mode() benötigt ein geöffnetes Part-Dokument."
+            )
+        self.flush()
+        if self._fast_mode_depth:
+            self._fast_mode_depth += 1
+            try:
+                yield self
+            finally:
+                self._fast_mode_depth -= 1
+            return
+
+        model = self._connection.model
+        sketch_manager = model.SketchManager
+        feature_manager = model.FeatureManager
+        view = model.ActiveView
+
+        # (Objekt, Eigenschaft, Wert im Performance-Modus)
+        settings = [
+            (sketch_manager, "AddToDB", True),
+            (sketch_manager, "DisplayWhenAdded", False),
+            (feature_manager, "EnableFeatureTree", False),
+            (feature_manager, "EnableFeatureTreeWindow", False),
+        ]
+        if view is not None:
+            settings.append((view, "EnableGraphicsUpdate", False))
+
+        saved = []
+        inference = None
+        try:
+            for obj, name, value in settings:
+                saved.append((obj, name, getattr(obj, name)))
+                setattr(obj, name, value)
+            inference = self._app.GetUserPreferenceToggle(SwConst.swSketchInference)
+            self._app.SetUserPreferenceToggle(SwConst.swSketchInference, False)
+
+            self._fast_mode_depth = 1
+            yield self
+            # Gesammelte IR-Operationen noch im Performance-Modus ausführen
+            self.flush()
+        finally:
+            self._fast_mode_depth = 0
+            if inference is not None:
+                self._app.SetUserPreferenceToggle(SwConst.swSketchInference, inference)
+            for obj, name, value in reversed(saved):
+                setattr(obj, name, value)
+            if view is not None:
+                model.GraphicsRedraw2()
+
 
 # Schnellzugriff-Funktionen für einfache Operationen
-def quick_box(width: float, height: float, depth: float):
+def quick_box(width: float, height: float, depth: float, path: str = None):
     """
     Erstellt schnell einen einfachen Quader.
 
@@ -1186,36 +5247,39 @@ def quick_box(width: float, height: float, depth: float):
         width: Breite in mm
         height: Höhe in mm
         depth: Tiefe in mm
+        path: Optionaler Speicherpfad (.sldprt); nutzt ggf. den Part-Cache
     """
     sw = SolidWorksAutomation()
     sw.new_sketch("Front")
     sw.sketch.rectangle_centered(width, height)
     sw.end_sketch()
     sw.feature.extrude(depth)
-    sw.save()
+    sw.save(path)
     print(f"Quader erstellt: {width}x{height}x{depth}mm")
     return sw
 
 
-def quick_cylinder(diameter: float, height: float):
+def quick_cylinder(diameter: float, height: float, path: str = None):
     """
     Erstellt schnell einen Zylinder.
 
     Args:
         diameter: Durchmesser in mm
         height: Höhe in mm
+        path: Optionaler Speicherpfad (.sldprt); nutzt ggf. den Part-Cache
     """
     sw = SolidWorksAutomation()
     sw.new_sketch("Front")
     sw.sketch.circle(diameter=diameter)
     sw.end_sketch()
     sw.feature.extrude(height)
-    sw.save()
+    sw.save(path)
     print(f"Zylinder erstellt: Ø{diameter}x{height}mm")
     return sw
 
 
-def quick_revolve(profile_points: list, axis: str = "Y", angle: float = 360):
+def quick_revolve(profile_points: list, axis: str = "Y", angle: float = 360,
+                  path: str = None):
     """
     Erstellt schnell einen Drehkörper aus Profilpunkten.
 
@@ -1223,6 +5287,7 @@ def quick_revolve(profile_points: list, axis: str = "Y", angle: float = 360):
         profile_points: Liste von (x, y) Punkten in mm (Halbprofil)
         axis: Drehachse "X" oder "Y"
         angle: Drehwinkel in Grad
+        path: Optionaler Speicherpfad (.sldprt); nutzt ggf. den Part-Cache
 
     Beispiel:
         # Kegel erstellen
@@ -1251,12 +5316,13 @@ def quick_revolve(profile_points: list, axis: str = "Y", angle: float = 360):
 
     sw.end_sketch()
     sw.feature.revolve(angle, axis)
-    sw.save()
+    sw.save(path)
     print(f"Drehkörper erstellt: {angle}°")
     return sw
 
 
-def quick_pipe(outer_diameter: float, inner_diameter: float, length: float):
+def quick_pipe(outer_diameter: float, inner_diameter: float, length: float,
+               path: str = None):
     """
     Erstellt schnell ein Rohr (Hohlzylinder).
 
@@ -1264,6 +5330,7 @@ def quick_pipe(outer_diameter: float, inner_diameter: float, length: float):
         outer_diameter: Außendurchmesser in mm
         inner_diameter: Innendurchmesser in mm
         length: Länge in mm
+        path: Optionaler Speicherpfad (.sldprt); nutzt ggf. den Part-Cache
     """
     sw = SolidWorksAutomation()
 
@@ -1279,13 +5346,13 @@ def quick_pipe(outer_diameter: float, inner_diameter: float, length: float):
     sw.end_sketch()
     sw.feature.cut(through_all=True)
 
-    sw.save()
+    sw.save(path)
     print(f"Rohr erstellt: Ø{outer_diameter}/Ø{inner_diameter} x {length}mm")
     return sw
 
 
 def quick_plate_with_holes(length: float, width: float, thickness: float,
-                           hole_diameter: float, hole_positions: list):
+                           hole_diameter: float, hole_positions: list, path: str = None):
     """
     Erstellt schnell eine Platte mit Bohrungen.
 
@@ -1295,6 +5362,7 @@ def quick_plate_with_holes(length: float, width: float, thickness: float,
         thickness: Dicke in mm
         hole_diameter: Bohrungsdurchmesser in mm
         hole_positions: Liste von (x, y) Positionen der Bohrungen
+        path: Optionaler Speicherpfad (.sldprt); nutzt ggf. den Part-Cache
 
     Beispiel:
         quick_plate_with_holes(100, 50, 10, 8, [(20, 15), (80, 15), (20, 35), (80, 35)])
@@ -1314,7 +5382,7 @@ def quick_plate_with_holes(length: float, width: float, thickness: float,
         sw.end_sketch()
         sw.feature.cut(through_all=True)
 
-    sw.save()
+    sw.save(path)
     print(f"Platte mit {len(hole_positions)} Bohrungen erstellt")
     return sw
 
@@ -1329,7 +5397,7 @@ if __name__ == "__main__":
         sw = SolidWorksAutomation()
         print("\nVerbindung erfolgreich!")
         print(f"SolidWorks Version: {sw.app.RevisionNumber()}")
-        print(f"Dokument: {sw.model.GetTitle}")
+        print(f"Dokument: {com_value(sw.model, 'GetTitle')}")
         print("\nBereit für Operationen.")
     except Exception as e:
         print(f"\nFehler: {e}")
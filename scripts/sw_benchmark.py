@@ -0,0 +1,965 @@
+#!/usr/bin/env python3
+"""
+SolidWorks Automation - Benchmarks
+
+Micro-Benchmarks für sw_automation.py, die ohne SolidWorks laufen. Als
+Gegenstelle dient der Simulator (sw_simulator.py), optional hinter einem
+Fake-COM-Objekt, das den IDispatch-Verkehr (GetIDsOfNames / Invoke) zählt.
+
+Verwendung:
+    python sw_benchmark.py                 # alle Benchmarks
+    python sw_benchmark.py handle_cache    # einzelner Benchmark
+    python sw_benchmark.py budgets         # Aufrufbudgets (Exit-Code 1 bei Überschreitung)
+"""
+
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+import sw_automation
+from sw_automation import (SolidWorksAutomation, SolidWorksConnection, mm_to_m, polygon_points,
+                           rect_grid)
+from sw_simulator import SimulatorBackend, _SimObject, run_script
+
+# IDispatch::Invoke Flags
+DISPATCH_METHOD = 1
+DISPATCH_PROPERTYGET = 2
+DISPATCH_PROPERTYPUT = 4
+
+
+class FakeOleObject:
+    """
+    Fake PyIDispatch um ein Simulator-Objekt.
+
+    Zählt GetIDsOfNames- und Invoke-Aufrufe in einem gemeinsamen Counter.
+    """
+
+    def __init__(self, target, stats: Counter, dispids: dict):
+        self._target = target
+        self._stats = stats
+        self._dispids = dispids
+
+    def GetIDsOfNames(self, name: str) -> int:
+        self._stats["GetIDsOfNames"] += 1
+        return self._dispids.setdefault(name, len(self._dispids) + 1)
+
+    def Invoke(self, dispid: int, lcid: int, flags: int, result_wanted: bool, *args):
+        self._stats["Invoke"] += 1
+        name = next(n for n, i in self._dispids.items() if i == dispid)
+        args = tuple(self._cooked(a) for a in args)
+        if flags & DISPATCH_PROPERTYPUT:
+            setattr(self._target, name, args[0])
+            return None
+        if isinstance(getattr(type(self._target), name, None), property):
+            result = getattr(self._target, name)
+        else:
+            result = getattr(self._target, name)(*args)
+        return self._raw(result)
+
+    def _cooked(self, value):
+        """Übergibt Dispatch-Argumente (auch in Arrays) als Simulator-Objekt."""
+        if isinstance(value, FakeDispatch):
+            return value._oleobj_._target
+        if isinstance(value, FakeOleObject):
+            return value._target
+        if isinstance(value, (tuple, list)):
+            return tuple(self._cooked(v) for v in value)
+        return value
+
+    def _raw(self, value):
+        """Gibt Objekte wie COM als rohes IDispatch zurück."""
+        if isinstance(value, _SimObject):
+            return FakeOleObject(value, self._stats, self._dispids)
+        if isinstance(value, tuple):
+            return tuple(self._raw(v) for v in value)
+        return value
+
+
+class FakeDispatch:
+    """
+    Fake für win32com.client.dynamic.CDispatch (Late Binding).
+
+    Jeder Attributzugriff löst den Namen per GetIDsOfNames auf und führt
+    anschließend Invoke aus - wie dynamisches Dispatch ohne Typinformation.
+    """
+
+    def __init__(self, ole: FakeOleObject):
+        self.__dict__["_oleobj_"] = ole
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        ole = self._oleobj_
+        dispid = ole.GetIDsOfNames(name)
+        if isinstance(getattr(type(ole._target), name, None), property):
+            return self._get_good_object_(
+                ole.Invoke(dispid, 0, DISPATCH_METHOD | DISPATCH_PROPERTYGET, True)
+            )
+
+        def method(*args):
+            return self._get_good_object_(
+                ole.Invoke(dispid, 0, DISPATCH_METHOD | DISPATCH_PROPERTYGET, True, *args)
+            )
+        return method
+
+    def __setattr__(self, name: str, value):
+        ole = self._oleobj_
+        ole.Invoke(ole.GetIDsOfNames(name), 0, DISPATCH_PROPERTYPUT, False, value)
+
+    def __eq__(self, other):
+        if isinstance(other, FakeDispatch):
+            return self._oleobj_._target is other._oleobj_._target
+        return NotImplemented
+
+    def __hash__(self):
+        return id(self._oleobj_._target)
+
+    def _get_good_object_(self, value):
+        """Verpackt rohe IDispatch-Werte (wie CDispatch._get_good_object_)."""
+        if isinstance(value, FakeOleObject):
+            return FakeDispatch(value)
+        if isinstance(value, tuple):
+            return tuple(self._get_good_object_(v) for v in value)
+        return value
+
+
+class FakeEarlyBound(FakeDispatch):
+    """
+    Fake für eine makepy-Klasse (Early Binding).
+
+    Die DISPIDs stammen aus der (vorgenerierten) Typbibliothek: ein Aufruf
+    ist ein einzelnes Invoke ohne GetIDsOfNames.
+    """
+
+    _prop_map_get_ = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        ole = self._oleobj_
+        dispid = ole._dispids.setdefault(name, len(ole._dispids) + 1)
+        if isinstance(getattr(type(ole._target), name, None), property):
+            return self._get_good_object_(ole.Invoke(dispid, 0, DISPATCH_PROPERTYGET, True))
+
+        def method(*args):
+            return self._get_good_object_(ole.Invoke(dispid, 0, DISPATCH_METHOD, True, *args))
+        return method
+
+    def __setattr__(self, name: str, value):
+        ole = self._oleobj_
+        dispid = ole._dispids.setdefault(name, len(ole._dispids) + 1)
+        ole.Invoke(dispid, 0, DISPATCH_PROPERTYPUT, False, value)
+
+
+class FakeComBackend(SimulatorBackend):
+    """
+    Simulator, der das Application-Objekt als FakeDispatch liefert.
+
+    Args:
+        early_bound: True = Objekte wie ComBackend(early_bound=True) auf
+                     Fake-makepy-Klassen casten
+    """
+
+    name = "fake-com"
+
+    def __init__(self, early_bound: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.early_bound = early_bound
+        self.binding = "early" if early_bound else "dynamic"
+        self.dispatch_stats = Counter()
+        self.dispids = {}
+
+    def connect(self):
+        super().connect()
+        app = FakeDispatch(FakeOleObject(self.app, self.dispatch_stats, self.dispids))
+        return self.wrap(app, "ISldWorks")
+
+    def wrap(self, obj, interface: str):
+        if not self.early_bound or obj is None:
+            return obj
+        return FakeEarlyBound(obj._oleobj_)
+
+
+def _run_lines(conn: SolidWorksConnection, count: int):
+    """Typischer Hot-Path: Sketch mit count Linien plus Schnitt."""
+    conn.extension.SelectByID2("Front Plane", "PLANE", 0.0, 0.0, 0.0, False, 0, None, 0)
+    conn.sketch_manager.InsertSketch(True)
+    for i in range(count):
+        conn.sketch_manager.CreateLine(0.0, i * 0.001, 0, 0.01, i * 0.001, 0)
+    conn.sketch_manager.InsertSketch(True)
+    conn.feature_manager.FeatureCut(1, 0, 0, 0, 0, 0.01, 0.0, 0, 0, 0, 0, 0.0, 0.0)
+
+
+def bench_handle_cache(count: int = 1000):
+    """Vergleicht IDispatch-Verkehr mit und ohne Handle-Cache."""
+    print(f"\nHandle-Cache: Sketch mit {count} Linien")
+    print(f"{'Modus':<16} {'GetIDsOfNames':>14} {'Invoke':>8} {'Zeit':>10}")
+    for cached in (False, True):
+        backend = FakeComBackend(sleep=False)
+        conn = SolidWorksConnection(backend, cache_handles=cached)
+        backend.dispatch_stats.clear()
+        start = time.perf_counter()
+        _run_lines(conn, count)
+        elapsed = time.perf_counter() - start
+        stats = backend.dispatch_stats
+        label = "gecacht" if cached else "late-bound"
+        print(f"{label:<16} {stats['GetIDsOfNames']:>14} {stats['Invoke']:>8} "
+              f"{elapsed * 1000:8.1f} ms")
+
+
+def bench_binding(count: int = 1000):
+    """Vergleicht den Aufruf-Overhead von Late und Early Binding."""
+    print(f"\nBinding: Sketch mit {count} Linien")
+    print(f"{'Modus':<24} {'GetIDsOfNames':>14} {'Invoke':>8} {'Zeit':>10}")
+    modes = [
+        ("dynamisch", False, False),
+        ("dynamisch + Handle-Cache", False, True),
+        ("early-bound", True, True),
+    ]
+    for label, early, cached in modes:
+        backend = FakeComBackend(early_bound=early, sleep=False)
+        conn = SolidWorksConnection(backend, cache_handles=cached)
+        backend.dispatch_stats.clear()
+        start = time.perf_counter()
+        _run_lines(conn, count)
+        elapsed = time.perf_counter() - start
+        stats = backend.dispatch_stats
+        print(f"{label:<24} {stats['GetIDsOfNames']:>14} {stats['Invoke']:>8} "
+              f"{elapsed * 1000:8.1f} ms")
+
+
+def bench_multiselect(sides: int = 120, latency: float = 0.0005):
+    """Vergleicht Einzelselektion (Select4-Schleife) mit MultiSelect2."""
+    print(f"\nMultiselektion: Prisma mit {sides}-Eck, {latency * 1000:.1f} ms / Aufruf")
+    print(f"{'Modus':<16} {'Objekte':>8} {'Invoke':>8} {'Aufrufe':>8} {'Simuliert':>11}")
+    for bulk in (False, True):
+        backend = FakeComBackend(latency=latency, sleep=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=backend)
+            sw.new_sketch("Front")
+            sw.sketch.polygon(0, 0, 50, sides)
+            sw.end_sketch()
+            sw.feature.extrude(20)
+            edges = []
+            for body in sw.model.GetBodies2(0, True):
+                edges.extend(body.GetEdges())
+        backend.dispatch_stats.clear()
+        backend.reset_stats()
+        count = sw.selection.select_many(edges, bulk=bulk)
+        label = "MultiSelect2" if bulk else "Select4"
+        print(f"{label:<16} {count:>8} {backend.dispatch_stats['Invoke']:>8} "
+              f"{backend.call_count:>8} {backend.simulated_time * 1000:9.1f} ms")
+
+
+def _scalar_grid_rows(nx: int, ny: int, pitch: float, radius: float) -> list:
+    """Referenz: CreateCircle-Argumente Punkt für Punkt (math + mm_to_m)."""
+    rows = []
+    for j in range(ny):
+        for i in range(nx):
+            x = (i - (nx - 1) / 2) * pitch
+            y = (j - (ny - 1) / 2) * pitch
+            rows.append((mm_to_m(x), mm_to_m(y), 0, mm_to_m(x + radius), mm_to_m(y), 0))
+    return rows
+
+
+def bench_geometry(side: int = 100, sides: int = 10000):
+    """Python-seitige Kosten der Punktgenerierung: skalar vs. Geometrie-Kernel."""
+    kernel = "NumPy" if sw_automation.np is not None else "reines Python"
+    print(f"\nGeometrie-Kernel ({kernel}): Raster {side}x{side}, Polygon mit {sides} Ecken")
+    print(f"{'Fall':<34} {'skalar':>10} {'Kernel':>10} {'Faktor':>7}")
+
+    def timed(func, repeat: int = 3) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def sketch_time(draw) -> float:
+        sim = SimulatorBackend(sleep=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=sim)
+            sw.new_sketch("Front")
+            return timed(lambda: draw(sw), repeat=1)
+
+    def scalar_circles(sw):
+        for j in range(side):
+            for i in range(side):
+                sw.sketch.circle(cx=(i - (side - 1) / 2) * 8, cy=(j - (side - 1) / 2) * 8,
+                                 diameter=4.8)
+
+    def scalar_polygon(sw):
+        points = [(50 * math.cos(2 * math.pi * i / sides - math.pi / 2),
+                   50 * math.sin(2 * math.pi * i / sides - math.pi / 2)) for i in range(sides)]
+        for i in range(sides):
+            sw.sketch.line(*points[i], *points[(i + 1) % sides])
+
+    rows = [
+        ("Raster: CreateCircle-Argumente",
+         timed(lambda: _scalar_grid_rows(side, side, 8, 2.4)),
+         timed(lambda: sw_automation._circle_rows(rect_grid(side, side, 8), 2.4))),
+        ("Raster: Sketch (Simulator)",
+         sketch_time(scalar_circles),
+         sketch_time(lambda sw: sw.sketch.circles(rect_grid(side, side, 8), diameter=4.8))),
+        ("Polygon: Sketch (Simulator)",
+         sketch_time(scalar_polygon),
+         sketch_time(lambda sw: sw.sketch.polyline(polygon_points(0, 0, 50, sides), closed=True))),
+    ]
+    for label, scalar, vectorized in rows:
+        print(f"{label:<34} {scalar * 1000:8.1f}ms {vectorized * 1000:8.1f}ms "
+              f"{scalar / vectorized:6.1f}x")
+
+
+def _legacy_spline_data(points) -> list:
+    """Referenz: Punktliste wie vor dem Puffer-Pfad (Python-Liste)."""
+    point_data = []
+    for x, y in points:
+        point_data.extend([mm_to_m(x), mm_to_m(y), 0])
+    return point_data
+
+
+def bench_spline(count: int = 50000):
+    """Speicher und Umwandlungszeit der Spline-Punktdaten für CreateSpline2."""
+    print(f"\nSpline-Punktdaten: {count} Punkte")
+    print(f"{'Eingabe / Pfad':<30} {'Zeit':>10} {'Python-Peak':>12} {'SAFEARRAY':>11}")
+    points = _spline_points(count)
+    cases = [
+        # Liste ohne Typangabe: pywin32 erzeugt ein Array von VARIANTs (16 Byte)
+        ("Liste -> Liste (alt)", lambda: _legacy_spline_data(points), 16),
+        ("Liste -> Puffer", lambda: sw_automation._spline_buffer(points), 8),
+    ]
+    if sw_automation.np is not None:
+        array = sw_automation.np.asarray(points, dtype=float)
+        cases.append(("NumPy (n, 2) -> Puffer", lambda: sw_automation._spline_buffer(array), 8))
+    for label, build, item_size in cases:
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            build()
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        data = build()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<30} {best * 1000:8.1f}ms {peak / 1e6:9.2f} MB "
+              f"{len(data) * item_size / 1e6:8.2f} MB")
+
+
+def _airfoil_points(count: int, chord: float = 80.0, thickness: float = 0.12) -> list:
+    """Geschlossenes NACA-00xx-Profil (Oberseite, dann Unterseite) in mm."""
+    half = count // 2
+    upper = []
+    for i in range(half):
+        x = (1 - math.cos(math.pi * i / (half - 1))) / 2
+        y = 5 * thickness * (0.2969 * math.sqrt(x) - 0.1260 * x - 0.3516 * x ** 2
+                             + 0.2843 * x ** 3 - 0.1036 * x ** 4)
+        upper.append((x * chord, y * chord))
+    lower = [(x, -y) for x, y in reversed(upper[1:-1])]
+    return upper + lower
+
+
+def _cam_points(count: int) -> list:
+    """Kurvenscheibe: Grundkreis mit Hub über 120° (geschlossen) in mm."""
+    points = []
+    for i in range(count):
+        a = 2 * math.pi * i / count
+        lift = 8 * (1 - math.cos(3 * a)) / 2 if a < 2 * math.pi / 3 else 0.0
+        points.append(((30 + lift) * math.cos(a), (30 + lift) * math.sin(a)))
+    return points
+
+
+def _zigzag_points(count: int) -> list:
+    """Zickzack mit wachsender Amplitude: ungünstigster Fall für Douglas-Peucker."""
+    return [(float(i), float((-1) ** i * i)) for i in range(count)]
+
+
+def bench_decimation(count: int = 20000, tolerance: float = 0.005):
+    """
+    Punktreduktion dichter Profile vor CreateSpline2.
+
+    Douglas-Peucker braucht im Mittel O(n log n); unausgewogene Teilungen
+    werden in der Mitte geteilt, daher gilt das auch im ungünstigsten Fall
+    (Zickzack, sonst O(n²)).
+    """
+    print(f"\nSpline-Reduktion: {count} Punkte, Toleranz {tolerance} mm")
+    print(f"{'Profil':<10} {'Verfahren':<16} {'Punkte':>12} {'max. Abw.':>11} {'Zeit':>10}")
+    for name, points in (("Profil", _airfoil_points(count)), ("Nocken", _cam_points(count))):
+        for method in sw_automation.DECIMATION_METHODS:
+            start = time.perf_counter()
+            _, stats = sw_automation.decimate_points(points, tolerance, method, closed=True)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {method:<16} {stats.kept_points:>5}/{stats.input_points:<6} "
+                  f"{stats.max_deviation:8.4f}mm {elapsed * 1000:8.1f}ms")
+
+    print(f"\n{'Skalierung (Profil)':<27} {'douglas-peucker':>16} {'curvature':>10}")
+    for n in (10000, 100000):
+        points = _airfoil_points(n)
+        times = []
+        for method in sw_automation.DECIMATION_METHODS:
+            start = time.perf_counter()
+            sw_automation.decimate_points(points, tolerance, method, closed=True)
+            times.append(time.perf_counter() - start)
+        print(f"{n:>8} Punkte {'':<12} {times[0] * 1000:14.1f}ms {times[1] * 1000:8.1f}ms")
+
+    print(f"\n{'Ungünstigster Fall (Zickzack)':<30} {'douglas-peucker':>16}")
+    for n in (10000, 100000):
+        points = _zigzag_points(n)
+        start = time.perf_counter()
+        sw_automation.decimate_points(points, tolerance)
+        print(f"{n:>8} Punkte {'':<15} {(time.perf_counter() - start) * 1000:14.1f}ms")
+
+
+def bench_validation():
+    """Laufzeit der Sketch-Prüfung (ohne API-Aufrufe) für große Profile."""
+    print("\nSketch-Prüfung (lokal, vor extrude/cut/revolve)")
+    print(f"{'Profil':<40} {'Elemente':>9} {'Konturen':>9} {'Zeit':>10}  Ergebnis")
+
+    def grid(n):
+        profile = sw_automation.SketchProfile("Front")
+        profile.add_polyline([(-10, -10), (n * 10, -10), (n * 10, n * 10), (-10, n * 10)], True)
+        centers = rect_grid(n, n, 10, cx=(n - 1) * 5, cy=(n - 1) * 5)
+        for x, y in (centers.tolist() if hasattr(centers, "tolist") else centers):
+            profile.add("circle", x, y, 3)
+        return profile
+
+    def polygon(n):
+        profile = sw_automation.SketchProfile("Front")
+        profile.add_polyline(polygon_points(0, 0, 500, n), True)
+        return profile
+
+    def crossing(n):
+        profile = polygon(n)
+        profile.add("line", -600, 0.5, 600, 0.5)
+        return profile
+
+    cases = [
+        ("Platte mit 32x32 Bohrungen", grid(32)),
+        ("Platte mit 100x100 Bohrungen", grid(100)),
+        ("Polygon mit 5000 Linien", polygon(5000)),
+        ("Polygon mit 5000 Linien + Störlinie", crossing(5000)),
+    ]
+    for label, profile in cases:
+        start = time.perf_counter()
+        report = profile.validate()
+        elapsed = time.perf_counter() - start
+        result = "OK" if report.ok else report.errors[0]
+        print(f"{label:<40} {report.entities:>9} {report.loops:>9} {elapsed * 1000:8.1f}ms  {result}")
+
+
+class OperationCase:
+    """
+    Benchmark-Fall für eine Operation mit Budget für API-Aufrufe.
+
+    Args:
+        name: Anzeigename, z.B. "sketch.polygon(sides=12)"
+        run: Funktion(sw), die die Operation ausführt
+        budget: Maximale Anzahl API-Aufrufe (Round-Trips)
+        setup: Optionale Funktion(sw) für die Vorbereitung (nicht gezählt)
+    """
+
+    def __init__(self, name: str, run, budget: int, setup=None):
+        self.name = name
+        self.run = run
+        self.budget = budget
+        self.setup = setup
+
+
+def _sketch(sw):
+    sw.new_sketch("Front")
+
+
+def _legacy_sketch(sw):
+    """Sketch wie auf einer SolidWorks-Version ohne CreatePolygon/CreateSketchSlot."""
+    _sketch(sw)
+    sw.sketch._unsupported.update({"CreatePolygon", "CreateSketchSlot"})
+
+
+def _slot_grid(sw):
+    for i in range(200):
+        x, y = (i % 20) * 30, (i // 20) * 20
+        sw.sketch.slot(x, y, x + 20, y, 8)
+
+
+def _profile(sw):
+    sw.new_sketch("Front")
+    sw.sketch.rectangle_centered(100, 60)
+    sw.end_sketch()
+
+
+def _box(sw):
+    _profile(sw)
+    sw.feature.extrude(20)
+
+
+def _cut_profile(sw):
+    _box(sw)
+    sw.new_sketch("Front")
+    sw.sketch.circle(0, 0, diameter=10)
+    sw.end_sketch()
+
+
+def _revolve_profile(sw):
+    sw.new_sketch("Front")
+    sw.sketch.rectangle(10, 0, 30, 40)
+    sw.end_sketch()
+
+
+def _select_edges(sw):
+    _box(sw)
+    sw.selection.select_all_edges()
+
+
+def _box_edges(sw) -> list:
+    return list(sw.model.GetBodies2(0, True)[0].GetEdges())
+
+
+def _fillet_box(sw):
+    _select_edges(sw)
+    sw.feature.fillet(2)
+
+
+def _select_feature(sw):
+    _box(sw)
+    sw.selection.select_by_id("Boss-Extrude1", "BODYFEATURE")
+
+
+def _flange(sw, outer: float, bore: float, thickness: float):
+    """Flansch: Ring mit sechs Bohrungen auf festem Lochkreis."""
+    sw.new_sketch("Front")
+    sw.sketch.circle(diameter=outer)
+    sw.sketch.circle(diameter=bore)
+    sw.end_sketch()
+    sw.feature.extrude(thickness)
+    sw.feature.circular_hole_pattern(6, 8, 90, thickness, mode="sketch")
+
+
+def _flange_family(variants: int) -> list:
+    """(Außen-Ø, Bohrung, Dicke) für variants verschiedene Flansche."""
+    return [(120 + i % 50, 50 + i % 20, 10 + i % 7) for i in range(variants)]
+
+
+def bench_parametric(variants: int = 500, latency: float = 0.0005):
+    """Flansch-Varianten: Neuaufbau pro Variante vs. update() am bestehenden Modell."""
+    print(f"\nParametrische Varianten: {variants} Flansche, {latency * 1000:.1f} ms / Aufruf")
+    print(f"{'Modus':<12} {'Invoke':>8} {'Aufrufe':>8} {'Rebuilds':>9} {'Features':>9} "
+          f"{'Simuliert':>11} {'Python':>10}")
+    family = _flange_family(variants)
+
+    def rebuild(sw):
+        for outer, bore, thickness in family:
+            sw.documents.new_part()
+            sw.sync_document()
+            _flange(sw, outer, bore, thickness)
+
+    def update(sw):
+        _flange(sw, *family[0])
+        for outer, bore, thickness in family[1:]:
+            sw.update({"circle1.diameter": outer, "circle2.diameter": bore,
+                       "extrude1.depth": thickness})
+
+    for label, run in (("neu", rebuild), ("update", update)):
+        backend = FakeComBackend(latency=latency, sleep=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=backend, sketch_dimensions=True)
+            backend.dispatch_stats.clear()
+            backend.reset_stats()
+            start = time.perf_counter()
+            run(sw)
+            elapsed = time.perf_counter() - start
+        features = sum(len(doc.features) for doc in backend.app.documents)
+        rebuilds = backend.counts["ModelDoc2.ForceRebuild3"]
+        print(f"{label:<12} {backend.dispatch_stats['Invoke']:>8} {backend.call_count:>8} "
+              f"{rebuilds:>9} {features:>9} {backend.simulated_time * 1000:9.1f} ms "
+              f"{elapsed * 1000:8.1f}ms")
+
+
+def bench_family(variants: int = 500, latency: float = 0.0005):
+    """Flansch-Familie aus CSV: ein Dokument je Größe vs. Konfigurationen."""
+    print(f"\nTeilefamilie: {variants} Flansche aus CSV, {latency * 1000:.1f} ms / Aufruf")
+    family = _flange_family(variants)
+    lines = ["name;circle1.diameter;circle2.diameter;extrude1.depth"]
+    lines += [f"F{o}x{b}x{t};{o};{b};{t}" for o, b, t in family]
+
+    start = time.perf_counter()
+    plan = sw_automation.plan_family(sw_automation.read_family_table(lines),
+                                     base=dict(zip(("circle1.diameter", "circle2.diameter",
+                                                    "extrude1.depth"), family[0])))
+    elapsed = time.perf_counter() - start
+    cells = sum(len(family[0]) for _ in family)
+    print(f"Plan (offline): {plan}, {cells} Tabellenzellen, {elapsed * 1000:.1f} ms")
+
+    print(f"{'Modus':<16} {'Invoke':>8} {'Aufrufe':>8} {'Dokumente':>10} {'Dateien':>8} "
+          f"{'Simuliert':>11} {'Python':>10}")
+
+    def documents(sw, directory):
+        for outer, bore, thickness in family:
+            sw.documents.new_part()
+            sw.sync_document()
+            _flange(sw, outer, bore, thickness)
+            sw.save(os.path.join(directory, f"F{outer}x{bore}x{thickness}.sldprt"))
+
+    def configurations(sw, directory):
+        _flange(sw, *family[0])
+        sw.export_configurations(sw.create_configurations(lines), directory)
+
+    for label, run in (("Dokumente", documents), ("Konfigurationen", configurations)):
+        backend = FakeComBackend(latency=latency, sleep=False)
+        with tempfile.TemporaryDirectory() as directory:
+            with contextlib.redirect_stdout(io.StringIO()):
+                sw = SolidWorksAutomation(backend=backend, sketch_dimensions=True)
+                backend.dispatch_stats.clear()
+                backend.reset_stats()
+                start = time.perf_counter()
+                run(sw, directory)
+                elapsed = time.perf_counter() - start
+            files = len(os.listdir(directory))
+        print(f"{label:<16} {backend.dispatch_stats['Invoke']:>8} {backend.call_count:>8} "
+              f"{len(backend.app.documents):>10} {files:>8} "
+              f"{backend.simulated_time * 1000:9.1f} ms {elapsed * 1000:8.1f}ms")
+
+
+def bench_pool(jobs: int = 20, new_document: float = 0.03, think: float = 0.05):
+    """Latenz von new_part() mit und ohne DocumentPool (Auffüllen im Leerlauf zwischen Jobs)."""
+    print(f"\nDokument-Pool: {jobs} Jobs, NewDocument {new_document * 1000:.0f} ms, "
+          f"{think * 1000:.0f} ms Leerlauf zwischen Jobs")
+    print(f"{'Modus':<14} {'Treffer':>8} {'Mittel':>10} {'p95':>10} {'Gesamt':>10}")
+    for size in (0, 2):
+        sim = SimulatorBackend(latencies={"SldWorks.NewDocument": new_document})
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=sim)
+            if size:
+                sw.documents.pool = sw_automation.DocumentPool(sw.app, size)
+            start = time.perf_counter()
+            for _ in range(jobs):
+                begin = time.perf_counter()
+                sw.documents.new_part()
+                latencies.append(time.perf_counter() - begin)
+                sw.sync_document()
+                _box(sw)
+                sw.app.CloseDoc(sw_automation.com_value(sw.model, "GetTitle"))
+                if size:
+                    sw.documents.pool.maintain(limit=1)
+                time.sleep(max(0.0, think - (time.perf_counter() - begin)))
+            elapsed = time.perf_counter() - start
+            if size:
+                hit_rate = sw.documents.pool.metrics()["hit_rate"]
+                sw.documents.pool.close()
+            else:
+                hit_rate = 0.0
+        latencies.sort()
+        label = f"Pool (size={size})" if size else "ohne Pool"
+        print(f"{label:<14} {hit_rate:>7.0%} {sum(latencies) / jobs * 1000:8.2f}ms "
+              f"{latencies[min(jobs - 1, int(0.95 * jobs))] * 1000:8.2f}ms {elapsed:9.2f}s")
+
+
+def bench_session(documents: int = 10, passes: int = 5, latency: float = 0.0005):
+    """Round-Robin über viele Dokumente: DocumentSession vs. ActivateDoc3 + sync_document."""
+    print(f"\nDokument-Sitzung: {documents} Dokumente, {passes} Runden, "
+          f"{latency * 1000:.1f} ms / Aufruf")
+    print(f"{'Modus':<16} {'GetIDsOfNames':>14} {'Invoke':>8} {'Simuliert':>11} {'Python':>10}")
+
+    def work(sw):
+        sw.sketch.start_sketch("Front")
+        sw.sketch.circle(0, 0, diameter=5)
+        sw.sketch.end_sketch()
+
+    def sync(sw):
+        titles = []
+        for _ in range(documents):
+            sw.documents.new_part()
+            sw.sync_document()
+            titles.append(sw_automation.com_value(sw.model, "GetTitle"))
+        yield
+        for _ in range(passes):
+            for title in titles:
+                sw.app.ActivateDoc3(title, False, sw_automation.SwConst.swDontRebuildActiveDoc, 0)
+                sw.sync_document()
+                work(sw)
+
+    def session(sw):
+        session = sw.document_session(max_documents=documents + 1)
+        for _ in range(documents):
+            session.new_part()
+        titles = [doc.title for doc in session.documents[1:]]
+        yield
+        for _ in range(passes):
+            for title in titles:
+                session.activate(title)
+                work(sw)
+
+    for label, run in (("sync_document", sync), ("DocumentSession", session)):
+        backend = FakeComBackend(latency=latency, sleep=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=backend)
+            steps = run(sw)
+            next(steps)
+            backend.dispatch_stats.clear()
+            backend.reset_stats()
+            start = time.perf_counter()
+            next(steps, None)
+            elapsed = time.perf_counter() - start
+        stats = backend.dispatch_stats
+        print(f"{label:<16} {stats['GetIDsOfNames']:>14} {stats['Invoke']:>8} "
+              f"{backend.simulated_time * 1000:9.1f} ms {elapsed * 1000:8.1f}ms")
+
+    # LRU: mehr Dateien als erlaubt offen, zyklischer Zugriff
+    limit = documents // 2
+    backend = SimulatorBackend(sleep=False)
+    with tempfile.TemporaryDirectory() as directory:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=backend)
+            session = sw.document_session(max_documents=limit)
+            paths = []
+            for i in range(documents):
+                session.new_part()
+                _box(sw)
+                paths.append(os.path.join(directory, f"teil_{i}.sldprt"))
+                session.save(paths[-1])
+            for _ in range(passes):
+                for path in paths[::3]:
+                    session.open(path)
+        stats = session.stats()
+    print(f"LRU (max {limit}): offen {stats['open']}, geöffnet {stats['opened']}, "
+          f"wiederverwendet {stats['reused']}, verdrängt {stats['evicted']}, "
+          f"SolidWorks-Dokumente {len(backend.app.documents)}")
+
+
+def bench_busy(parts: int = 20, busy: float = 0.25, latency: float = 0.0005):
+    """Abgewiesene Aufrufe während Rebuilds: ohne Retry, feste Wartezeit, Backoff."""
+    print(f"\nBeschäftigte Instanz: {parts} Teile, {busy * 1000:.0f} ms Rebuild nach jedem "
+          f"Feature, {latency * 1000:.1f} ms / Aufruf")
+    print(f"{'Modus':<22} {'Teile':>6} {'Abgewiesen':>11} {'Wartezeit':>10} {'Simuliert':>11}")
+    rebuilds = {"FeatureManager.FeatureExtrusion3": busy, "FeatureManager.FeatureCut": busy}
+    policies = [
+        ("ohne Retry", None, rebuilds),
+        ("fest 0.5 s", dict(initial=0.5, factor=1.0, jitter=0.0), rebuilds),
+        ("Backoff", dict(initial=0.02), rebuilds),
+        ("Backoff (Leerlauf)", dict(initial=0.02), {}),
+    ]
+    for label, options, busy_calls in policies:
+        sim = SimulatorBackend(latency=latency, sleep=False, busy=busy_calls)
+        backend = sim
+        if options is not None:
+            policy = sw_automation.RetryPolicy(clock=lambda: sim.simulated_time,
+                                               sleep=sim._delay, **options)
+            backend = sw_automation.RetryingBackend(sim, policy)
+        done = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            sw = SolidWorksAutomation(backend=backend)
+            for _ in range(parts):
+                try:
+                    sw.documents.new_part()
+                    sw.sync_document()
+                    _cut_profile(sw)
+                    sw.feature.cut(5)
+                    done += 1
+                except Exception:
+                    sim.busy_until = 0.0
+        waited = policy.time_lost if options is not None else 0.0
+        print(f"{label:<22} {done:>6} {sim.rejected:>11} {waited * 1000:8.0f} ms "
+              f"{sim.simulated_time * 1000:9.0f} ms")
+
+
+def _spline_points(count: int) -> list:
+    return [(i * 2.0, 10 * ((i % 7) - 3)) for i in range(count)]
+
+
+# Budgets = aktuelle Anzahl Round-Trips; bei Optimierungen absenken, nie anheben
+# ohne Begründung. Erste Zugriffe auf Manager-Objekte zählen mit.
+OPERATION_CASES = [
+    # SketchOperations
+    OperationCase("sketch.start_sketch", lambda sw: sw.sketch.start_sketch("Front"), 4),
+    OperationCase("sketch.end_sketch", lambda sw: sw.sketch.end_sketch(), 1, _sketch),
+    OperationCase("sketch.line", lambda sw: sw.sketch.line(0, 0, 50, 20), 1, _sketch),
+    OperationCase("sketch.circle", lambda sw: sw.sketch.circle(0, 0, diameter=20), 1, _sketch),
+    OperationCase("sketch.rectangle", lambda sw: sw.sketch.rectangle(0, 0, 50, 20), 1, _sketch),
+    OperationCase("sketch.rectangle_centered",
+                  lambda sw: sw.sketch.rectangle_centered(50, 20), 1, _sketch),
+    OperationCase("sketch.arc", lambda sw: sw.sketch.arc(0, 0, 20, 0, 90), 1, _sketch),
+    OperationCase("sketch.polygon(sides=6)",
+                  lambda sw: sw.sketch.polygon(0, 0, 20, 6), 1, _sketch),
+    OperationCase("sketch.polygon(sides=360)",
+                  lambda sw: sw.sketch.polygon(0, 0, 20, 360), 1, _sketch),
+    OperationCase("sketch.polygon(sides=360, fallback)",
+                  lambda sw: sw.sketch.polygon(0, 0, 20, 360), 360, _legacy_sketch),
+    OperationCase("sketch.slot", lambda sw: sw.sketch.slot(0, 0, 40, 0, 10), 1, _sketch),
+    OperationCase("sketch.slot(grid=200)", _slot_grid, 200, _sketch),
+    OperationCase("sketch.slot(fallback)",
+                  lambda sw: sw.sketch.slot(0, 0, 40, 0, 10), 4, _legacy_sketch),
+    OperationCase("sketch.ellipse",
+                  lambda sw: sw.sketch.ellipse(0, 0, major_radius=30, minor_radius=10), 1, _sketch),
+    OperationCase("sketch.center_rectangle",
+                  lambda sw: sw.sketch.center_rectangle(0, 0, 50, 20), 1, _sketch),
+    OperationCase("sketch.three_point_arc",
+                  lambda sw: sw.sketch.three_point_arc(0, 0, 10, 10, 20, 0), 1, _sketch),
+    OperationCase("sketch.circles(n=100)",
+                  lambda sw: sw.sketch.circles(sw_automation.rect_grid(10, 10, 20), diameter=5),
+                  100, _sketch),
+    OperationCase("sketch.polyline(points=100)",
+                  lambda sw: sw.sketch.polyline(_spline_points(100)), 99, _sketch),
+    OperationCase("sketch.polyline(points=100, closed)",
+                  lambda sw: sw.sketch.polyline(_spline_points(100), closed=True), 100, _sketch),
+    OperationCase("sketch.spline(points=50)",
+                  lambda sw: sw.sketch.spline(_spline_points(50)), 1, _sketch),
+    OperationCase("sketch.add_relation",
+                  lambda sw: sw.sketch.add_relation("horizontal"), 1, _sketch),
+
+    # FeatureOperations
+    OperationCase("feature.extrude", lambda sw: sw.feature.extrude(20), 2, _profile),
+    OperationCase("feature.cut", lambda sw: sw.feature.cut(5), 1, _cut_profile),
+    OperationCase("feature.chamfer", lambda sw: sw.feature.chamfer(2), 1, _select_edges),
+    OperationCase("feature.fillet", lambda sw: sw.feature.fillet(2), 1, _select_edges),
+    OperationCase("feature.circular_hole_pattern(n=8)",
+                  lambda sw: sw.feature.circular_hole_pattern(8, 5, 40, 10), 5 * 8, _box),
+    OperationCase("feature.circular_hole_pattern(n=8, sketch)",
+                  lambda sw: sw.feature.circular_hole_pattern(8, 5, 40, 10, mode="sketch"),
+                  8 + 4, _box),
+    # inklusive zwei Feature.Name-Abfragen (Achse, Seed-Feature)
+    OperationCase("feature.circular_hole_pattern(n=8, pattern)",
+                  lambda sw: sw.feature.circular_hole_pattern(8, 5, 40, 10, mode="pattern"),
+                  14, _box),
+    OperationCase("feature.linear_pattern",
+                  lambda sw: sw.feature.linear_pattern("X", 4, 30), 1, _select_feature),
+    OperationCase("feature.revolve", lambda sw: sw.feature.revolve(360), 2, _revolve_profile),
+    OperationCase("feature.revolve_cut", lambda sw: sw.feature.revolve_cut(360), 2, _revolve_profile),
+    OperationCase("feature.reference_plane",
+                  lambda sw: sw.feature.reference_plane(25, "Front"), 4),
+    OperationCase("feature.mirror", lambda sw: sw.feature.mirror("Right"), 2, _select_feature),
+
+    # SelectionHelper
+    OperationCase("selection.select_by_id",
+                  lambda sw: sw.selection.select_by_id("Front Plane", "PLANE"), 2),
+    OperationCase("selection.select_face_at",
+                  lambda sw: sw.selection.select_face_at(0, 0, 20), 1, _box),
+    OperationCase("selection.select_all_edges",
+                  lambda sw: sw.selection.select_all_edges(), 3, _box),
+    OperationCase("selection.select_many(mark=2)",
+                  lambda sw: sw.selection.select_many(_box_edges(sw), mark=2), 6, _box),
+    OperationCase("selection.get_selection_count",
+                  lambda sw: sw.selection.get_selection_count(), 2),
+    OperationCase("selection.clear_selection", lambda sw: sw.selection.clear_selection(), 1),
+
+    # Parametrische Varianten (erster update() löst die Bemaßungen auf)
+    OperationCase("update(2 Bemaßungen)",
+                  lambda sw: sw.update({"extrude1.depth": 25, "fillet1.radius": 3}), 7, _fillet_box),
+]
+
+# (Name, Funktion, Argumente, Budget) - inklusive Verbindungsaufbau
+QUICK_CASES = [
+    ("quick_box", sw_automation.quick_box, (100, 50, 30), 13),
+    ("quick_cylinder", sw_automation.quick_cylinder, (40, 80), 13),
+    ("quick_revolve", sw_automation.quick_revolve,
+     ([(10, 0), (30, 0), (30, 40), (10, 40)],), 17),
+    ("quick_pipe", sw_automation.quick_pipe, (40, 30, 100), 18),
+    ("quick_plate_with_holes", sw_automation.quick_plate_with_holes,
+     (200, 100, 10, 8, [(-80, -30), (80, -30), (80, 30), (-80, 30)]), 33),
+]
+
+# Budget für das Turbinenschaufel-Skript (scripts/turbine-blade-concept.py)
+TURBINE_BUDGET = 274
+
+
+def _measure(run, setup=None) -> tuple:
+    """Führt run(sw) auf einem frischen Simulator aus: (Sekunden, Aufrufe, Features)."""
+    sim = SimulatorBackend(sleep=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sw = SolidWorksAutomation(backend=sim)
+        if setup is not None:
+            setup(sw)
+        features = len(sim.app.active.features)
+        sim.reset_stats()
+        start = time.perf_counter()
+        run(sw)
+        elapsed = time.perf_counter() - start
+    return elapsed, sim.call_count, len(sim.app.active.features) - features
+
+
+def _measure_quick(func, args: tuple) -> tuple:
+    sim = SimulatorBackend(sleep=False)
+    previous = sw_automation._default_backend
+    sw_automation.set_default_backend(sim)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.reset_stats()
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+    finally:
+        sw_automation.set_default_backend(previous)
+    return elapsed, sim.call_count, len(sim.app.active.features)
+
+
+def _measure_turbine() -> tuple:
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "turbine-blade-concept.py")
+    sim = SimulatorBackend(sleep=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run_script(path, sim)
+        elapsed = time.perf_counter() - start
+    return elapsed, sim.call_count, len(sim.app.active.features)
+
+
+def bench_budgets() -> bool:
+    """
+    Misst Zeit, API-Aufrufe und erzeugte Features jeder Operation.
+
+    Returns:
+        False, wenn eine Operation ihr Aufrufbudget überschreitet
+    """
+    rows = []
+    for case in OPERATION_CASES:
+        rows.append((case.name, case.budget) + _measure(case.run, case.setup))
+    for name, func, args, budget in QUICK_CASES:
+        rows.append((name, budget) + _measure_quick(func, args))
+    rows.append(("turbine-blade-concept.py", TURBINE_BUDGET) + _measure_turbine())
+
+    print("\nAufrufbudgets (Simulator, ohne Latenz)")
+    print(f"{'Operation':<46} {'Zeit':>10} {'Aufrufe':>8} {'Budget':>7} {'Features':>9}")
+    over = []
+    for name, budget, elapsed, calls, features in rows:
+        status = "" if calls <= budget else "  ÜBER BUDGET"
+        print(f"{name:<46} {elapsed * 1000:8.2f}ms {calls:>8} {budget:>7} {features:>9}{status}")
+        if calls > budget:
+            over.append(name)
+    if over:
+        print(f"\n{len(over)} Operation(en) über Budget: {', '.join(over)}")
+        return False
+    print(f"\nAlle {len(rows)} Operationen innerhalb des Budgets")
+    return True
+
+
+BENCHMARKS = {
+    "handle_cache": bench_handle_cache,
+    "binding": bench_binding,
+    "multiselect": bench_multiselect,
+    "geometry": bench_geometry,
+    "spline": bench_spline,
+    "decimation": bench_decimation,
+    "validation": bench_validation,
+    "parametric": bench_parametric,
+    "family": bench_family,
+    "pool": bench_pool,
+    "session": bench_session,
+    "busy": bench_busy,
+    "budgets": bench_budgets,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    failed = False
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unbekannter Benchmark: {name} (verfügbar: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        if BENCHMARKS[name]() is False:
+            failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+SolidWorks Automation - Daemon
+
+Langlebiger lokaler Prozess, der die Verbindung zu SolidWorks (COM-Dispatch,
+Dokument- und Manager-Handles) warm hält und Operationen per JSON-RPC 2.0
+über einen TCP- oder Unix-Socket entgegennimmt. Ein Kommando kostet damit
+nur noch einen Socket-Round-Trip statt Prozessstart plus Verbindungsaufbau.
+
+Protokoll: eine JSON-RPC-Nachricht pro Zeile (UTF-8, '\\n'-terminiert).
+Verbindungen werden parallel in eigenen Threads gelesen; die Anfragen selbst
+bearbeitet nur der Daemon-Thread, nacheinander - COM-Objekte bleiben so in
+ihrem Apartment, und SolidWorks arbeitet ohnehin seriell. Ein ruhender
+Client blockiert damit weder andere Clients noch shutdown; Verbindungen ohne
+Nachricht innerhalb von read_timeout werden geschlossen.
+
+Zugriff: Bei jedem Start erzeugt der Daemon ein zufälliges Token und legt es
+in einer nur für den Benutzer lesbaren Datei ab (SW_DAEMON_TOKEN_FILE,
+Standard ~/.sw_daemon_token). Die erste Nachricht jeder Verbindung muss
+"auth" mit diesem Token sein; DaemonClient liest die Datei selbst. Eine
+ungültige Nachricht oder ein falsches Token beendet die Verbindung.
+
+Methoden:
+    auth      {token}             -> true (erste Nachricht jeder Verbindung)
+    ping                          -> {"pong": true, "uptime": s}
+    status                        -> Backend, Dokument, Anzahl Anfragen, Pool-Metriken
+    execute   {ops}               -> Ergebnisse von SolidWorksAutomation.apply()
+    call      {function, args, kwargs}  -> quick_*-Funktion ausführen
+    new_part  {template}          -> Titel des neuen Dokuments
+    open      {path}              -> Titel des geöffneten Dokuments
+    save      {path}
+    close     {save}
+    reset                         -> Verbindung beim nächsten Aufruf neu aufbauen
+    shutdown
+
+Verwendung:
+    python sw_daemon.py serve [--address 127.0.0.1:47831] [--simulator] [--pool 3]
+                              [--read-timeout 300]
+    python sw_daemon.py call quick_box 100 50 30
+    python sw_daemon.py demo      # Simulator-Daemon mit Loopback-Client
+
+    from sw_daemon import DaemonClient
+    with DaemonClient() as client:
+        client.new_part()
+        client.execute([("new_sketch", ("Front",)),
+                        ("sketch.circle", (0, 0, 25)),
+                        ("end_sketch",),
+                        ("feature.extrude", (20,))])
+"""
+
+import contextlib
+import hmac
+import inspect
+import json
+import os
+import queue
+import secrets
+import select
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+
+import sw_automation
+from sw_automation import (
+    ComBackend, DeferredResult, DocumentPool, SolidWorksAutomation, SolidWorksBackend,
+    com_value, get_default_backend
+)
+
+# Standardadresse (überschreibbar per SW_DAEMON_ADDRESS, z.B. "/tmp/sw.sock")
+DEFAULT_ADDRESS = os.environ.get("SW_DAEMON_ADDRESS", "127.0.0.1:47831")
+
+# Datei mit dem Zugriffstoken des laufenden Daemons
+DEFAULT_TOKEN_FILE = os.environ.get(
+    "SW_DAEMON_TOKEN_FILE", os.path.join(os.path.expanduser("~"), ".sw_daemon_token")
+)
+
+# Sekunden ohne Nachricht, nach denen eine Verbindung geschlossen wird
+DEFAULT_READ_TIMEOUT = 300.0
+
+# Takt (Sekunden), in dem Annahme- und Daemon-Thread auf shutdown prüfen
+POLL_INTERVAL = 0.1
+
+# JSON-RPC 2.0 Fehlercodes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+OPERATION_ERROR = -32000
+UNAUTHORIZED = -32001
+
+
+def parse_address(address=None):
+    """
+    Wandelt eine Adresse in (Socket-Familie, Adresse) um.
+
+    "host:port" bzw. (host, port) -> TCP, alles andere -> Unix-Socket-Pfad.
+    """
+    address = address or DEFAULT_ADDRESS
+    if isinstance(address, tuple):
+        return socket.AF_INET, address
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return socket.AF_INET, (host, int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"Unix-Sockets werden hier nicht unterstützt: {address}")
+    return socket.AF_UNIX, address
+
+
+def write_token_file(path: str) -> str:
+    """Erzeugt ein neues Token und schreibt es nur für den Benutzer lesbar nach path."""
+    token = secrets.token_hex(32)
+    if os.path.exists(path):
+        os.remove(path)
+    # Unter Windows schützt das Benutzerprofil die Datei; dort wirkt nur das Leserecht
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def read_token_file(path: str = None) -> str:
+    """Liest das Token des laufenden Daemons."""
+    with open(path or DEFAULT_TOKEN_FILE, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _json_value(value):
+    """Macht einen Rückgabewert JSON-fähig (COM-Objekte -> None)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, DeferredResult):
+        return _json_value(value.value)
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    return None
+
+
+class DaemonError(Exception):
+    """Fehlerantwort des Daemons."""
+
+    def __init__(self, code: int, message: str, data=None):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class _WarmBackend(SolidWorksBackend):
+    """Hält das Application-Objekt eines Backends über alle Anfragen."""
+
+    def __init__(self, backend: SolidWorksBackend):
+        self.backend = backend
+        self.name = backend.name
+        self._app = None
+
+    def connect(self):
+        if self._app is None:
+            self._app = self.backend.connect()
+        return self._app
+
+    def wrap(self, obj, interface: str):
+        return self.backend.wrap(obj, interface)
+
+    def reset(self):
+        self._app = None
+
+    def close(self):
+        self._app = None
+        self.backend.close()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Liest JSON-RPC-Nachrichten zeilenweise bis zum Verbindungsende.
+
+    Die erste Nachricht muss "auth" sein; ungültige Nachrichten und falsche
+    Tokens beenden die Verbindung nach der Fehlerantwort. Läuft in einem
+    eigenen Thread je Verbindung; Anfragen gehen über submit() an den
+    Daemon-Thread.
+    """
+
+    def setup(self):
+        # StreamRequestHandler setzt damit den Socket-Timeout für Lesezugriffe
+        self.timeout = self.server.daemon.read_timeout
+        super().setup()
+
+    def handle(self):
+        daemon = self.server.daemon
+        authenticated = False
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                message, response = daemon.parse_message(line)
+                if message is not None and authenticated:
+                    response = daemon.submit(message)
+                elif message is not None:
+                    response = daemon.authenticate(message)
+                    authenticated = "error" not in response
+                if response is not None:
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                if message is None or not authenticated or daemon.stopped:
+                    break
+        except OSError:
+            pass  # Lese-Timeout oder Client hat die Verbindung abgebrochen
+
+
+class _ReusableTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _ReusableUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        allow_reuse_address = True
+        daemon_threads = True
+
+
+class SolidWorksDaemon:
+    """
+    JSON-RPC-Server mit warmer SolidWorks-Verbindung.
+
+    Args:
+        backend: Backend (Standard: set_default_backend bzw. ComBackend)
+        address: "host:port", (host, port) oder Pfad eines Unix-Sockets
+        pool_size: Leere Part-Dokumente, die für new_part bereitgehalten
+                   werden (0 = kein DocumentPool); aufgefüllt wird zwischen
+                   zwei Anfragen im Daemon-Thread
+        token_file: Datei für das Zugriffstoken (Standard: DEFAULT_TOKEN_FILE)
+        read_timeout: Sekunden ohne Nachricht, nach denen eine Verbindung
+                      geschlossen wird
+    """
+
+    def __init__(self, backend: SolidWorksBackend = None, address=None, pool_size: int = 0,
+                 token_file: str = None, read_timeout: float = DEFAULT_READ_TIMEOUT):
+        self.backend = _WarmBackend(backend or get_default_backend())
+        self.family, self.address = parse_address(address)
+        self.token_file = token_file or DEFAULT_TOKEN_FILE
+        self.read_timeout = read_timeout
+        self._token = None
+        self.started = time.time()
+        self.requests = 0
+        self.stopped = False
+        self.pool_size = pool_size
+        self._pool = None
+        self._session = None
+        self._server = None
+        self._requests = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._methods = {
+            "ping": self.rpc_ping,
+            "status": self.rpc_status,
+            "execute": self.rpc_execute,
+            "call": self.rpc_call,
+            "new_part": self.rpc_new_part,
+            "open": self.rpc_open,
+            "save": self.rpc_save,
+            "close": self.rpc_close,
+            "reset": self.rpc_reset,
+            "shutdown": self.rpc_shutdown,
+        }
+
+    # --- Sitzung -----------------------------------------------------------
+
+    @property
+    def session(self) -> SolidWorksAutomation:
+        """Warme Automations-Sitzung auf dem aktiven Dokument."""
+        if self._session is None:
+            self._session = SolidWorksAutomation(backend=self.backend)
+        else:
+            self._session.sync_document()
+        return self._session
+
+    def _app(self):
+        return self.backend.connect()
+
+    def _documents(self) -> sw_automation.DocumentManager:
+        documents = sw_automation.DocumentManager(self._app())
+        if self.pool_size and self._pool is None:
+            self._pool = DocumentPool(self._app(), self.pool_size)
+        documents.pool = self._pool
+        return documents
+
+    def idle(self):
+        """Leerlauf zwischen zwei Anfragen: füllt den DocumentPool um ein Dokument auf."""
+        if self._pool is None:
+            return
+        try:
+            self._pool.maintain(limit=1)
+        except Exception as e:
+            # z.B. SolidWorks beendet: Pool aufgeben statt jeden Takt erneut scheitern
+            print(f"DocumentPool deaktiviert: {type(e).__name__}: {e}")
+            self._pool = None
+
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    # --- RPC-Methoden ------------------------------------------------------
+
+    def rpc_ping(self):
+        return {"pong": True, "uptime": time.time() - self.started}
+
+    def rpc_status(self):
+        model = self._app().ActiveDoc
+        return {
+            "backend": self.backend.name,
+            "document": com_value(model, "GetTitle") if model else None,
+            "requests": self.requests,
+            "uptime": time.time() - self.started,
+            "pool": self._pool.metrics() if self._pool is not None else None,
+        }
+
+    def rpc_execute(self, ops: list, flush: bool = True):
+        sw = self.session
+        results = sw.apply(ops)
+        if flush:
+            sw.flush()
+        return _json_value(results)
+
+    def rpc_call(self, function: str, args: list = (), kwargs: dict = None):
+        if not function.startswith("quick_") or not hasattr(sw_automation, function):
+            raise DaemonError(METHOD_NOT_FOUND, f"Unbekannte Funktion: {function}")
+        previous = sw_automation._default_backend
+        sw_automation.set_default_backend(self.backend)
+        try:
+            getattr(sw_automation, function)(*args, **(kwargs or {}))
+        finally:
+            sw_automation.set_default_backend(previous)
+        return self.rpc_status()["document"]
+
+    def rpc_new_part(self, template: str = None):
+        model = self._documents().new_part(template)
+        return com_value(model, "GetTitle") if model else None
+
+    def rpc_open(self, path: str):
+        model = sw_automation.DocumentManager(self._app()).open(path)
+        return com_value(model, "GetTitle") if model else None
+
+    def rpc_save(self, path: str = None):
+        self.session.save(path)
+        return path
+
+    def rpc_close(self, save: bool = False):
+        if self._session is not None:
+            self._session.flush()
+        sw_automation.DocumentManager(self._app()).close(save)
+        self._session = None
+
+    def rpc_reset(self):
+        self._session = None
+        self._close_pool()
+        self.backend.reset()
+
+    def rpc_shutdown(self):
+        self.stopped = True
+        self._close_pool()
+
+    # --- Protokoll ---------------------------------------------------------
+
+    def parse_message(self, line: bytes):
+        """
+        Dekodiert eine Zeile.
+
+        Returns:
+            (Nachricht, None) oder (None, Fehlerantwort)
+        """
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            return None, self._error(None, PARSE_ERROR, f"Ungültiges JSON: {e}")
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return None, self._error(None, INVALID_REQUEST, "Ungültige Anfrage")
+        return message, None
+
+    def authenticate(self, message: dict) -> dict:
+        """Prüft die auth-Nachricht einer neuen Verbindung."""
+        request_id = message.get("id")
+        params = message.get("params")
+        token = params.get("token") if isinstance(params, dict) else None
+        if (message["method"] != "auth" or not isinstance(token, str) or self._token is None
+                or not hmac.compare_digest(token, self._token)):
+            return self._error(request_id, UNAUTHORIZED, "Nicht autorisiert")
+        return {"jsonrpc": "2.0", "id": request_id, "result": True}
+
+    def submit(self, message: dict):
+        """
+        Übergibt eine Nachricht an den Daemon-Thread und wartet auf die Antwort.
+
+        Wird aus den Verbindungs-Threads aufgerufen; nur der Daemon-Thread
+        ruft handle_message() auf.
+        """
+        future = Future()
+        with self._submit_lock:
+            if self.stopped:
+                return self._error(message.get("id"), OPERATION_ERROR, "Daemon wird beendet")
+            self._requests.put((message, future))
+        return future.result()
+
+    def handle_message(self, message: dict):
+        """Bearbeitet eine dekodierte JSON-RPC-Nachricht und gibt die Antwort zurück."""
+        request_id = message.get("id")
+        method = self._methods.get(message["method"])
+        if method is None:
+            return self._error(request_id, METHOD_NOT_FOUND,
+                               f"Unbekannte Methode: {message['method']}")
+        params = message.get("params") or {}
+        try:
+            if isinstance(params, list):
+                bound = inspect.signature(method).bind(*params)
+            else:
+                bound = inspect.signature(method).bind(**params)
+        except TypeError as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+
+        self.requests += 1
+        try:
+            result = method(*bound.args, **bound.kwargs)
+        except DaemonError as e:
+            return self._error(request_id, e.code, e.message, e.data)
+        except Exception as e:
+            # Fehlgeschlagene Operation: Sitzung verwerfen, Verbindung bleibt warm
+            self._session = None
+            return self._error(request_id, OPERATION_ERROR, f"{type(e).__name__}: {e}",
+                               traceback.format_exc())
+        if request_id is None:
+            return None  # Notification
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str, data=None) -> dict:
+        error = {"code": code, "message": message}
+        if data is not None:
+            error["data"] = data
+        return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+    # --- Server ------------------------------------------------------------
+
+    def bind(self):
+        """Öffnet den Socket und schreibt ein neues Token (ohne Anfragen zu bearbeiten)."""
+        if self.family == socket.AF_INET:
+            server_class = _ReusableTCPServer
+        else:
+            server_class = _ReusableUnixServer
+            if os.path.exists(self.address):
+                os.remove(self.address)
+        self._token = write_token_file(self.token_file)
+        self._server = server_class(self.address, _RequestHandler)
+        self._server.daemon = self
+        self.address = self._server.server_address
+        return self
+
+    def serve_forever(self):
+        """
+        Bearbeitet Anfragen bis zum Aufruf von shutdown.
+
+        Verbindungen werden in Hintergrund-Threads angenommen und gelesen;
+        der aufrufende Thread führt die Anfragen nacheinander aus.
+        """
+        if self._server is None:
+            self.bind()
+        print(f"SolidWorks-Daemon bereit: {self.address} ({self.backend.name})")
+        acceptor = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL,),
+                                    name="sw-daemon-accept", daemon=True)
+        acceptor.start()
+        try:
+            while not self.stopped:
+                try:
+                    message, future = self._requests.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    self.idle()
+                    continue
+                future.set_result(self.handle_message(message))
+        finally:
+            self.stopped = True
+            with self._submit_lock:
+                # Noch wartende Verbindungen nicht hängen lassen
+                while not self._requests.empty():
+                    message, future = self._requests.get()
+                    future.set_result(self._error(message.get("id"), OPERATION_ERROR,
+                                                  "Daemon wird beendet"))
+            self._server.shutdown()
+            self._server.server_close()
+            if self.family != socket.AF_INET and os.path.exists(self.address):
+                os.remove(self.address)
+            # Nur das eigene Token entfernen (nicht das eines neueren Daemons)
+            with contextlib.suppress(OSError):
+                if read_token_file(self.token_file) == self._token:
+                    os.remove(self.token_file)
+            print("SolidWorks-Daemon beendet")
+
+
+class DaemonClient:
+    """
+    Client für den SolidWorks-Daemon (eine dauerhafte Verbindung).
+
+    Args:
+        address: Adresse des Daemons (Standard: DEFAULT_ADDRESS)
+        timeout: Socket-Timeout in Sekunden
+        token: Zugriffstoken (Standard: aus token_file gelesen)
+        token_file: Tokendatei des Daemons (Standard: DEFAULT_TOKEN_FILE)
+    """
+
+    def __init__(self, address=None, timeout: float = 60.0, token: str = None,
+                 token_file: str = None):
+        self.family, self.address = parse_address(address)
+        self.timeout = timeout
+        self.token = token
+        self.token_file = token_file
+        self._socket = None
+        self._file = None
+        self._next_id = 0
+
+    def connect(self):
+        if self._socket is None:
+            self._socket = socket.socket(self.family, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.address)
+            self._file = self._socket.makefile("rwb")
+            try:
+                self._send("auth", {"token": self.token or read_token_file(self.token_file)})
+            except Exception:
+                self.close()
+                raise
+        return self
+
+    def request(self, method: str, **params):
+        """Sendet eine Anfrage und gibt das Ergebnis zurück (oder wirft DaemonError)."""
+        if self._socket is not None and self._closed_by_daemon():
+            self.close()  # nach read_timeout geschlossen: neu verbinden
+        self.connect()
+        return self._send(method, params)
+
+    def _closed_by_daemon(self) -> bool:
+        """True, wenn der Daemon die ruhende Verbindung inzwischen beendet hat."""
+        readable, _, _ = select.select([self._socket], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self._socket.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _send(self, method: str, params: dict):
+        self._next_id += 1
+        message = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self._file.write(json.dumps(message).encode("utf-8") + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Daemon hat die Verbindung geschlossen")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            if error["code"] in (PARSE_ERROR, INVALID_REQUEST, UNAUTHORIZED):
+                self.close()  # Daemon hat die Verbindung beendet
+            raise DaemonError(error["code"], error["message"], error.get("data"))
+        return response["result"]
+
+    def ping(self) -> dict:
+        return self.request("ping")
+
+    def status(self) -> dict:
+        return self.request("status")
+
+    def execute(self, ops: list, flush: bool = True) -> list:
+        return self.request("execute", ops=[list(op) for op in ops], flush=flush)
+
+    def quick(self, function: str, *args, **kwargs):
+        return self.request("call", function=function, args=list(args), kwargs=kwargs)
+
+    def new_part(self, template: str = None):
+        return self.request("new_part", template=template)
+
+    def open(self, path: str):
+        return self.request("open", path=path)
+
+    def save(self, path: str = None):
+        return self.request("save", path=path)
+
+    def close_document(self, save: bool = False):
+        return self.request("close", save=save)
+
+    def shutdown(self):
+        try:
+            self.request("shutdown")
+        finally:
+            self.close()
+
+    def close(self):
+        """Schließt die Verbindung zum Daemon."""
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = self._file = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _cli_value(text: str):
+    """Kommandozeilenargument als JSON-Wert, sonst als String."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _demo():
+    """Vergleicht kalte Aufrufe mit Aufrufen über einen Simulator-Daemon."""
+    import tempfile
+    from sw_simulator import SimulatorBackend
+
+    ops = [("new_sketch", ("Front",)),
+           ("sketch.rectangle_centered", (100, 50)),
+           ("end_sketch",),
+           ("feature.extrude", (30,))]
+    runs = 20
+    latency = 0.002
+    devnull = open(os.devnull, "w")
+
+    print("=" * 60)
+    print(f"SolidWorks Daemon - {runs} Kommandos, {latency * 1000:.0f} ms / Aufruf")
+    print("=" * 60)
+
+    # Kalt: pro Kommando neue Verbindung und neue Sitzung
+    stdout, sys.stdout = sys.stdout, devnull
+    sim = SimulatorBackend(latency=latency)
+    start = time.perf_counter()
+    for _ in range(runs):
+        SolidWorksAutomation(backend=sim).apply(ops)
+    cold = time.perf_counter() - start
+    cold_calls = sim.call_count
+    sys.stdout = stdout
+
+    # Warm: Daemon im Hintergrund, Loopback-Client
+    sim = SimulatorBackend(latency=latency)
+    token_file = os.path.join(tempfile.mkdtemp(prefix="sw_daemon_"), "token")
+    daemon = SolidWorksDaemon(sim, address="127.0.0.1:0", token_file=token_file).bind()
+    stdout, sys.stdout = sys.stdout, devnull
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    with DaemonClient(daemon.address, token_file=token_file) as client:
+        client.execute(ops)  # Verbindung aufwärmen
+        sim.reset_stats()
+        start = time.perf_counter()
+        for _ in range(runs):
+            client.execute(ops)
+        warm = time.perf_counter() - start
+        warm_calls = sim.call_count
+        try:
+            client.execute([("_connection.model",)])
+        except DaemonError as e:
+            error = e
+        client.shutdown()
+    thread.join()
+    sys.stdout = stdout
+
+    print(f"{'kalt':<8} {cold_calls:>6} Aufrufe  {cold / runs * 1000:7.2f} ms / Kommando")
+    print(f"{'Daemon':<8} {warm_calls:>6} Aufrufe  {warm / runs * 1000:7.2f} ms / Kommando")
+    print(f"Fehlerantwort: {error}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SolidWorks-Daemon (JSON-RPC)")
+    parser.add_argument("command", choices=["serve", "call", "demo"])
+    parser.add_argument("args", nargs="*", help="call: Funktion und Argumente")
+    parser.add_argument("--address", default=None, help="host:port oder Socket-Pfad")
+    parser.add_argument("--simulator", action="store_true", help="Simulator statt COM")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulator-Latenz pro Aufruf (s)")
+    parser.add_argument("--pool", type=int, default=0,
+                        help="Leere Part-Dokumente zwischen Anfragen bereithalten")
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                        help="Ruhende Verbindungen nach so vielen Sekunden schließen")
+    options = parser.parse_args()
+
+    if options.command == "serve":
+        if options.simulator:
+            from sw_simulator import SimulatorBackend
+            backend = SimulatorBackend(latency=options.latency)
+        else:
+            backend = ComBackend()
+        SolidWorksDaemon(backend, options.address, options.pool,
+                         read_timeout=options.read_timeout).serve_forever()
+    elif options.command == "call":
+        if not options.args:
+            parser.error("call benötigt einen Funktionsnamen")
+        function, *values = options.args
+        with DaemonClient(options.address) as client:
+            print(client.quick(function, *[_cli_value(v) for v in values]))
+    else:
+        _demo()
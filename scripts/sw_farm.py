@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+SolidWorks Automation - Worker-Farm
+
+Verteilt unabhängige Teile-Jobs auf mehrere SolidWorks-Instanzen. Jeder
+Worker-Prozess besitzt ein eigenes Backend; für COM ist das eine per
+DispatchEx gestartete, eigene SolidWorks-Instanz (ComBackend(new_instance=True)).
+Ein einzelner SolidWorks-Prozess arbeitet Aufrufe seriell ab - parallele
+Durchsatzsteigerung gibt es nur über mehrere Instanzen.
+
+Verwendung:
+    from sw_farm import Job, SolidWorksFarm
+
+    jobs = [Job("quick_box", 100, 50, t, path=f"C:/out/box_{t}.sldprt")
+            for t in (10, 20, 30)]
+    with SolidWorksFarm(workers=3) as farm:
+        for result in farm.run(jobs):
+            print(result)
+
+Instanzen, die über tausende Jobs Speicher und Handles ansammeln, werden
+über eine RecyclePolicy neu gestartet:
+    farm = SolidWorksFarm(workers=3, recycle=RecyclePolicy(max_rss_mb=6000,
+                                                           max_gdi=8000))
+
+Ohne SolidWorks (z.B. unter Linux) mit dem Simulator:
+    python sw_farm.py
+"""
+
+import contextlib
+import functools
+import os
+import statistics
+import sys
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+import sw_automation
+from sw_automation import (
+    RPC_E_DISCONNECTED, RPC_S_CALL_FAILED, RPC_S_SERVER_UNAVAILABLE, ComBackend,
+    DocumentManager, SolidWorksAutomation
+)
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+
+# Zustand des aktuellen Worker-Prozesses (von _init_worker gesetzt)
+_worker = {"supervisor": None, "jobs": 0}
+
+# Fehler, nach denen die Instanz als abgestürzt gilt
+INSTANCE_LOST = (RPC_S_SERVER_UNAVAILABLE, RPC_S_CALL_FAILED, RPC_E_DISCONNECTED)
+
+
+def instance_lost(error: Exception) -> bool:
+    """
+    True, wenn error eine abgestürzte oder beendete Instanz meldet.
+
+    Abweisungen einer beschäftigten Instanz (RPC_E_CALL_REJECTED) und
+    andere COM-Fehler zählen nicht dazu.
+    """
+    if getattr(error, "hresult", None) in INSTANCE_LOST:
+        return True
+    psutil = sw_automation.psutil
+    return psutil is not None and isinstance(error, psutil.NoSuchProcess)
+
+
+class Job:
+    """
+    Ein Teile-Job für die Farm.
+
+    Args:
+        func: Name einer Funktion aus sw_automation (z.B. "quick_box") oder
+              eine Funktion auf Modulebene (muss pickle-bar sein)
+        *args, **kwargs: Argumente für func
+        path: Optionaler Speicherpfad; wird als path=... an func übergeben
+        template: Optionales Part-Template für das neue Dokument
+    """
+
+    def __init__(self, func, *args, path: str = None, template: str = None, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.path = path
+        self.template = template
+        self.ops = None
+
+    @classmethod
+    def script(cls, ops: list, path: str = None, template: str = None):
+        """
+        Erzeugt einen Job aus einer Operationsliste.
+
+        Args:
+            ops: Liste von (methode, args, kwargs), siehe
+                 SolidWorksAutomation.apply()
+            path: Optionaler Speicherpfad
+            template: Optionales Part-Template
+        """
+        job = cls(None, path=path, template=template)
+        job.ops = list(ops)
+        return job
+
+    @property
+    def label(self) -> str:
+        if self.ops is not None:
+            return f"script[{len(self.ops)}]"
+        name = self.func if isinstance(self.func, str) else self.func.__name__
+        return f"{name}{self.args}"
+
+    def execute(self):
+        """Führt den Job im aktuellen Prozess aus."""
+        if self.ops is not None:
+            sw = SolidWorksAutomation()
+            sw.apply(self.ops)
+            sw.save(self.path)
+            return self.path
+
+        func = getattr(sw_automation, self.func) if isinstance(self.func, str) else self.func
+        kwargs = dict(self.kwargs)
+        if self.path is not None:
+            kwargs["path"] = self.path
+        func(*self.args, **kwargs)
+        return self.path
+
+    def __repr__(self):
+        return f"Job({self.label}, path={self.path!r})"
+
+
+class JobResult:
+    """Ergebnis eines Jobs (Erfolg oder Fehler)."""
+
+    def __init__(self, index: int, job: Job, ok: bool, value=None, error: str = None,
+                 details: str = None, worker: int = None, seconds: float = 0.0):
+        self.index = index
+        self.job = job
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.details = details
+        self.worker = worker
+        self.seconds = seconds
+        self.attempts = 1
+        self.recycled = None
+
+    def __repr__(self):
+        status = "OK" if self.ok else f"FEHLER {self.error}"
+        if self.attempts > 1:
+            status += f", {self.attempts} Versuche"
+        return (f"JobResult(#{self.index} {self.job.label}: {status}, "
+                f"worker={self.worker}, {self.seconds * 1000:.1f} ms)")
+
+
+class RecyclePolicy:
+    """
+    Schwellwerte für den Neustart einer SolidWorks-Instanz.
+
+    Eine lange laufende Instanz wird mit wachsendem Speicher und wachsender
+    GDI-/USER-Handle-Zahl langsamer (und scheitert bei 10000 GDI-Objekten
+    hart). Gemessen wird nach jeweils sample_every Jobs.
+
+    Args:
+        max_rss_mb: Höchster Arbeitsspeicher des Prozesses (MB)
+        max_handles: Höchstzahl Kernel-Handles
+        max_gdi: Höchstzahl GDI-Objekte
+        max_user: Höchstzahl USER-Objekte
+        slowdown: Neustart, wenn der Median der letzten window Jobs das
+                  slowdown-fache des Medians der ersten window Jobs nach dem
+                  Start erreicht (None = Latenz nicht überwachen)
+        window: Jobs pro Latenzfenster
+        sample_every: Messintervall in Jobs
+    """
+
+    def __init__(self, max_rss_mb: float = None, max_handles: int = None,
+                 max_gdi: int = None, max_user: int = None, slowdown: float = None,
+                 window: int = 20, sample_every: int = 10):
+        self.max_rss_mb = max_rss_mb
+        self.max_handles = max_handles
+        self.max_gdi = max_gdi
+        self.max_user = max_user
+        self.slowdown = slowdown
+        self.window = window
+        self.sample_every = sample_every
+
+    def check(self, sample, baseline: list, recent) -> str:
+        """
+        Prüft Messwerte und Job-Latenzen.
+
+        Args:
+            sample: ProcessSample (None = Prozess nicht messbar)
+            baseline: Laufzeiten der ersten Jobs nach dem Start (s)
+            recent: Laufzeiten der letzten Jobs (s)
+
+        Returns:
+            Grund für einen Neustart oder None
+        """
+        if sample is not None:
+            if self.max_rss_mb and sample.rss > self.max_rss_mb * 1024 ** 2:
+                return f"Speicher {sample.rss / 1024 ** 2:.0f} MB > {self.max_rss_mb:.0f} MB"
+            limits = (("Handles", sample.handles, self.max_handles),
+                      ("GDI-Objekte", sample.gdi, self.max_gdi),
+                      ("USER-Objekte", sample.user, self.max_user))
+            for label, value, limit in limits:
+                if limit and value is not None and value > limit:
+                    return f"{label} {value} > {limit}"
+        if (self.slowdown and len(baseline) >= self.window
+                and len(recent) >= self.window):
+            before = statistics.median(baseline)
+            after = statistics.median(recent)
+            if before > 0 and after >= self.slowdown * before:
+                return f"Latenz {after * 1000:.1f} ms = {after / before:.1f}x Startwert"
+        return None
+
+
+class InstanceSupervisor:
+    """
+    Überwacht die SolidWorks-Instanz eines Workers und startet sie neu.
+
+    Misst nach jeweils policy.sample_every Jobs den Prozess
+    (backend.process_sample) und startet bei überschrittenen Schwellwerten
+    zwischen zwei Jobs eine frische Instanz. Scheitert ein Job und ist die
+    Instanz danach nicht mehr erreichbar (Absturz, siehe instance_lost), wird
+    neu gestartet und der Job bis zu replays-mal wiederholt. Eine nur
+    beschäftigte Instanz wird nicht neu gestartet.
+
+    Sinnvoll nur mit eigenen Instanzen (ComBackend(new_instance=True) oder
+    Simulator) - eine per Dispatch geteilte Instanz wird nicht beendet.
+
+    Args:
+        backend_factory: Fabrik für ein frisches Backend
+        policy: RecyclePolicy (None = nur Absturzbehandlung)
+        replays: Wiederholungen eines Jobs nach einem Absturz
+    """
+
+    def __init__(self, backend_factory, policy: RecyclePolicy = None, replays: int = 1):
+        self.backend_factory = backend_factory
+        self.policy = policy or RecyclePolicy()
+        self.replays = replays
+        self.backend = None
+        self.app = None
+        self.jobs = 0
+        self.restarts = 0
+        self.replayed = 0
+        self.reasons = Counter()
+        self.sample = None
+        self._since_start = 0
+        self._baseline = []
+        self._recent = deque(maxlen=self.policy.window)
+
+    def start(self):
+        """Startet das Backend (falls noch nicht geschehen)."""
+        if self.backend is None:
+            self.backend = self.backend_factory()
+            sw_automation.set_default_backend(self.backend)
+            self.app = self.backend.connect()
+            self._since_start = 0
+            self._baseline = []
+            self._recent.clear()
+        return self
+
+    def restart(self, reason: str):
+        """Beendet die Instanz und startet eine frische."""
+        print(f"Instanz wird neu gestartet: {reason}")
+        self._stop()
+        self.restarts += 1
+        self.reasons[reason.split()[0]] += 1
+        self.start()
+
+    def _stop(self):
+        backend, self.backend, self.app = self.backend, None, None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception as e:
+                print(f"Warnung: Instanz ließ sich nicht beenden: {e}")
+
+    def close(self):
+        """Beendet die Instanz."""
+        self._stop()
+
+    def alive(self) -> bool:
+        """True, wenn die Instanz noch erreichbar ist (auch wenn sie gerade abweist)."""
+        try:
+            self.app.RevisionNumber()
+        except Exception as e:
+            return not instance_lost(e)
+        return True
+
+    def run(self, index: int, job: Job) -> JobResult:
+        """Führt einen Job aus; nach einem Absturz wird er wiederholt."""
+        self.start()
+        attempts = 0
+        while True:
+            attempts += 1
+            result = _execute(index, job, self.app)
+            if result.ok or self.alive():
+                break
+            self.restart(f"Absturz in {job.label}")
+            if attempts > self.replays:
+                break
+            self.replayed += 1
+        result.attempts = attempts
+        self.jobs += 1
+        self._since_start += 1
+        if result.ok:
+            if len(self._baseline) < self.policy.window:
+                self._baseline.append(result.seconds)
+            self._recent.append(result.seconds)
+        if self._since_start % self.policy.sample_every == 0:
+            result.recycled = self.check()
+        return result
+
+    def check(self) -> str:
+        """Misst den Prozess und startet bei Bedarf neu (Grund oder None)."""
+        try:
+            self.sample = self.backend.process_sample(self.app)
+        except Exception as e:
+            self.sample = None
+            if not instance_lost(e):
+                # Beschäftigt o.ä.: beim nächsten Messpunkt erneut versuchen
+                return None
+            reason = "Absturz (Messung fehlgeschlagen)"
+        else:
+            reason = self.policy.check(self.sample, self._baseline, self._recent)
+        if reason:
+            self.restart(reason)
+        return reason
+
+    def stats(self) -> dict:
+        """Zähler des Supervisors."""
+        return {
+            "jobs": self.jobs,
+            "restarts": self.restarts,
+            "replayed": self.replayed,
+            "reasons": dict(self.reasons),
+            "sample": self.sample,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(backend_factory, quiet: bool = False, recycle: RecyclePolicy = None):
+    """Initialisiert einen Worker-Prozess mit eigenem Backend."""
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    if pythoncom is not None:
+        pythoncom.CoInitialize()
+    supervisor = InstanceSupervisor(backend_factory, recycle)
+    _worker["supervisor"] = supervisor.start()
+    _worker["jobs"] = 0
+    # Eigene SolidWorks-Instanz beim Beenden des Workers schließen
+    util.Finalize(supervisor, supervisor.close, exitpriority=10)
+
+
+def _run_job(index: int, job: Job) -> JobResult:
+    """Führt einen Job über den Supervisor des Workers aus."""
+    _worker["jobs"] += 1
+    return _worker["supervisor"].run(index, job)
+
+
+def _execute(index: int, job: Job, app) -> JobResult:
+    """Führt einen Job in einem frischen Part-Dokument aus."""
+    start = time.perf_counter()
+    model = None
+    try:
+        model = DocumentManager(app).new_part(job.template)
+        value = job.execute()
+        result = JobResult(index, job, True, value=value)
+    except Exception as e:
+        result = JobResult(index, job, False, error=f"{type(e).__name__}: {e}",
+                           details=traceback.format_exc())
+    finally:
+        # Dokument schließen, damit die Instanz nicht mit jedem Job wächst
+        if model:
+            try:
+                app.CloseDoc(sw_automation.com_value(model, "GetTitle"))
+            except Exception:
+                pass
+    result.worker = os.getpid()
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+class SolidWorksFarm:
+    """
+    Prozess-Pool mit einer SolidWorks-Instanz pro Worker.
+
+    Args:
+        workers: Anzahl Worker-Prozesse (= SolidWorks-Instanzen)
+        backend_factory: Pickle-bare Fabrik für das Worker-Backend
+                         (Standard: ComBackend(new_instance=True))
+        jobs_per_worker: Worker nach so vielen Jobs neu starten
+                         (None = nie)
+        quiet: True = Statusausgaben der Worker unterdrücken
+        recycle: RecyclePolicy für den Neustart der SolidWorks-Instanz
+                 innerhalb eines Workers (None = nur nach Absturz)
+    """
+
+    def __init__(self, workers: int = 2, backend_factory=None, jobs_per_worker: int = None,
+                 quiet: bool = False, recycle: RecyclePolicy = None):
+        self.workers = workers
+        self.quiet = quiet
+        self.backend_factory = backend_factory or functools.partial(ComBackend, new_instance=True)
+        self.jobs_per_worker = jobs_per_worker
+        self.recycle = recycle
+        self._pool = None
+
+    def start(self):
+        """Startet die Worker-Prozesse (geschieht sonst beim ersten Job)."""
+        if self._pool is None:
+            kwargs = {}
+            if self.jobs_per_worker:
+                kwargs["max_tasks_per_child"] = self.jobs_per_worker
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.backend_factory, self.quiet, self.recycle),
+                **kwargs,
+            )
+            print(f"Farm gestartet: {self.workers} Worker")
+        return self
+
+    def submit(self, job: Job, index: int = 0):
+        """Reicht einen einzelnen Job ein und gibt ein Future zurück."""
+        self.start()
+        return self._pool.submit(_run_job, index, job)
+
+    def run(self, jobs: list) -> list:
+        """
+        Führt alle Jobs aus und gibt die Ergebnisse in Job-Reihenfolge zurück.
+
+        Fehler einzelner Jobs brechen die Farm nicht ab, sondern stehen als
+        JobResult(ok=False) in der Liste.
+        """
+        futures = [self.submit(job, i) for i, job in enumerate(jobs)]
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # Worker-Prozess abgestürzt (z.B. BrokenProcessPool)
+                results.append(JobResult(i, jobs[i], False, error=f"{type(e).__name__}: {e}"))
+        failed = sum(1 for r in results if not r.ok)
+        print(f"Farm: {len(results) - failed}/{len(results)} Jobs erfolgreich")
+        return results
+
+    def close(self):
+        """Beendet alle Worker (und deren SolidWorks-Instanzen)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def simulator_factory(latency: float = 0.005, **kwargs):
+    """Fabrik für Simulator-Worker (Tests ohne SolidWorks)."""
+    from sw_simulator import SimulatorBackend
+    return functools.partial(SimulatorBackend, latency=latency, **kwargs)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SolidWorks Farm - Durchsatz mit Simulator-Workern (5 ms / Aufruf)")
+    print("=" * 60)
+
+    jobs = [Job("quick_box", 100, 50, 10 + i) for i in range(16)]
+    jobs.append(Job.script([("new_sketch", ("Front",)),
+                            ("sketch.circle", (0, 0, 25)),
+                            ("end_sketch",),
+                            ("feature.extrude", (20,))]))
+    jobs.append(Job("quick_sphere", 10))  # existiert nicht -> Fehler-Ergebnis
+    for workers in (1, 2, 4):
+        farm = SolidWorksFarm(workers, backend_factory=simulator_factory(), quiet=True)
+        start = time.perf_counter()
+        with farm:
+            results = farm.run(jobs)
+        elapsed = time.perf_counter() - start
+        ok = sum(1 for r in results if r.ok)
+        print(f"{workers} Worker: {ok}/{len(results)} Jobs  {elapsed:6.2f} s  "
+              f"{len(results) / elapsed:6.1f} Jobs/s")
+    for result in results:
+        if not result.ok:
+            print(f"Fehler in {result.job}: {result.error}")
+
+    print()
+    print("=" * 60)
+    print("Instanz-Recycling - Simulator mit Speicherleck (Absturz bei 2 GB)")
+    print("=" * 60)
+
+    leaky = simulator_factory(latency=0.0002, process={
+        "leak_mb": 15, "leak_handles": 40, "slowdown_mb": 300, "crash_mb": 2000})
+    policies = [
+        ("ohne Policy", None),
+        ("max_rss_mb=1200", RecyclePolicy(max_rss_mb=1200)),
+        ("slowdown=1.5", RecyclePolicy(slowdown=1.5, window=10, sample_every=5)),
+    ]
+    for label, policy in policies:
+        supervisor = InstanceSupervisor(leaky, policy)
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            with supervisor:
+                results = [supervisor.run(i, Job("quick_box", 100, 50, 10))
+                           for i in range(200)]
+        elapsed = time.perf_counter() - start
+        stats = supervisor.stats()
+        ok = sum(1 for r in results if r.ok)
+        print(f"{label:<18} {ok}/{len(results)} Jobs  {elapsed:5.2f} s  "
+              f"Neustarts {stats['restarts']} {stats['reasons']}  "
+              f"wiederholt {stats['replayed']}")
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+SolidWorks Automation - COM-Profiler
+
+Opt-in-Profiler für API-Aufrufe. Ein ProfilingBackend legt einen Proxy um
+alle von SolidWorks gelieferten Objekte und misst jeden Methodenaufruf und
+jeden Eigenschaftszugriff. Solange der Profiler aktiv ist, werden zusätzlich
+die öffentlichen Methoden von SketchOperations, FeatureOperations,
+SelectionHelper, DocumentManager, SolidWorksAutomation und die quick_*-
+Funktionen instrumentiert: jeder API-Aufruf wird der aufrufenden Operation
+(z.B. FeatureOperations.circular_hole_pattern) zugeordnet, und die
+Python-Zeit einer Operation ergibt sich als Wandzeit minus API-Zeit.
+
+Verwendung:
+    from sw_profiler import ComProfiler
+
+    profiler = ComProfiler()
+    sw = SolidWorksAutomation(backend=profiler.backend(ComBackend()))
+    with profiler:
+        sw.feature.circular_hole_pattern(8, 10, 120, 20)
+    print(profiler.report())
+    profiler.save("trace.json")               # Chrome-Trace (chrome://tracing)
+    profiler.save("profile.speedscope.json")  # speedscope.app
+
+Ohne SolidWorks:
+    python sw_profiler.py [--trace datei.json]
+"""
+
+import functools
+import inspect
+import json
+import math
+import time
+from collections import defaultdict
+
+import sw_automation
+from sw_automation import SolidWorksBackend, get_default_backend
+
+# Werte, die nicht in einen Proxy verpackt werden
+_VALUE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+# Interface der von einer Eigenschaft/Methode gelieferten Objekte
+_CHILD_INTERFACES = {
+    "ActiveDoc": "IModelDoc2",
+    "NewDocument": "IModelDoc2",
+    "NewPart": "IModelDoc2",
+    "NewAssembly": "IModelDoc2",
+    "OpenDoc6": "IModelDoc2",
+    "SketchManager": "ISketchManager",
+    "FeatureManager": "IFeatureManager",
+    "SelectionManager": "ISelectionMgr",
+    "Extension": "IModelDocExtension",
+    "ActiveView": "IModelView",
+    "ActiveSketch": "ISketch",
+    "GetBodies2": "IBody2",
+    "GetEdges": "IEdge",
+    "GetFaces": "IFace2",
+}
+
+# Klassen, deren öffentliche Methoden als Operationen gelten
+_OPERATION_CLASSES = (
+    "SketchOperations", "FeatureOperations", "SelectionHelper",
+    "DocumentManager", "SolidWorksAutomation",
+)
+
+
+def _percentile(values: list, q: float) -> float:
+    """Perzentil (Nearest-Rank) einer sortierten Liste."""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(q / 100 * len(values)) - 1)
+    return values[index]
+
+
+def _is_method(value) -> bool:
+    """True für (gebundene) Methoden - COM-Objekte selbst sind oft auch callable."""
+    return inspect.ismethod(value) or inspect.isfunction(value) or inspect.isbuiltin(value)
+
+
+def _unwrap(obj):
+    """Gibt das Objekt hinter einem Proxy zurück (auch in Listen, z.B. MultiSelect2)."""
+    if isinstance(obj, _ProfiledObject):
+        return obj.__dict__["_target"]
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_unwrap(v) for v in obj)
+    return obj
+
+
+class _ProfiledOle:
+    """Zeitmessender Wrapper um _oleobj_ (für CachedDispatch mit DISPIDs)."""
+
+    def __init__(self, ole, proxy):
+        self._ole = ole
+        self._proxy = proxy
+        self._names = {}
+
+    def GetIDsOfNames(self, name: str):
+        profiler = self._proxy.__dict__["_profiler"]
+        start = time.perf_counter()
+        dispid = self._ole.GetIDsOfNames(name)
+        profiler.record(f"{self._proxy.__dict__['_iface']}.GetIDsOfNames", start)
+        self._names[dispid] = name
+        return dispid
+
+    def Invoke(self, dispid: int, *args):
+        profiler = self._proxy.__dict__["_profiler"]
+        name = self._names.get(dispid, f"DISPID{dispid}")
+        start = time.perf_counter()
+        try:
+            return self._ole.Invoke(dispid, *args)
+        finally:
+            profiler.record(f"{self._proxy.__dict__['_iface']}.{name}", start)
+
+
+class _ProfiledObject:
+    """Proxy um ein SolidWorks-Objekt, der jeden Zugriff misst."""
+
+    def __init__(self, target, profiler, iface: str):
+        self.__dict__["_target"] = target
+        self.__dict__["_profiler"] = profiler
+        self.__dict__["_iface"] = iface
+
+    def __getattr__(self, name: str):
+        target = self.__dict__["_target"]
+        profiler = self.__dict__["_profiler"]
+        if name.startswith("_"):
+            if name == "_oleobj_" and getattr(type(target), "_prop_map_get_", None) is None:
+                # Dynamisches Dispatch: CachedDispatch ruft über die DISPID auf
+                ole = self.__dict__.get("_ole")
+                if ole is None:
+                    ole = self.__dict__["_ole"] = _ProfiledOle(target._oleobj_, self)
+                return ole
+            if name == "_get_good_object_":
+                return lambda value: profiler.wrap(target._get_good_object_(value), "IDispatch")
+            raise AttributeError(name)
+
+        method = f"{self.__dict__['_iface']}.{name}"
+        start = time.perf_counter()
+        value = getattr(target, name)
+        if not _is_method(value):
+            profiler.record(method, start)
+            return profiler.wrap(value, _CHILD_INTERFACES.get(name, name))
+
+        lookup = time.perf_counter() - start
+
+        def call(*args, **kwargs):
+            begin = time.perf_counter()
+            try:
+                result = value(*[_unwrap(a) for a in args], **kwargs)
+            finally:
+                profiler.record(method, begin - lookup)
+            return profiler.wrap(result, _CHILD_INTERFACES.get(name, "IDispatch"))
+        return call
+
+    def __setattr__(self, name: str, value):
+        profiler = self.__dict__["_profiler"]
+        start = time.perf_counter()
+        try:
+            setattr(self.__dict__["_target"], name, _unwrap(value))
+        finally:
+            profiler.record(f"{self.__dict__['_iface']}.{name} (set)", start)
+
+    def __eq__(self, other):
+        return self.__dict__["_target"] == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self.__dict__["_target"])
+
+    def __repr__(self):
+        return f"<profiled {self.__dict__['_iface']} {self.__dict__['_target']!r}>"
+
+
+class ProfilingBackend(SolidWorksBackend):
+    """
+    Backend-Wrapper, der alle API-Objekte durch Mess-Proxys ersetzt.
+
+    Args:
+        backend: Eigentliches Backend (ComBackend, SimulatorBackend, ...)
+        profiler: ComProfiler, der die Messwerte sammelt
+    """
+
+    def __init__(self, backend: SolidWorksBackend, profiler: "ComProfiler"):
+        self.backend = backend
+        self.profiler = profiler
+        self.name = backend.name
+
+    def connect(self):
+        start = time.perf_counter()
+        app = self.backend.connect()
+        self.profiler.record("connect", start)
+        return self.profiler.wrap(app, "ISldWorks")
+
+    def wrap(self, obj, interface: str):
+        return self.profiler.wrap(self.backend.wrap(_unwrap(obj), interface), interface)
+
+    def close(self):
+        self.backend.close()
+
+
+class ComProfiler:
+    """
+    Sammelt Aufrufstatistiken und Zeitverläufe von API-Aufrufen.
+
+    Als Kontextmanager aktiviert der Profiler die Zuordnung der Aufrufe zu
+    den Operationen; API-Aufrufe werden über backend() immer gemessen.
+    """
+
+    # Aktive Profiler (Instrumentierung nur, solange die Liste nicht leer ist)
+    _active = []
+    _originals = []
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Verwirft alle Messwerte."""
+        self.origin = time.perf_counter()
+        self.durations = defaultdict(list)     # API-Methode -> [Sekunden]
+        self.operations = {}                   # Operation -> [Anzahl, Wand, API, API-Aufrufe]
+        self.paths = defaultdict(lambda: [0, 0.0])  # (Operationen..., Methode) -> [Anzahl, Zeit]
+        self.events = []                       # (Phase "B"/"E", Name, Kategorie, Zeit)
+        self._stack = []                       # [Name, Start, API-Zeit, API-Aufrufe]
+
+    # --- Erfassung ---------------------------------------------------------
+
+    def backend(self, backend: SolidWorksBackend = None) -> ProfilingBackend:
+        """Gibt ein messendes Backend um backend (Standard: Default-Backend) zurück."""
+        return ProfilingBackend(backend or get_default_backend(), self)
+
+    def wrap(self, value, iface: str):
+        """Verpackt API-Objekte (auch in Tupeln) in Mess-Proxys."""
+        if isinstance(value, _VALUE_TYPES) or isinstance(value, _ProfiledObject):
+            return value
+        if isinstance(value, (tuple, list)):
+            return type(value)(self.wrap(v, iface) for v in value)
+        return _ProfiledObject(value, self, getattr(type(value), "_iface", None) or iface)
+
+    def record(self, method: str, start: float):
+        """Verbucht einen API-Aufruf, der bei start begonnen hat."""
+        end = time.perf_counter()
+        seconds = end - start
+        self.durations[method].append(seconds)
+        self.events.append(("B", method, "com", start))
+        self.events.append(("E", method, "com", end))
+        path = tuple(frame[0] for frame in self._stack) + (method,)
+        entry = self.paths[path]
+        entry[0] += 1
+        entry[1] += seconds
+        for frame in self._stack:
+            frame[2] += seconds
+            frame[3] += 1
+
+    def _enter(self, name: str):
+        start = time.perf_counter()
+        self._stack.append([name, start, 0.0, 0])
+        self.events.append(("B", name, "operation", start))
+
+    def _exit(self):
+        name, start, com, calls = self._stack.pop()
+        end = time.perf_counter()
+        self.events.append(("E", name, "operation", end))
+        entry = self.operations.setdefault(name, [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += end - start
+        entry[2] += com
+        entry[3] += calls
+
+    # --- Instrumentierung --------------------------------------------------
+
+    @classmethod
+    def _instrument(cls):
+        """Ersetzt die Operationsmethoden durch messende Wrapper."""
+        def traced(name, func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                profiler = cls._active[-1] if cls._active else None
+                if profiler is None:
+                    return func(*args, **kwargs)
+                profiler._enter(name)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler._exit()
+            return wrapper
+
+        for class_name in _OPERATION_CLASSES:
+            owner = getattr(sw_automation, class_name)
+            for attr, func in list(vars(owner).items()):
+                if inspect.isfunction(func) and (not attr.startswith("_") or attr == "__init__"):
+                    cls._originals.append((owner, attr, func))
+                    setattr(owner, attr, traced(f"{class_name}.{attr}", func))
+        for attr, func in list(vars(sw_automation).items()):
+            if attr.startswith("quick_") and inspect.isfunction(func):
+                cls._originals.append((sw_automation, attr, func))
+                setattr(sw_automation, attr, traced(attr, func))
+
+    @classmethod
+    def _restore(cls):
+        while cls._originals:
+            owner, attr, func = cls._originals.pop()
+            setattr(owner, attr, func)
+
+    def start(self):
+        """Aktiviert die Zuordnung zu Operationen."""
+        if not ComProfiler._active:
+            self._instrument()
+        ComProfiler._active.append(self)
+        return self
+
+    def stop(self):
+        """Deaktiviert die Zuordnung (Messwerte bleiben erhalten)."""
+        if self in ComProfiler._active:
+            ComProfiler._active.remove(self)
+        if not ComProfiler._active:
+            self._restore()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Auswertung --------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Statistik je API-Methode: count, total, mean, p50, p95, p99, max (Sekunden)."""
+        result = {}
+        for method, durations in self.durations.items():
+            values = sorted(durations)
+            total = sum(values)
+            result[method] = {
+                "count": len(values),
+                "total": total,
+                "mean": total / len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "p99": _percentile(values, 99),
+                "max": values[-1],
+            }
+        return result
+
+    @property
+    def call_count(self) -> int:
+        """Anzahl aller gemessenen API-Aufrufe."""
+        return sum(len(v) for v in self.durations.values())
+
+    def report(self, top: int = 15) -> str:
+        """Textbericht: API-Methoden, Operationen und heißeste Aufrufpfade."""
+        ms = 1000.0
+        lines = [f"{'API-Methode':<44} {'Anzahl':>7} {'Summe':>10} {'p50':>8} "
+                 f"{'p95':>8} {'p99':>8} {'max':>8}"]
+        stats = sorted(self.stats().items(), key=lambda item: -item[1]["total"])
+        for method, s in stats[:top]:
+            lines.append(f"{method:<44} {s['count']:>7} {s['total'] * ms:8.2f}ms "
+                         f"{s['p50'] * ms:8.3f} {s['p95'] * ms:8.3f} {s['p99'] * ms:8.3f} "
+                         f"{s['max'] * ms:8.3f}")
+
+        if self.operations:
+            lines.append("")
+            lines.append(f"{'Operation':<44} {'Anzahl':>7} {'Wand':>10} {'API':>10} "
+                         f"{'Python':>10} {'Aufrufe':>8}")
+            ops = sorted(self.operations.items(), key=lambda item: -item[1][1])
+            for name, (count, wall, com, calls) in ops[:top]:
+                lines.append(f"{name:<44} {count:>7} {wall * ms:8.2f}ms {com * ms:8.2f}ms "
+                             f"{(wall - com) * ms:8.2f}ms {calls:>8}")
+
+        lines.append("")
+        lines.append(f"{'Heiße Pfade':<72} {'Anzahl':>7} {'Summe':>10}")
+        paths = sorted(self.paths.items(), key=lambda item: -item[1][1])
+        for path, (count, total) in paths[:top]:
+            label = " > ".join(p.split(".")[-1] if i < len(path) - 1 else p
+                               for i, p in enumerate(path))
+            lines.append(f"{label:<72} {count:>7} {total * ms:8.2f}ms")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Verlauf im Chrome-Trace-Format (chrome://tracing, Perfetto)."""
+        events = [
+            {"name": name, "cat": category, "ph": phase,
+             "ts": (t - self.origin) * 1e6, "pid": 1, "tid": 1}
+            for phase, name, category, t in self.events
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def speedscope(self, name: str = "SolidWorks API") -> dict:
+        """Verlauf im speedscope-Format (Evented Profile)."""
+        frames = {}
+        events = []
+        for phase, frame, _, t in self.events:
+            index = frames.setdefault(frame, len(frames))
+            events.append({"type": "O" if phase == "B" else "C",
+                           "frame": index, "at": (t - self.origin) * 1000})
+        end = events[-1]["at"] if events else 0.0
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [{
+                "type": "evented", "name": name, "unit": "milliseconds",
+                "startValue": 0.0, "endValue": end, "events": events,
+            }],
+            "exporter": "sw_profiler",
+        }
+
+    def save(self, path: str, fmt: str = None):
+        """
+        Speichert den Verlauf als JSON.
+
+        Args:
+            path: Zieldatei
+            fmt: "chrome" oder "speedscope" (Standard: speedscope, wenn der
+                 Dateiname "speedscope" enthält, sonst chrome)
+        """
+        fmt = fmt or ("speedscope" if "speedscope" in path.lower() else "chrome")
+        data = self.speedscope() if fmt == "speedscope" else self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        print(f"Profil gespeichert: {path} ({fmt})")
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import io
+
+    from sw_simulator import SimulatorBackend
+
+    parser = argparse.ArgumentParser(description="COM-Profiler mit dem Simulator")
+    parser.add_argument("--trace", help="Verlauf speichern (.json / .speedscope.json)")
+    options = parser.parse_args()
+
+    latencies = {"FeatureCut": 0.004, "FeatureExtrusion3": 0.004, "SelectByID2": 0.0005}
+    sim = SimulatorBackend(latency=0.0002, latencies=latencies)
+    profiler = ComProfiler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sw = sw_automation.SolidWorksAutomation(backend=profiler.backend(sim))
+        with profiler:
+            sw.new_sketch("Front")
+            sw.sketch.rectangle_centered(200, 200)
+            sw.end_sketch()
+            sw.feature.extrude(10)
+            sw.feature.circular_hole_pattern(12, 8, 150, 10)
+    print(profiler.report())
+    if options.trace:
+        profiler.save(options.trace)
@@ -0,0 +1,1416 @@
+#!/usr/bin/env python3
+"""
+SolidWorks Simulator - In-Memory Backend
+
+Reines Python-Modell der SolidWorks API-Objekte (SldWorks, ModelDoc2,
+SketchManager, FeatureManager, ModelDocExtension, ...), die von
+sw_automation.py verwendet werden. Jeder API-Aufruf wird protokolliert und
+kann mit einer konfigurierbaren Latenz belegt werden. Damit lassen sich
+Skripte ohne SolidWorks (z.B. auf Linux-CI) ausführen, Round-Trips zählen
+und Laufzeiten abschätzen.
+
+Verwendung:
+    from sw_automation import SolidWorksAutomation, set_default_backend
+    from sw_simulator import SimulatorBackend
+
+    sim = SimulatorBackend(latency=0.002)
+    sw = SolidWorksAutomation(backend=sim)
+    sw.new_sketch("Front")
+    sw.sketch.circle(diameter=50)
+    sw.end_sketch()
+    sw.feature.extrude(20)
+    print(sim.call_count, sim.counts.most_common(5))
+
+    # Oder global für quick_*-Funktionen und fremde Skripte:
+    set_default_backend(sim)
+"""
+
+import math
+import os
+import re
+import struct
+import time
+from collections import Counter
+
+import sw_automation
+from sw_automation import (
+    RPC_E_CALL_REJECTED, RPC_S_SERVER_UNAVAILABLE, ProcessSample, SolidWorksBackend, SwConst
+)
+
+
+# Standard-Ebenen und Referenzgeometrie eines leeren Parts
+_DEFAULT_PLANES = ("Front Plane", "Top Plane", "Right Plane")
+_DEFAULT_REFERENCES = ("Origin", "Point1@Origin")
+
+
+class SimulatedComError(Exception):
+    """COM-Fehler des Simulators; hresult wie bei pywintypes.com_error."""
+
+    def __init__(self, hresult: int, message: str):
+        super().__init__(hresult, message)
+        self.hresult = hresult
+
+
+class SimulatedCrash(SimulatedComError):
+    """Aufruf an eine abgestürzte simulierte Instanz (RPC_S_SERVER_UNAVAILABLE)."""
+
+    def __init__(self, message: str):
+        super().__init__(RPC_S_SERVER_UNAVAILABLE, message)
+
+
+class SimProcess:
+    """
+    Simulierter SolidWorks-Prozess mit wachsendem Ressourcenbedarf.
+
+    Jedes offene Dokument belegt Speicher und Handles; geschlossene Dokumente
+    hinterlassen ein Leck. Optional werden Aufrufe mit wachsendem Speicher
+    langsamer, und der Prozess stürzt oberhalb von crash_mb ab.
+
+    Args:
+        base_mb: Speicher der leeren Instanz
+        document_mb: Speicher pro offenem Dokument
+        leak_mb: Verbleibender Speicher pro geschlossenem Dokument
+        leak_handles: Verbleibende Handles/GDI-/USER-Objekte pro geschlossenem Dokument
+        slowdown_mb: Aufruflatenz steigt um 100 % je slowdown_mb Zusatzspeicher
+        crash_mb: Absturz, sobald der Speicher diesen Wert überschreitet
+    """
+
+    _next_pid = 4000
+
+    def __init__(self, base_mb: float = 600.0, document_mb: float = 20.0,
+                 leak_mb: float = 0.0, leak_handles: int = 0,
+                 slowdown_mb: float = None, crash_mb: float = None):
+        SimProcess._next_pid += 4
+        self.pid = SimProcess._next_pid
+        self.base_mb = base_mb
+        self.document_mb = document_mb
+        self.leak_mb = leak_mb
+        self.leak_handles = leak_handles
+        self.slowdown_mb = slowdown_mb
+        self.crash_mb = crash_mb
+        self.closed = 0
+        self.crashed = False
+
+    def memory_mb(self, documents: int) -> float:
+        return self.base_mb + documents * self.document_mb + self.closed * self.leak_mb
+
+    def slowdown(self, documents: int) -> float:
+        """Latenzfaktor beim aktuellen Speicherstand."""
+        return 1.0 + (self.memory_mb(documents) - self.base_mb) / self.slowdown_mb
+
+    def update(self, documents: int):
+        """Prüft nach Öffnen/Schließen von Dokumenten die Absturzgrenze."""
+        if self.crash_mb is not None and self.memory_mb(documents) > self.crash_mb:
+            self.crashed = True
+
+    def sample(self, documents: int) -> ProcessSample:
+        leaked = self.closed * self.leak_handles
+        return ProcessSample(int(self.memory_mb(documents) * 1024 ** 2),
+                             handles=2000 + 60 * documents + leaked,
+                             gdi=300 + 20 * documents + leaked,
+                             user=150 + 8 * documents + leaked)
+
+
+class SimulatorBackend(SolidWorksBackend):
+    """
+    Backend mit simulierter SolidWorks-Instanz.
+
+    Args:
+        latency: Latenz pro API-Aufruf in Sekunden
+        latencies: Latenz pro Methode, z.B. {"FeatureManager.FeatureCut": 0.05}
+        sleep: True = Latenz real abwarten, False = nur aufsummieren
+        open_part: True = beim Start ein leeres Part öffnen
+        revision: Von RevisionNumber() gemeldete Version
+        ui_latency: Zusatzkosten pro Sketch-Element bzw. Feature, solange
+                    Grafik-Updates bzw. FeatureManager-Baum aktiv sind
+        process: Parameter für den simulierten Prozess (siehe SimProcess)
+        busy: Beschäftigt-Zeit nach einem Aufruf in Sekunden, z.B.
+              {"FeatureManager.FeatureExtrusion3": 0.3}; Aufrufe in dieser
+              Zeit werden mit RPC_E_CALL_REJECTED abgewiesen (wie während
+              eines Rebuilds)
+    """
+
+    name = "simulator"
+
+    def __init__(self, latency: float = 0.0, latencies: dict = None,
+                 sleep: bool = True, open_part: bool = True,
+                 revision: str = "31.0.0", ui_latency: float = 0.0,
+                 process: dict = None, busy: dict = None):
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.busy = dict(busy or {})
+        self.sleep = sleep
+        self.ui_latency = ui_latency
+        self.revision = revision
+        self.calls = []
+        self.counts = Counter()
+        self.macro_calls = []
+        self.simulated_time = 0.0
+        self.busy_until = 0.0
+        self.rejected = 0
+        self._in_macro = False
+        self.process = SimProcess(**(process or {}))
+        self.app = SimApplication(self)
+        if open_part:
+            self.app.NewPart()
+        self.reset_stats()
+
+    def connect(self):
+        """Gibt die simulierte SldWorks-Instanz zurück."""
+        self._record("SldWorks.Dispatch", ())
+        return self.app
+
+    def process_sample(self, app) -> ProcessSample:
+        """Ressourcenstand des simulierten Prozesses."""
+        if self.process.crashed:
+            raise SimulatedCrash("Der RPC-Server ist nicht verfügbar (simuliert)")
+        return self.process.sample(len(self.app.documents))
+
+    def _record(self, name: str, args: tuple):
+        """Protokolliert einen API-Aufruf und wendet die Latenz an."""
+        if self._in_macro:
+            # Makro-Aufrufe laufen im SolidWorks-Prozess: kein Round-Trip
+            self.macro_calls.append((name, args))
+            return
+        process = self.process
+        if process.crashed:
+            raise SimulatedCrash(f"{name}: Der RPC-Server ist nicht verfügbar (simuliert)")
+        seconds = self.latencies.get(name, self.latency)
+        if process.slowdown_mb:
+            seconds *= process.slowdown(len(self.app.documents))
+        if self.simulated_time < self.busy_until:
+            self.rejected += 1
+            self._delay(self.latency)
+            raise SimulatedComError(RPC_E_CALL_REJECTED,
+                                    f"{name}: Der Aufruf wurde vom Aufgerufenen abgelehnt")
+        self.calls.append((name, args))
+        self.counts[name] += 1
+        self._delay(seconds)
+        if name in self.busy:
+            self.busy_until = self.simulated_time + self.busy[name]
+
+    def _delay(self, seconds: float):
+        """Verbucht (und wartet ggf.) simulierte Zeit."""
+        if seconds:
+            self.simulated_time += seconds
+            if self.sleep:
+                time.sleep(seconds)
+
+    @property
+    def call_count(self) -> int:
+        """Anzahl aller API-Aufrufe seit dem letzten reset_stats()."""
+        return len(self.calls)
+
+    def reset_stats(self):
+        """Setzt Aufrufprotokoll, Zähler und simulierte Zeit zurück."""
+        self.calls = []
+        self.counts = Counter()
+        self.macro_calls = []
+        self.simulated_time = 0.0
+        self.busy_until = 0.0
+        self.rejected = 0
+
+
+class _SimObject:
+    """Basisklasse aller simulierten API-Objekte."""
+
+    _iface = "IUnknown"
+
+    def __init__(self, sim: SimulatorBackend):
+        self._sim = sim
+
+    def _call(self, method: str, *args):
+        self._sim._record(f"{self._iface}.{method}", args)
+
+
+def _sim_property(name: str, default):
+    """Lese-/Schreib-Eigenschaft, deren Zugriffe als API-Aufruf zählen."""
+    attr = "_prop_" + name
+
+    def getter(self):
+        self._call(name)
+        return getattr(self, attr, default)
+
+    def setter(self, value):
+        self._call(name, value)
+        setattr(self, attr, value)
+
+    return property(getter, setter)
+
+
+class SimApplication(_SimObject):
+    """Simuliertes ISldWorks."""
+
+    _iface = "SldWorks"
+
+    def __init__(self, sim: SimulatorBackend):
+        super().__init__(sim)
+        self.documents = []
+        self.active = None
+        self.toggles = {}
+        self._untitled = Counter()
+
+    @property
+    def ActiveDoc(self):
+        self._call("ActiveDoc")
+        return self.active
+
+    def RevisionNumber(self):
+        self._call("RevisionNumber")
+        return self._sim.revision
+
+    def GetUserPreferenceToggle(self, preference: int):
+        self._call("GetUserPreferenceToggle", preference)
+        return self.toggles.get(preference, True)
+
+    def SetUserPreferenceToggle(self, preference: int, value: bool):
+        self._call("SetUserPreferenceToggle", preference, value)
+        self.toggles[preference] = value
+
+    def _create(self, doc_type: int, prefix: str, path: str = ""):
+        self._untitled[prefix] += 1
+        title = f"{prefix}{self._untitled[prefix]}"
+        model = SimModelDoc(self._sim, self, doc_type, title, path)
+        self.documents.append(model)
+        self.active = model
+        self._sim.process.update(len(self.documents))
+        return model
+
+    def NewDocument(self, template: str, paper_size: int, width: float, height: float):
+        self._call("NewDocument", template, paper_size, width, height)
+        name = template.lower()
+        if name.endswith(".asmdot"):
+            return self._create(SwConst.swDocASSEMBLY, "Assem")
+        if name.endswith(".drwdot"):
+            return self._create(SwConst.swDocDRAWING, "Draw")
+        return self._create(SwConst.swDocPART, "Part")
+
+    def NewPart(self):
+        self._call("NewPart")
+        return self._create(SwConst.swDocPART, "Part")
+
+    def NewAssembly(self):
+        self._call("NewAssembly")
+        return self._create(SwConst.swDocASSEMBLY, "Assem")
+
+    def OpenDoc6(self, path: str, doc_type: int, options: int, config: str,
+                 errors=0, warnings=0):
+        self._call("OpenDoc6", path, doc_type, options, config)
+        for model in self.documents:
+            if model.path == path:
+                self.active = model
+                return model
+        title = re.split(r"[\\/]", path)[-1]
+        model = SimModelDoc(self._sim, self, doc_type, title, path)
+        self.documents.append(model)
+        self.active = model
+        self._sim.process.update(len(self.documents))
+        return model
+
+    def ActivateDoc3(self, title: str, use_user_preferences: bool, option: int, errors=0):
+        self._call("ActivateDoc3", title, use_user_preferences, option)
+        for model in self.documents:
+            if model.title == title:
+                self.active = model
+                return model
+        return None
+
+    def CloseDoc(self, title: str):
+        self._call("CloseDoc", title)
+        remaining = [m for m in self.documents if m.title != title]
+        self._sim.process.closed += len(self.documents) - len(remaining)
+        self.documents = remaining
+        if self.active is not None and self.active.title == title:
+            self.active = self.documents[-1] if self.documents else None
+
+    def GetDocuments(self):
+        self._call("GetDocuments")
+        return list(self.documents)
+
+    def GetProcessID(self):
+        self._call("GetProcessID")
+        return self._sim.process.pid
+
+    def CloseAllDocuments(self, include_unsaved: bool):
+        self._call("CloseAllDocuments", include_unsaved)
+        self._sim.process.closed += len(self.documents)
+        self.documents = []
+        self.active = None
+        return True
+
+    def RunMacro2(self, path: str, module: str, procedure: str, options: int, errors=0):
+        self._call("RunMacro2", path, module, procedure, options)
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        self._sim._in_macro = True
+        try:
+            MacroInterpreter(self).run(source, procedure)
+        except (MacroError, AttributeError, TypeError):
+            return False
+        finally:
+            self._sim._in_macro = False
+        return True
+
+
+class SimModelDoc(_SimObject):
+    """Simuliertes IModelDoc2 (PartDoc) inklusive Feature-Baum."""
+
+    _iface = "ModelDoc2"
+
+    def __init__(self, sim: SimulatorBackend, app: SimApplication,
+                 doc_type: int, title: str, path: str = ""):
+        super().__init__(sim)
+        self.app = app
+        self.doc_type = doc_type
+        self.title = title
+        self.path = path
+        self.features = []
+        self.bodies = []
+        self.dimensions = []
+        self.configurations = ["Default"]
+        self.active_configuration = "Default"
+        self.selection = []
+        self.active_sketch = None
+        self.rebuilds = 0
+        self.saves = 0
+        self.dirty = False
+        self._names = Counter()
+        self._sketch_manager = SimSketchManager(sim, self)
+        self._feature_manager = SimFeatureManager(sim, self)
+        self._selection_manager = SimSelectionManager(sim, self)
+        self._extension = SimModelDocExtension(sim, self)
+        self._configuration_manager = SimConfigurationManager(sim, self)
+        self._view = SimModelView(sim, self)
+
+    # --- Interne Hilfen ---
+
+    def _next_name(self, prefix: str) -> str:
+        self._names[prefix] += 1
+        return f"{prefix}{self._names[prefix]}"
+
+    def _add_feature(self, prefix: str, type_name: str, sketch=None):
+        feature = SimFeature(self._sim, self._next_name(prefix), type_name, sketch)
+        if type_name == "ProfileFeature":
+            sketch.name = feature.name
+        self.features.append(feature)
+        self.selection = []
+        self.dirty = True
+        fm = self._feature_manager
+        if fm._prop_EnableFeatureTree or fm._prop_EnableFeatureTreeWindow:
+            self._sim._delay(self._sim.ui_latency)
+        return feature
+
+    def _add_dimensions(self, owner, values: list):
+        """Legt die Bemaßungen D1, D2, ... eines Features oder Sketches an."""
+        dimension = None
+        for value in values:
+            owner.dim_count += 1
+            dimension = SimDimension(self._sim, self, owner, f"D{owner.dim_count}", value)
+            self.dimensions.append(dimension)
+        return dimension
+
+    def _graphics_live(self) -> bool:
+        """True, wenn neue Sketch-Elemente sofort angezeigt werden."""
+        return (self._view._prop_EnableGraphicsUpdate
+                and self._sketch_manager._prop_DisplayWhenAdded)
+
+    def _find(self, name: str):
+        """Sucht ein benanntes Objekt (Ebene, Feature, Sketch)."""
+        if name in _DEFAULT_PLANES or name in _DEFAULT_REFERENCES:
+            return name
+        for feature in self.features:
+            if feature.name == name:
+                return feature
+        return None
+
+    def _consume_sketch(self):
+        """Gibt den jüngsten unverbrauchten Sketch zurück."""
+        for feature in reversed(self.features):
+            if feature.type_name == "ProfileFeature" and not feature.consumed:
+                if feature.sketch.segments:
+                    feature.consumed = True
+                    return feature.sketch
+                return None
+        return None
+
+    def _extend_body(self, sketch, cut: bool = False, extent: tuple = (0.0, 0.0)):
+        """Aktualisiert den (einzigen) Körper mit den Kanten eines Profils."""
+        if not self.bodies:
+            if cut:
+                return
+            self.bodies.append(SimBody(self._sim, self))
+        self.bodies[0].add_profile(sketch, *extent)
+
+    # --- API ---
+
+    @property
+    def GetType(self):
+        self._call("GetType")
+        return self.doc_type
+
+    @property
+    def GetTitle(self):
+        self._call("GetTitle")
+        return self.title
+
+    @property
+    def SketchManager(self):
+        self._call("SketchManager")
+        return self._sketch_manager
+
+    @property
+    def FeatureManager(self):
+        self._call("FeatureManager")
+        return self._feature_manager
+
+    @property
+    def SelectionManager(self):
+        self._call("SelectionManager")
+        return self._selection_manager
+
+    @property
+    def Extension(self):
+        self._call("Extension")
+        return self._extension
+
+    @property
+    def ConfigurationManager(self):
+        self._call("ConfigurationManager")
+        return self._configuration_manager
+
+    def ShowConfiguration2(self, name: str):
+        self._call("ShowConfiguration2", name)
+        if name not in self.configurations:
+            return False
+        if name != self.active_configuration:
+            self.active_configuration = name
+            self.rebuilds += 1
+        return True
+
+    @property
+    def ActiveView(self):
+        self._call("ActiveView")
+        return self._view
+
+    def GraphicsRedraw2(self):
+        self._call("GraphicsRedraw2")
+
+    def SketchAddConstraints(self, constraint: int):
+        self._call("SketchAddConstraints", constraint)
+        return bool(self.selection)
+
+    def ForceRebuild3(self, top_only: bool):
+        self._call("ForceRebuild3", top_only)
+        self.rebuilds += 1
+        return True
+
+    def _write(self, path: str = None):
+        """Schreibt eine Platzhalter-Datei mit dem Feature-Baum."""
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            f.write(f"SIMULATED {self.title} [{self.active_configuration}]\n")
+            for feature in self.features:
+                f.write(f"{feature.name}\n")
+
+    def Save3(self, options: int, errors=0, warnings=0):
+        self._call("Save3", options)
+        if self.path:
+            self._write()
+            self.dirty = False
+        self.saves += 1
+        return True
+
+    def SaveAs(self, path: str):
+        self._call("SaveAs", path)
+        self.path = path
+        self._write()
+        self.dirty = False
+        self.saves += 1
+        return True
+
+    def GetSaveFlag(self):
+        self._call("GetSaveFlag")
+        return self.dirty
+
+    def ClearSelection2(self, all_: bool):
+        self._call("ClearSelection2", all_)
+        self.selection = []
+
+    def InsertAxis2(self, auto_size: bool):
+        self._call("InsertAxis2", auto_size)
+        planes = [s for s in self.selection if isinstance(s, str) and s.endswith("Plane")]
+        if len(planes) < 2:
+            return False
+        self._add_feature("Axis", "RefAxis")
+        return True
+
+    def Parameter(self, name: str):
+        self._call("Parameter", name)
+        for dimension in self.dimensions:
+            if dimension.name == name:
+                return dimension
+        return None
+
+    def AddDimension2(self, x: float, y: float, z: float):
+        self._call("AddDimension2", x, y, z)
+        segments = [s for s in self.selection if isinstance(s, SimSketchSegment)]
+        if len(segments) != 1 or self.active_sketch is None:
+            return None
+        segment = segments[0]
+        if segment.kind == "circle":
+            value = 2 * segment.coords[2]
+        elif segment.kind == "line":
+            x1, y1, x2, y2 = segment.coords
+            value = math.hypot(x2 - x1, y2 - y1)
+        else:
+            return None
+        self.selection = []
+        dimension = self._add_dimensions(self.active_sketch, [value])
+        return SimDisplayDimension(self._sim, dimension)
+
+    def FeatureByPositionReverse(self, index: int):
+        self._call("FeatureByPositionReverse", index)
+        if index >= len(self.features):
+            return None
+        return self.features[-1 - index]
+
+    def GetBodies2(self, body_type: int, visible_only: bool):
+        self._call("GetBodies2", body_type, visible_only)
+        return tuple(self.bodies) if self.bodies else None
+
+
+class SimModelView(_SimObject):
+    """Simuliertes IModelView."""
+
+    _iface = "ModelView"
+
+    _prop_EnableGraphicsUpdate = True
+    EnableGraphicsUpdate = _sim_property("EnableGraphicsUpdate", True)
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+
+class SimSketch:
+    """Inhalt eines Sketches (Segmente in Metern, Sketch-Ebene)."""
+
+    def __init__(self, plane: str, model: SimModelDoc = None):
+        self.plane = plane
+        self.model = model
+        self.segments = []
+        # Name des Sketch-Features (erst nach dem Schließen bekannt)
+        self.name = None
+        self.dim_count = 0
+
+    def add(self, kind: str, *coords, closed: bool = False):
+        segment = SimSketchSegment(kind, coords, closed, self)
+        self.segments.append(segment)
+        return segment
+
+
+class SimSketchSegment:
+    """Ein Sketch-Element (Linie, Kreis, Bogen, Ellipse, Spline)."""
+
+    def __init__(self, kind: str, coords: tuple, closed: bool, sketch: SimSketch = None):
+        self.kind = kind
+        self.coords = tuple(coords)
+        self.closed = closed
+        self.sketch = sketch
+
+    def Select4(self, append: bool, data):
+        model = self.sketch.model
+        model._sim._record("SketchSegment.Select4", (append,))
+        if not append:
+            model.selection = []
+        model.selection.append(self)
+        return True
+
+    def __repr__(self):
+        return f"SimSketchSegment({self.kind!r}, {self.coords!r})"
+
+
+class SimSketchManager(_SimObject):
+    """Simuliertes ISketchManager."""
+
+    _iface = "SketchManager"
+
+    _prop_AddToDB = False
+    _prop_DisplayWhenAdded = True
+    AddToDB = _sim_property("AddToDB", False)
+    DisplayWhenAdded = _sim_property("DisplayWhenAdded", True)
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+    def InsertSketch(self, update: bool):
+        self._call("InsertSketch", update)
+        model = self.model
+        if model.active_sketch is None:
+            planes = [s for s in model.selection if isinstance(s, str)]
+            model.active_sketch = SimSketch(planes[0] if planes else "Front Plane", model)
+            model.selection = []
+        else:
+            model._add_feature("Sketch", "ProfileFeature", model.active_sketch)
+            model.active_sketch = None
+
+    def _sketch(self) -> SimSketch:
+        # SolidWorks legt bei fehlendem Sketch implizit einen an
+        if self.model.active_sketch is None:
+            self.model.active_sketch = SimSketch("Front Plane", self.model)
+        if self.model._graphics_live() or not self._prop_AddToDB:
+            self._sim._delay(self._sim.ui_latency)
+        return self.model.active_sketch
+
+    def CreateLine(self, x1, y1, z1, x2, y2, z2):
+        self._call("CreateLine", x1, y1, z1, x2, y2, z2)
+        return self._sketch().add("line", x1, y1, x2, y2)
+
+    def CreateCircle(self, xc, yc, zc, xp, yp, zp):
+        self._call("CreateCircle", xc, yc, zc, xp, yp, zp)
+        radius = math.hypot(xp - xc, yp - yc)
+        return self._sketch().add("circle", xc, yc, radius, closed=True)
+
+    def CreateCornerRectangle(self, x1, y1, z1, x2, y2, z2):
+        self._call("CreateCornerRectangle", x1, y1, z1, x2, y2, z2)
+        sketch = self._sketch()
+        corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+        return tuple(
+            sketch.add("line", *corners[i], *corners[(i + 1) % 4])
+            for i in range(4)
+        )
+
+    def CreateCenterRectangle(self, xc, yc, zc, xp, yp, zp):
+        self._call("CreateCenterRectangle", xc, yc, zc, xp, yp, zp)
+        sketch = self._sketch()
+        dx, dy = xp - xc, yp - yc
+        corners = [(xc - dx, yc - dy), (xc + dx, yc - dy),
+                   (xc + dx, yc + dy), (xc - dx, yc + dy)]
+        return tuple(
+            sketch.add("line", *corners[i], *corners[(i + 1) % 4])
+            for i in range(4)
+        )
+
+    def CreateArc(self, xc, yc, zc, x1, y1, z1, x2, y2, z2, direction):
+        self._call("CreateArc", xc, yc, zc, x1, y1, z1, x2, y2, z2, direction)
+        return self._sketch().add("arc", xc, yc, x1, y1, x2, y2, direction)
+
+    def Create3PointArc(self, x1, y1, z1, x2, y2, z2, x3, y3, z3):
+        self._call("Create3PointArc", x1, y1, z1, x2, y2, z2, x3, y3, z3)
+        return self._sketch().add("arc3", x1, y1, x2, y2, x3, y3)
+
+    def CreateEllipse(self, xc, yc, zc, xa, ya, za, xb, yb, zb):
+        self._call("CreateEllipse", xc, yc, zc, xa, ya, za, xb, yb, zb)
+        return self._sketch().add("ellipse", xc, yc, xa, ya, xb, yb, closed=True)
+
+    def CreatePolygon(self, xc, yc, zc, xp, yp, zp, sides: int, inscribed: bool):
+        self._call("CreatePolygon", xc, yc, zc, xp, yp, zp, sides, inscribed)
+        sketch = self._sketch()
+        radius = math.hypot(xp - xc, yp - yc)
+        start = math.atan2(yp - yc, xp - xc)
+        if inscribed:
+            # Punkt liegt auf der Kantenmitte: Eckpunkte weiter außen
+            radius /= math.cos(math.pi / sides)
+            start += math.pi / sides
+        corners = [(xc + radius * math.cos(start + 2 * math.pi * i / sides),
+                    yc + radius * math.sin(start + 2 * math.pi * i / sides))
+                   for i in range(sides)]
+        return tuple(
+            sketch.add("line", *corners[i], *corners[(i + 1) % sides])
+            for i in range(sides)
+        )
+
+    def CreateSketchSlot(self, creation_type: int, length_type: int, width: float,
+                         x1, y1, z1, x2, y2, z2, x3, y3, z3,
+                         direction: int, add_dimension: bool):
+        self._call("CreateSketchSlot", creation_type, length_type, width,
+                   x1, y1, z1, x2, y2, z2, x3, y3, z3, direction, add_dimension)
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length == 0 or width <= 0:
+            return None
+        sketch = self._sketch()
+        r = width / 2
+        px, py = -(y2 - y1) / length * r, (x2 - x1) / length * r
+        return (
+            sketch.add("line", x1 + px, y1 + py, x2 + px, y2 + py),
+            sketch.add("line", x1 - px, y1 - py, x2 - px, y2 - py),
+            sketch.add("arc", x1, y1, x1 + px, y1 + py, x1 - px, y1 - py, 1),
+            sketch.add("arc", x2, y2, x2 - px, y2 - py, x2 + px, y2 + py, 1),
+        )
+
+    def CreateSpline2(self, point_data, periodic: bool):
+        point_data = tuple(point_data)
+        self._call("CreateSpline2", point_data, periodic)
+        return self._sketch().add("spline", *point_data, closed=bool(periodic))
+
+
+class SimFeatureManager(_SimObject):
+    """Simuliertes IFeatureManager."""
+
+    _iface = "FeatureManager"
+
+    _prop_EnableFeatureTree = True
+    _prop_EnableFeatureTreeWindow = True
+    EnableFeatureTree = _sim_property("EnableFeatureTree", True)
+    EnableFeatureTreeWindow = _sim_property("EnableFeatureTreeWindow", True)
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+    def _profile_feature(self, prefix: str, type_name: str, cut: bool,
+                         extent: tuple = (0.0, 0.0), dims: list = ()):
+        sketch = self.model._consume_sketch()
+        if sketch is None:
+            return None
+        self.model._extend_body(sketch, cut, extent)
+        feature = self.model._add_feature(prefix, type_name, sketch)
+        self.model._add_dimensions(feature, dims)
+        return feature
+
+    @staticmethod
+    def _depths(args: tuple) -> list:
+        """Tiefenbemaßungen (D1, ggf. D2) einer Extrusion aus Sd, T1, D1, D2."""
+        if args[3] in (SwConst.swEndCondThroughAll, SwConst.swEndCondThroughAllBoth):
+            return []
+        return [args[5]] if args[0] else [args[5], args[6]]
+
+    @staticmethod
+    def _extent(args: tuple, cut: bool) -> tuple:
+        """Ausdehnung (von, bis) entlang der Sketch-Normalen aus Sd, Flip, T1, D1, D2."""
+        single, flip, end_type = args[0], args[1], args[3]
+        d1, d2 = args[5], args[6]
+        if end_type in (SwConst.swEndCondThroughAll, SwConst.swEndCondThroughAllBoth):
+            d1 = d2 = 1.0
+        if not single:
+            return (-d1, d2)
+        if cut:
+            return (0.0, d1) if flip else (-d1, 0.0)
+        return (-d1, 0.0) if flip else (0.0, d1)
+
+    def _selection_feature(self, prefix: str, type_name: str, dims: list = ()):
+        if not self.model.selection:
+            return None
+        feature = self.model._add_feature(prefix, type_name)
+        self.model._add_dimensions(feature, dims)
+        return feature
+
+    def FeatureExtrusion3(self, *args):
+        self._call("FeatureExtrusion3", *args)
+        return self._profile_feature("Boss-Extrude", "Extrusion", cut=False,
+                                     extent=self._extent(args, cut=False),
+                                     dims=self._depths(args))
+
+    def FeatureCut(self, *args):
+        self._call("FeatureCut", *args)
+        return self._profile_feature("Cut-Extrude", "Cut", cut=True,
+                                     extent=self._extent(args, cut=True),
+                                     dims=self._depths(args))
+
+    def FeatureRevolve2(self, *args):
+        self._call("FeatureRevolve2", *args)
+        is_cut = bool(args[3]) if len(args) > 3 else False
+        dims = [args[8]] if len(args) > 8 else []
+        if is_cut:
+            return self._profile_feature("Cut-Revolve", "RevCut", cut=True, dims=dims)
+        return self._profile_feature("Revolve", "Revolution", cut=False, dims=dims)
+
+    def InsertFeatureChamfer(self, *args):
+        self._call("InsertFeatureChamfer", *args)
+        return self._selection_feature("Chamfer", "Chamfer", dims=args[2:4])
+
+    def FeatureFillet3(self, *args):
+        self._call("FeatureFillet3", *args)
+        return self._selection_feature("Fillet", "Fillet", dims=args[1:2])
+
+    def FeatureLinearPattern4(self, *args):
+        self._call("FeatureLinearPattern4", *args)
+        return self._selection_feature("LPattern", "LPattern")
+
+    def FeatureCircularPattern5(self, *args):
+        self._call("FeatureCircularPattern5", *args)
+        return self._selection_feature("CirPattern", "CirPattern")
+
+    def InsertRefPlane(self, *args):
+        self._call("InsertRefPlane", *args)
+        return self._selection_feature("Plane", "RefPlane", dims=args[1:2])
+
+    def InsertMirrorFeature2(self, *args):
+        self._call("InsertMirrorFeature2", *args)
+        return self._selection_feature("Mirror", "MirrorPattern")
+
+
+class SimConfigurationManager(_SimObject):
+    """Simuliertes IConfigurationManager."""
+
+    _iface = "ConfigurationManager"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+    def AddConfiguration2(self, name: str, comment: str, alternate_name: str, options: int,
+                          parent: str, description: str, rebuild: bool):
+        self._call("AddConfiguration2", name, options)
+        model = self.model
+        if name in model.configurations:
+            return None
+        model.configurations.append(name)
+        for dimension in model.dimensions:
+            dimension.values[name] = dimension.value(model.active_configuration)
+        if not options & SwConst.swConfigOption_DontActivate:
+            model.active_configuration = name
+        return name
+
+
+class SimSelectionManager(_SimObject):
+    """Simuliertes ISelectionMgr."""
+
+    _iface = "SelectionManager"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+    def GetSelectedObjectCount2(self, mark: int):
+        self._call("GetSelectedObjectCount2", mark)
+        return len(self.model.selection)
+
+    def CreateSelectData(self):
+        self._call("CreateSelectData")
+        return SimSelectData(self._sim)
+
+
+class SimSelectData(_SimObject):
+    """Simuliertes ISelectData."""
+
+    _iface = "SelectData"
+
+    Mark = _sim_property("Mark", 0)
+
+
+class SimModelDocExtension(_SimObject):
+    """Simuliertes IModelDocExtension."""
+
+    _iface = "ModelDocExtension"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+
+    def SelectByID2(self, name, obj_type, x, y, z, append, mark, callout, sel_option):
+        self._call("SelectByID2", name, obj_type, x, y, z, append, mark)
+        target = self.model._find(name)
+        if not append:
+            self.model.selection = []
+        if target is None:
+            return False
+        self.model.selection.append(target)
+        return True
+
+    def SaveAs(self, path: str, version: int, options: int, export_data, errors=0, warnings=0):
+        self._call("SaveAs", path, version, options)
+        self.model._write(path)
+        if not options & SwConst.swSaveAsOptions_Copy:
+            self.model.path = path
+            self.model.dirty = False
+        self.model.saves += 1
+        return True
+
+    def MultiSelect2(self, objects, append: bool, data):
+        objects = tuple(objects or ())
+        self._call("MultiSelect2", len(objects), append)
+        if not append:
+            self.model.selection = []
+        selected = [obj for obj in objects if isinstance(obj, _SimEntity)]
+        self.model.selection.extend(selected)
+        return len(selected)
+
+    def GetPersistReference3(self, obj):
+        self._call("GetPersistReference3")
+        if not isinstance(obj, _SimEntity):
+            return None
+        return tuple(obj.persist_id.to_bytes(8, "little"))
+
+    def SelectByRay(self, x, y, z, dx, dy, dz, radius, sel_type, append, mark, action):
+        self._call("SelectByRay", x, y, z, dx, dy, dz, radius, sel_type, append)
+        if not append:
+            self.model.selection = []
+        if not self.model.bodies:
+            return False
+        body = self.model.bodies[0]
+        pool = body.faces if sel_type == SwConst.swSelFACES else body.edges
+        if not pool:
+            return False
+        self.model.selection.append(pool[0])
+        return True
+
+
+def _plane_point(plane: str, u: float, v: float, w: float) -> tuple:
+    """
+    Sketch-Koordinaten (u, v) plus Abstand w entlang der Normalen -> Modell (m).
+
+    Die Abbildung ist linear und gilt ebenso für Richtungsvektoren.
+    """
+    if plane == "Top Plane":
+        return (u, w, -v)
+    if plane == "Right Plane":
+        return (w, v, -u)
+    return (u, v, w)
+
+
+def _pack_ints(first: int, second: int = 0) -> float:
+    """Packt zwei Integer in ein Double (wie die PackedDouble-Werte der API)."""
+    return struct.unpack("<d", struct.pack("<ii", first, second))[0]
+
+
+def _box_of(points) -> tuple:
+    points = list(points)
+    return (min(p[0] for p in points), min(p[1] for p in points), min(p[2] for p in points),
+            max(p[0] for p in points), max(p[1] for p in points), max(p[2] for p in points))
+
+
+class SimBody(_SimObject):
+    """
+    Simuliertes IBody2 mit grober Topologie (Kanten/Flächen pro Profil).
+
+    Die Geometrie entspricht einer Extrusion des Profils zwischen zwei
+    Abständen w0 und w1 entlang der Sketch-Normalen.
+    """
+
+    _iface = "Body2"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+        self.edges = []
+        self.faces = []
+
+    def _edge(self, curve_type: int, start: tuple, end: tuple, circle: tuple = None):
+        edge = SimEdge(self._sim, self.model, curve_type, start, end, circle)
+        self.edges.append(edge)
+        return edge
+
+    def _face(self, box: tuple, normal: tuple = (0.0, 0.0, 0.0)):
+        self.faces.append(SimFace(self._sim, self.model, box, normal))
+
+    def add_profile(self, sketch: SimSketch, w0: float = 0.0, w1: float = 0.0):
+        """
+        Ergänzt Kanten und Flächen für ein extrudiertes Profil.
+
+        Offene Segmente erzeugen je zwei Profilkanten und eine Längskante,
+        geschlossene Kurven je zwei Profilkanten ohne Längskante.
+        """
+        plane = sketch.plane
+        axis = _plane_point(plane, 0.0, 0.0, 1.0)
+        profile = []
+        for segment in sketch.segments:
+            points, curve, circle = self._segment_geometry(segment)
+            profile.extend(points)
+            ends = [points[0], points[-1]]
+            for w in (w0, w1):
+                start = _plane_point(plane, *ends[0], w)
+                end = _plane_point(plane, *ends[1], w)
+                center = None
+                if circle is not None:
+                    center = (_plane_point(plane, circle[0], circle[1], w), axis, circle[2])
+                self._edge(curve, start, end, center)
+            if not segment.closed:
+                self._edge(SwConst.LINE_TYPE, _plane_point(plane, *ends[0], w0),
+                           _plane_point(plane, *ends[0], w1))
+
+            box = _box_of(_plane_point(plane, u, v, w) for u, v in points for w in (w0, w1))
+            normal = (0.0, 0.0, 0.0)
+            if curve == SwConst.LINE_TYPE:
+                (u1, v1), (u2, v2) = ends
+                length = math.hypot(u2 - u1, v2 - v1) or 1.0
+                normal = _plane_point(plane, (v2 - v1) / length, -(u2 - u1) / length, 0.0)
+            self._face(box, normal)
+
+        if profile:
+            for w, sign in ((w0, -1.0), (w1, 1.0)):
+                box = _box_of(_plane_point(plane, u, v, w) for u, v in profile)
+                self._face(box, tuple(sign * c for c in axis))
+        else:
+            self.faces.extend(SimFace(self._sim, self.model) for _ in range(2))
+
+    @staticmethod
+    def _segment_geometry(segment) -> tuple:
+        """(Punkte in Sketch-Koordinaten, Kurventyp, Kreis (u, v, r) oder None)."""
+        c = segment.coords
+        if segment.kind == "line":
+            return [(c[0], c[1]), (c[2], c[3])], SwConst.LINE_TYPE, None
+        if segment.kind == "circle":
+            xc, yc, r = c
+            points = [(xc + r, yc)] + [(xc + r * math.cos(a), yc + r * math.sin(a))
+                                       for a in (math.pi / 2, math.pi, 1.5 * math.pi)]
+            return points + [(xc + r, yc)], SwConst.CIRCLE_TYPE, (xc, yc, r)
+        if segment.kind == "arc":
+            xc, yc, x1, y1, x2, y2 = c[:6]
+            return [(x1, y1), (x2, y2)], SwConst.CIRCLE_TYPE, (xc, yc, math.hypot(x1 - xc, y1 - yc))
+        if segment.kind == "arc3":
+            return [(c[0], c[1]), (c[2], c[3]), (c[4], c[5])], SwConst.CIRCLE_TYPE, None
+        if segment.kind == "ellipse":
+            xc, yc, xa, ya, xb, yb = c
+            points = [(xa, ya), (xb, yb), (2 * xc - xa, 2 * yc - ya), (2 * xc - xb, 2 * yc - yb)]
+            return points + [(xa, ya)], SwConst.ELLIPSE_TYPE, None
+        points = [(c[i], c[i + 1]) for i in range(0, len(c) - 2, 3)] or [(0.0, 0.0)]
+        return points, SwConst.BCURVE_TYPE, None
+
+    def GetEdges(self):
+        self._call("GetEdges")
+        return tuple(self.edges)
+
+    def GetFaces(self):
+        self._call("GetFaces")
+        return tuple(self.faces)
+
+
+class _SimEntity(_SimObject):
+    """Gemeinsame Basis für selektierbare Topologie (Kante, Fläche)."""
+
+    _ids = 0
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc):
+        super().__init__(sim)
+        self.model = model
+        _SimEntity._ids += 1
+        self.persist_id = _SimEntity._ids
+
+    def Select4(self, append: bool, data):
+        self._call("Select4", append)
+        if not append:
+            self.model.selection = []
+        self.model.selection.append(self)
+        return True
+
+
+class SimCurve(_SimObject):
+    """Simuliertes ICurve (nur Kreisparameter)."""
+
+    _iface = "Curve"
+
+    def __init__(self, sim: SimulatorBackend, edge: "SimEdge"):
+        super().__init__(sim)
+        self.edge = edge
+
+    def Identity(self):
+        self._call("Identity")
+        return self.edge.curve_type
+
+    @property
+    def CircleParams(self):
+        self._call("CircleParams")
+        if self.edge.circle is None:
+            return None
+        center, axis, radius = self.edge.circle
+        return tuple(center) + tuple(axis) + (radius,)
+
+
+class SimEdge(_SimEntity):
+    """Simuliertes IEdge (Koordinaten in Metern)."""
+
+    _iface = "Edge"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc,
+                 curve_type: int = SwConst.LINE_TYPE, start: tuple = (0.0, 0.0, 0.0),
+                 end: tuple = (0.0, 0.0, 0.0), circle: tuple = None):
+        super().__init__(sim, model)
+        self.curve_type = curve_type
+        self.start = start
+        self.end = end
+        self.circle = circle
+
+    def GetCurveParams2(self):
+        self._call("GetCurveParams2")
+        return (tuple(self.start) + tuple(self.end)
+                + (0.0, 1.0, _pack_ints(self.curve_type), 0.0, 0.0))
+
+    def GetCurve(self):
+        self._call("GetCurve")
+        return SimCurve(self._sim, self)
+
+
+class SimFace(_SimEntity):
+    """Simuliertes IFace2 (Box in Metern, Normale nur für ebene Flächen)."""
+
+    _iface = "Face2"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc,
+                 box: tuple = (0.0,) * 6, normal: tuple = (0.0, 0.0, 0.0)):
+        super().__init__(sim, model)
+        self.box = box
+        self.normal = normal
+
+    def GetBox(self):
+        self._call("GetBox")
+        return tuple(self.box)
+
+    @property
+    def Normal(self):
+        self._call("Normal")
+        return tuple(self.normal)
+
+
+class SimFeature(_SimObject):
+    """Simuliertes IFeature."""
+
+    _iface = "Feature"
+
+    def __init__(self, sim: SimulatorBackend, name: str, type_name: str, sketch=None):
+        super().__init__(sim)
+        self.name = name
+        self.type_name = type_name
+        self.sketch = sketch
+        self.consumed = False
+        self.dim_count = 0
+
+    @property
+    def Name(self):
+        self._call("Name")
+        return self.name
+
+    def GetTypeName2(self):
+        self._call("GetTypeName2")
+        return self.type_name
+
+
+class SimDimension(_SimObject):
+    """Simuliertes IDimension (SystemValue in Metern bzw. Radiant)."""
+
+    _iface = "Dimension"
+
+    def __init__(self, sim: SimulatorBackend, model: SimModelDoc, owner, dim: str,
+                 value: float):
+        super().__init__(sim)
+        self.model = model
+        self.owner = owner
+        self.dim = dim
+        # Werte je Konfiguration; SystemValue gilt für die aktive
+        self.values = {config: value for config in model.configurations}
+
+    def value(self, config: str) -> float:
+        return self.values.get(config, 0.0)
+
+    @property
+    def SystemValue(self):
+        self._call("SystemValue")
+        return self.value(self.model.active_configuration)
+
+    @SystemValue.setter
+    def SystemValue(self, value: float):
+        self._call("SystemValue", value)
+        self.values[self.model.active_configuration] = value
+
+    def SetSystemValue3(self, value: float, config_option: int, configs):
+        self._call("SetSystemValue3", value, config_option, configs)
+        targets = list(configs or ()) or [self.model.active_configuration]
+        if config_option == SwConst.swSetValue_InAllConfigurations:
+            targets = self.model.configurations
+        for config in targets:
+            if config not in self.model.configurations:
+                return 1
+            self.values[config] = value
+        return 0
+
+    @property
+    def name(self) -> str:
+        """Parametername ("D1@Boss-Extrude1") wie für ModelDoc2.Parameter."""
+        return f"{self.dim}@{self.owner.name}"
+
+    @property
+    def FullName(self):
+        self._call("FullName")
+        return f"{self.name}@{self.model.title}"
+
+
+class SimDisplayDimension(_SimObject):
+    """Simuliertes IDisplayDimension."""
+
+    _iface = "DisplayDimension"
+
+    def __init__(self, sim: SimulatorBackend, dimension: SimDimension):
+        super().__init__(sim)
+        self.dimension = dimension
+
+    def GetDimension2(self, index: int):
+        self._call("GetDimension2", index)
+        return self.dimension
+
+
+class MacroError(Exception):
+    """Fehler beim Interpretieren eines Makros im Simulator."""
+
+
+class MacroInterpreter:
+    """
+    Minimaler Interpreter für die von MacroBatch erzeugten Makros.
+
+    Unterstützt Set-Zuweisungen, Double-Arrays und Methodenaufrufe ohne
+    Rückgabewert - genau die Teilmenge, die MacroBatch.compile() erzeugt.
+    """
+
+    _SET = re.compile(r"Set (\w+) = (\w+)\.(\w+)$")
+    _DIM_ARRAY = re.compile(r"Dim (\w+)\((\d+)\) As Double$")
+    _ASSIGN_ITEM = re.compile(r"(\w+)\((\d+)\) = (.+)$")
+    _ASSIGN = re.compile(r"(\w+) = (\w+)$")
+    _CALL = re.compile(r"(\w+)\.(\w+)(?: (.*))?$")
+
+    def __init__(self, app: SimApplication):
+        self.variables = {"Application": _MacroApplication(app)}
+        self.arrays = {}
+
+    def run(self, source: str, procedure: str = "main"):
+        """Führt die Prozedur procedure des Makros aus."""
+        body = re.search(
+            rf"^Sub {re.escape(procedure)}\(\)\n(.*?)^End Sub",
+            source, re.DOTALL | re.MULTILINE
+        )
+        if body is None:
+            raise MacroError(f"Prozedur {procedure} nicht gefunden")
+        for line in body.group(1).splitlines():
+            self.execute(line.strip())
+
+    def execute(self, line: str):
+        """Führt eine einzelne Makrozeile aus."""
+        if not line or line.startswith("'"):
+            return
+        m = self._SET.match(line)
+        if m:
+            self.variables[m.group(1)] = getattr(self._var(m.group(2)), m.group(3))
+            return
+        m = self._DIM_ARRAY.match(line)
+        if m:
+            self.arrays[m.group(1)] = [0.0] * (int(m.group(2)) + 1)
+            return
+        if line.startswith("Dim "):
+            return
+        m = self._ASSIGN_ITEM.match(line)
+        if m:
+            self.arrays[m.group(1)][int(m.group(2))] = self._value(m.group(3))
+            return
+        m = self._ASSIGN.match(line)
+        if m:
+            self.variables[m.group(1)] = list(self.arrays[m.group(2)])
+            return
+        m = self._CALL.match(line)
+        if m:
+            args = [self._value(a) for a in self._split(m.group(3) or "")]
+            getattr(self._var(m.group(1)), m.group(2))(*args)
+            return
+        raise MacroError(f"Unbekannte Makrozeile: {line}")
+
+    def _var(self, name: str):
+        if name not in self.variables:
+            raise MacroError(f"Unbekannte Variable: {name}")
+        return self.variables[name]
+
+    @staticmethod
+    def _split(text: str) -> list:
+        """Trennt Argumente an Kommas außerhalb von Strings."""
+        args, current, quoted = [], "", False
+        for ch in text:
+            if ch == '"':
+                quoted = not quoted
+            if ch == "," and not quoted:
+                args.append(current.strip())
+                current = ""
+            else:
+                current += ch
+        if current.strip():
+            args.append(current.strip())
+        return args
+
+    def _value(self, token: str):
+        if token.startswith('"'):
+            return token[1:-1].replace('""', '"')
+        if token in ("True", "False"):
+            return token == "True"
+        if token == "Nothing":
+            return None
+        if token in self.variables:
+            return self.variables[token]
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            raise MacroError(f"Unbekannter Wert: {token}")
+
+
+class _MacroApplication:
+    """Das Objekt 'Application' im Makro-Kontext."""
+
+    def __init__(self, app: SimApplication):
+        self.SldWorks = app
+
+
+def extract_python(source: str) -> str:
+    """
+    Gibt den ausführbaren Python-Code eines Skripts zurück.
+
+    Skripte im Markdown-Format (z.B. turbine-blade-concept.py) werden auf
+    ihre ```python-Blöcke reduziert.
+    """
+    blocks = re.findall(r"```python\n(.*?)```", source, re.DOTALL)
+    return "\n".join(blocks) if blocks else source
+
+
+def run_script(path: str, backend: SimulatorBackend = None) -> SimulatorBackend:
+    """
+    Führt ein Automatisierungs-Skript gegen den Simulator aus.
+
+    Args:
+        path: Pfad zum Skript (.py, auch mit Markdown-Inhalt)
+        backend: Optionaler Simulator (Standard: neuer SimulatorBackend)
+
+    Returns:
+        Der verwendete SimulatorBackend (mit Aufrufprotokoll)
+    """
+    backend = backend or SimulatorBackend(sleep=False)
+    with open(path, encoding="utf-8") as f:
+        code = extract_python(f.read())
+
+    previous = sw_automation._default_backend
+    sw_automation.set_default_backend(backend)
+    try:
+        exec(compile(code, path, "exec"), {"__name__": "__sw_simulation__"})
+    finally:
+        sw_automation.set_default_backend(previous)
+    return backend
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def report(label: str, sim: SimulatorBackend, seconds: float):
+        model = sim.app.active
+        features = len(model.features) if model else 0
+        print(f"{label:<28} {sim.call_count:>6} Aufrufe  {features:>4} Features  "
+              f"{seconds * 1000:8.1f} ms (simuliert {sim.simulated_time * 1000:8.1f} ms)")
+
+    print("=" * 60)
+    print("SolidWorks Simulator - Round-Trip-Übersicht (1 ms / Aufruf)")
+    print("=" * 60)
+
+    sim = SimulatorBackend(latency=0.001, sleep=False)
+    sw_automation.set_default_backend(sim)
+    start = time.perf_counter()
+    sw_automation.quick_box(100, 50, 30)
+    report("quick_box", sim, time.perf_counter() - start)
+
+    sim = SimulatorBackend(latency=0.001, sleep=False)
+    sw_automation.set_default_backend(sim)
+    sw = sw_automation.SolidWorksAutomation()
+    sim.reset_stats()
+    start = time.perf_counter()
+    sw.feature.circular_hole_pattern(8, 10, 120, 20)
+    report("circular_hole_pattern(8)", sim, time.perf_counter() - start)
+    sw_automation.set_default_backend(None)
+
+    sim = SimulatorBackend(latency=0.001, sleep=False)
+    start = time.perf_counter()
+    run_script(os.path.join(here, "turbine-blade-concept.py"), sim)
+    report("turbine-blade-concept", sim, time.perf_counter() - start)
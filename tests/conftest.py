@@ -0,0 +1,48 @@
+"""
+Gemeinsame Fixtures: alle Tests laufen offline gegen den Simulator.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+import sw_automation  # noqa: E402
+from sw_automation import SolidWorksAutomation  # noqa: E402
+from sw_simulator import SimulatorBackend  # noqa: E402
+
+
+@pytest.fixture
+def sim():
+    """Simulator ohne Latenz mit leerem Part."""
+    return SimulatorBackend(sleep=False)
+
+
+@pytest.fixture
+def sw(sim):
+    """SolidWorksAutomation auf dem Simulator."""
+    return SolidWorksAutomation(backend=sim)
+
+
+@pytest.fixture
+def default_backend(sim):
+    """Simulator als Standard-Backend (für quick_*-Funktionen und Farm-Jobs)."""
+    previous = sw_automation._default_backend
+    sw_automation.set_default_backend(sim)
+    yield sim
+    sw_automation.set_default_backend(previous)
+
+
+def feature_names(sim) -> list:
+    """Feature-Baum des aktiven simulierten Dokuments."""
+    return [feature.name for feature in sim.app.active.features]
+
+
+def box(sw, width: float = 100, height: float = 50, depth: float = 20):
+    """Quader aus Rechteck-Sketch und Extrusion."""
+    sw.new_sketch("Front")
+    sw.sketch.rectangle_centered(width, height)
+    sw.end_sketch()
+    return sw.feature.extrude(depth)
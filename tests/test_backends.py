@@ -0,0 +1,99 @@
+"""Backends, Simulator, Handle-Cache, Early Binding und Aufrufbudgets."""
+
+import sys
+import types
+
+import pytest
+
+import sw_automation
+import sw_benchmark
+from sw_automation import ComBackend, SolidWorksConnection
+from sw_benchmark import FakeComBackend
+
+from conftest import box, feature_names
+
+
+def test_quick_box_runs_on_default_backend(default_backend):
+    sw_automation.quick_box(100, 50, 30)
+    assert feature_names(default_backend)[-1] == "Boss-Extrude1"
+    assert default_backend.counts["FeatureManager.FeatureExtrusion3"] == 1
+
+
+def test_simulator_counts_calls(sw, sim):
+    sim.reset_stats()
+    box(sw)
+    assert sim.counts["SketchManager.CreateCornerRectangle"] == 1
+    assert sim.counts["FeatureManager.FeatureExtrusion3"] == 1
+    assert sim.call_count == sum(sim.counts.values())
+
+
+def test_handle_cache_resolves_managers_once(sim):
+    conn = SolidWorksConnection(sim)
+    sim.reset_stats()
+    for _ in range(5):
+        conn.sketch_manager.CreateLine(0.0, 0.0, 0, 0.01, 0.0, 0)
+    assert sim.counts["ModelDoc2.SketchManager"] == 1
+    assert sim.counts["SketchManager.CreateLine"] == 5
+
+
+def test_cached_dispatch_resolves_dispids_once():
+    backend = FakeComBackend(sleep=False)
+    conn = SolidWorksConnection(backend)
+    backend.dispatch_stats.clear()
+    for _ in range(10):
+        conn.sketch_manager.CreateLine(0.0, 0.0, 0, 0.01, 0.0, 0)
+    assert backend.dispatch_stats["Invoke"] == 11          # SketchManager + 10 Linien
+    assert backend.dispatch_stats["GetIDsOfNames"] == 2
+
+
+def test_typelib_cache_is_versioned(sim, tmp_path):
+    backend = ComBackend(early_bound=True, cache_dir=str(tmp_path))
+    major = backend._typelib_version(sim.connect())
+    assert major == 31
+    assert backend._version_dir(major) == str(tmp_path / "31")
+    assert backend._load_typelib(major) is False       # kein Cache -> dynamisch
+
+
+def _fake_win32com(monkeypatch, gen_path: str) -> types.ModuleType:
+    """Minimales win32com mit gencache, das die geladenen Cache-Pfade protokolliert."""
+    win32com = types.ModuleType("win32com")
+    win32com.__gen_path__ = gen_path
+    gen_py = types.ModuleType("win32com.gen_py")
+    gen_py.__path__ = [gen_path]
+    client = types.ModuleType("win32com.client")
+    gencache = types.ModuleType("win32com.client.gencache")
+    gencache.loaded = []
+    gencache.__init__ = lambda: gencache.loaded.append(win32com.__gen_path__)
+    gencache.GetModuleForTypelib = lambda *args: types.SimpleNamespace(
+        ISldWorks=lambda obj: ("early", obj))
+    win32com.gen_py, win32com.client, client.gencache = gen_py, client, gencache
+    for name, module in [("win32com", win32com), ("win32com.gen_py", gen_py),
+                         ("win32com.client", client), ("win32com.client.gencache", gencache)]:
+        monkeypatch.setitem(sys.modules, name, module)
+    return win32com
+
+
+def test_load_typelib_restores_global_gencache_state(monkeypatch, tmp_path):
+    win32com = _fake_win32com(monkeypatch, str(tmp_path / "global"))
+    backend = ComBackend(early_bound=True, cache_dir=str(tmp_path))
+    (tmp_path / "31").mkdir()
+    assert backend._load_typelib(31)
+    assert win32com.__gen_path__ == str(tmp_path / "global")
+    assert win32com.gen_py.__path__ == [str(tmp_path / "global")]
+    assert win32com.client.gencache.loaded == [str(tmp_path / "31"), str(tmp_path / "global")]
+    backend.binding = "early"
+    assert backend.wrap("app", "ISldWorks") == ("early", "app")
+    assert backend.wrap("app", "IUnbekannt") == "app"
+
+
+def test_wrap_is_identity_with_dynamic_binding(sim):
+    backend = ComBackend(early_bound=True)
+    app = sim.connect()
+    assert backend.binding == "dynamic"
+    assert backend.wrap(app, "ISldWorks") is app
+
+
+@pytest.mark.parametrize("case", sw_benchmark.OPERATION_CASES, ids=lambda c: c.name)
+def test_operation_budget(case):
+    _, calls, _ = sw_benchmark._measure(case.run, case.setup)
+    assert calls <= case.budget
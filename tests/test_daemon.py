@@ -0,0 +1,135 @@
+"""JSON-RPC-Daemon über Loopback: Token, ungültige Nachrichten, Freigaben, mehrere Clients."""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from sw_daemon import (
+    PARSE_ERROR, UNAUTHORIZED, DaemonClient, DaemonError, SolidWorksDaemon
+)
+
+
+@pytest.fixture
+def daemon(request, sim, tmp_path):
+    """Simulator-Daemon auf einem freien Port, läuft im Hintergrund."""
+    options = getattr(request, "param", {})
+    daemon = SolidWorksDaemon(sim, address="127.0.0.1:0",
+                              token_file=str(tmp_path / "token"), **options).bind()
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    yield daemon
+    if not daemon.stopped:
+        DaemonClient(daemon.address, token_file=daemon.token_file).shutdown()
+    thread.join()
+    assert not os.path.exists(daemon.token_file)
+
+
+def _raw(daemon, *lines) -> list:
+    """Sendet rohe Zeilen und liest Antworten bis zum Verbindungsende."""
+    with socket.create_connection(daemon.address, timeout=5) as conn:
+        conn.sendall(b"".join(line + b"\n" for line in lines))
+        conn.shutdown(socket.SHUT_WR)
+        data = b""
+        while chunk := conn.recv(4096):
+            data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def _auth(daemon) -> bytes:
+    with open(daemon.token_file) as f:
+        message = {"jsonrpc": "2.0", "id": 0, "method": "auth", "params": {"token": f.read()}}
+    return json.dumps(message).encode()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX-Dateirechte")
+def test_token_file_is_user_only(daemon):
+    assert stat.S_IMODE(os.stat(daemon.token_file).st_mode) == 0o600
+
+
+def test_client_with_token_executes_ops(daemon, sim):
+    with DaemonClient(daemon.address, token_file=daemon.token_file) as client:
+        client.execute([("new_sketch", ("Front",)),
+                        ("sketch.circle", (0, 0, 25)),
+                        ("end_sketch",),
+                        ("feature.extrude", (20,))])
+    assert sim.counts["FeatureManager.FeatureExtrusion3"] == 1
+
+
+def test_wrong_token_is_rejected(daemon):
+    client = DaemonClient(daemon.address, token="falsch")
+    with pytest.raises(DaemonError) as info:
+        client.connect()
+    assert info.value.code == UNAUTHORIZED
+    ping = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}).encode()
+    responses = _raw(daemon, ping, ping)
+    assert [r["error"]["code"] for r in responses] == [UNAUTHORIZED]
+
+
+def test_malformed_line_closes_connection(daemon):
+    ping = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}).encode()
+    responses = _raw(daemon, _auth(daemon), b"kein json", ping)
+    assert responses[0]["result"] is True
+    assert responses[1]["error"]["code"] == PARSE_ERROR
+    assert len(responses) == 2
+
+
+@pytest.mark.parametrize("op", [("save", ("x.sldprt",)), ("_connection.model",),
+                                ("sketch.conn.app.ExitApp",), ("documents.close_all",)])
+def test_execute_rejects_operations_outside_whitelist(daemon, op):
+    with DaemonClient(daemon.address, token_file=daemon.token_file) as client:
+        with pytest.raises(DaemonError, match="Ungültige Operation"):
+            client.execute([op])
+
+
+def test_bind_leaves_socketserver_defaults_alone(daemon):
+    assert socketserver.TCPServer.allow_reuse_address is False
+
+
+
+def test_idle_client_does_not_block_others_or_shutdown(daemon):
+    idle = socket.create_connection(daemon.address, timeout=5)
+    idle.sendall(_auth(daemon) + b"\n")
+    assert json.loads(idle.makefile("rb").readline())["result"] is True
+    try:
+        with DaemonClient(daemon.address, timeout=5, token_file=daemon.token_file) as client:
+            assert client.ping()["pong"]
+            client.shutdown()
+        assert daemon.stopped
+    finally:
+        idle.close()
+
+
+@pytest.mark.parametrize("daemon", [{"read_timeout": 0.2}], indirect=True)
+def test_stalled_connection_is_closed_after_read_timeout(daemon):
+    with socket.create_connection(daemon.address, timeout=5) as stalled:
+        stalled.sendall(b'{"jsonrpc": "2.0", "id": 0, "me')     # unvollständige Zeile
+        assert stalled.recv(1) == b""
+    with DaemonClient(daemon.address, timeout=5, token_file=daemon.token_file) as client:
+        assert client.ping()["pong"]
+        time.sleep(0.4)                 # Daemon schließt die ruhende Verbindung
+        assert client.ping()["pong"]    # Client verbindet sich neu
+
+
+@pytest.mark.parametrize("daemon", [{"pool_size": 2}], indirect=True)
+def test_pool_refills_between_requests_on_daemon_thread(daemon, sim):
+    with DaemonClient(daemon.address, timeout=5, token_file=daemon.token_file) as client:
+        for _ in range(5):
+            title = client.new_part()
+            client.execute([("new_sketch", ("Front",)),
+                            ("sketch.circle", (0, 0, 25)),
+                            ("end_sketch",),
+                            ("feature.extrude", (20,))])
+            status = client.status()
+            assert status["document"] == title
+            time.sleep(0.3)                         # Leerlauf: Pool füllt auf
+        assert client.status()["pool"]["hits"] >= 4
+    # Nur die angeforderten Parts haben Features, je genau ein Extrude
+    built = [[f.name for f in doc.features] for doc in sim.app.documents if doc.features]
+    assert built == [["Sketch1", "Boss-Extrude1"]] * 5
@@ -0,0 +1,103 @@
+"""Dokument-Pool und Dokument-Sitzungen."""
+
+import pytest
+
+from sw_automation import DocumentPool
+
+from conftest import box, feature_names
+
+
+def test_pool_hit_avoids_new_document(sw, sim):
+    pool = DocumentPool(sw.app, size=2)
+    assert pool.refill() == 2
+    sw.documents.pool = pool
+    sim.reset_stats()
+    sw.documents.new_part()
+    assert sim.counts["SldWorks.NewDocument"] == 0
+    assert sim.counts["SldWorks.ActivateDoc3"] == 1
+    metrics = pool.metrics()
+    assert (metrics["hits"], metrics["misses"]) == (1, 0)
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_pool_miss_falls_back(sw, sim):
+    pool = DocumentPool(sw.app, size=1)
+    sw.documents.pool = pool
+    sw.documents.new_part()
+    assert sim.counts["SldWorks.NewDocument"] == 1
+    assert pool.metrics()["misses"] == 1
+
+
+def test_acquired_document_stays_active_while_pool_refills(sw, sim):
+    pool = DocumentPool(sw.app, size=2)
+    sw.documents.pool = pool
+    pool.refill()
+    for _ in range(50):
+        sw.documents.new_part()
+        sw.sync_document()
+        acquired = sim.app.active
+        assert pool.maintain(limit=1) == 1          # Auffüllen zwischen zwei Aufträgen
+        assert sim.app.active is acquired
+        box(sw)
+        assert feature_names(sim) == ["Sketch1", "Boss-Extrude1"]
+    metrics = pool.metrics()
+    assert (metrics["hits"], metrics["misses"]) == (50, 0)
+
+
+def test_session_switch_reuses_handles(sw, sim):
+    session = sw.document_session()
+    first = session.current.title
+    session.new_part()
+    box(sw)
+    session.activate(first)
+    sim.reset_stats()
+    session.activate(session.documents[0].title)
+    box(sw)
+    assert sim.counts["ModelDoc2.SketchManager"] == 0
+    assert sim.counts["ModelDoc2.FeatureManager"] == 0
+    assert sim.counts["SldWorks.ActivateDoc3"] == 1
+
+
+def test_session_evicts_least_recently_used(sw, sim, tmp_path):
+    session = sw.document_session(max_documents=2)
+    paths = []
+    for i in range(3):
+        session.new_part()
+        box(sw)
+        paths.append(str(tmp_path / f"t{i}.sldprt"))
+        session.save(paths[-1])
+    # Part1 (nie gespeichert) bleibt, t0 und t1 werden verdrängt
+    assert [doc.path for doc in session.documents] == [None, paths[2]]
+    assert session.stats()["evicted"] == 2
+    session.open(paths[0])
+    assert session.stats()["opened"] == 4
+
+
+def test_session_close_all_is_one_call(sw, sim):
+    session = sw.document_session()
+    session.new_part()
+    session.new_part()
+    sim.reset_stats()
+    session.close_all()
+    assert sim.counts["SldWorks.CloseAllDocuments"] == 1
+    assert sim.counts["SldWorks.CloseDoc"] == 0
+    assert sim.app.documents == []
+
+
+@pytest.mark.parametrize("close_all", [True, False])
+def test_session_detaches_after_last_document(sw, sim, close_all):
+    session = sw.document_session()
+    box(sw)
+    if close_all:
+        session.close_all()
+    else:
+        session.close()
+    assert sw._connection._handles == {}
+    with pytest.raises(ValueError, match="Kein Dokument"):
+        sw.model
+    with pytest.raises(ValueError, match="Kein Dokument"):
+        box(sw)
+    session.new_part()
+    box(sw)
+    assert feature_names(sim) == ["Sketch1", "Boss-Extrude1"]
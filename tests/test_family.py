@@ -0,0 +1,84 @@
+"""Parametrische Updates und Teilefamilien."""
+
+import pytest
+
+from sw_automation import PartCache, SolidWorksAutomation, plan_family, read_family_table
+from sw_simulator import SimulatorBackend
+
+from conftest import box
+
+
+def test_read_family_table_semicolon_with_decimal_comma():
+    rows = read_family_table(["name;extrude1.depth;circle1.diameter",
+                              "A;10,5;20", "B;12;20"])
+    assert rows == [("A", {"extrude1.depth": 10.5, "circle1.diameter": 20.0}),
+                    ("B", {"extrude1.depth": 12.0, "circle1.diameter": 20.0})]
+
+
+def test_read_family_table_rejects_non_numeric():
+    with pytest.raises(ValueError):
+        read_family_table(["name,depth", "A,x"])
+
+
+def test_plan_family_groups_values_and_skips_base():
+    rows = [("A", {"d": 10, "w": 5}), ("B", {"d": 10, "w": 6}), ("C", {"d": 12, "w": 5})]
+    plan = plan_family(rows, base={"w": 5})
+    assert plan.configurations == ["A", "B", "C"]
+    assert plan.columns == ["d", "w"]
+    assert plan.assignments == [("d", 10, ["A", "B"]), ("w", 6, ["B"]), ("d", 12, ["C"])]
+    assert plan.calls == 3 + 3
+
+
+def test_plan_family_rejects_duplicate_names():
+    with pytest.raises(ValueError):
+        plan_family([("A", {}), ("A", {})])
+
+
+def test_update_sets_dimension_and_rebuilds_once(sw, sim):
+    box(sw, depth=20)
+    sim.reset_stats()
+    assert sw.update({"extrude1.depth": 40}) == 1
+    assert sim.counts["ModelDoc2.ForceRebuild3"] == 1
+    assert sw.update({"extrude1.depth": 40}) == 0
+    dimension = sim.app.active.dimensions[0]
+    assert dimension.name == "D1@Boss-Extrude1" and dimension.value("Default") == pytest.approx(0.04)
+
+
+def test_update_makes_document_uncacheable(tmp_path):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw, depth=20)
+    sw.save(str(tmp_path / "a.sldprt"))
+
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw, depth=20)
+    assert sw.update({"extrude1.depth": 40}) == 1
+    sw.save(str(tmp_path / "b.sldprt"))
+    assert (cache.hits, cache.stores) == (0, 1)
+
+
+def test_create_configurations(sim):
+    sw = SolidWorksAutomation(backend=sim)
+    box(sw, depth=20)
+    plan = sw.create_configurations([("T20", {"extrude1.depth": 20}),
+                                     ("T30", {"extrude1.depth": 30})])
+    assert plan.assignments == [("extrude1.depth", 30, ["T30"])]
+    assert sim.counts["ConfigurationManager.AddConfiguration2"] == 2
+    assert sim.counts["Dimension.SetSystemValue3"] == 1
+
+
+@pytest.mark.parametrize("export", [False, True])
+def test_configurations_make_document_uncacheable(tmp_path, export):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw, depth=20)
+    sw.save(str(tmp_path / "a.sldprt"))
+
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw, depth=20)
+    if export:
+        sw.export_configurations(["Default"], str(tmp_path))
+    else:
+        sw.create_configurations([("T30", {"extrude1.depth": 30})])
+    sw.save(str(tmp_path / "b.sldprt"))
+    assert (cache.hits, cache.stores) == (0, 1)
@@ -0,0 +1,67 @@
+"""Worker-Farm und Instanz-Supervisor."""
+
+from sw_automation import RPC_E_CALL_REJECTED, ProcessSample
+from sw_farm import InstanceSupervisor, Job, RecyclePolicy, SolidWorksFarm, simulator_factory
+from sw_simulator import SimulatedComError, SimulatedCrash
+
+
+def test_farm_returns_results_in_job_order():
+    jobs = [Job("quick_box", 100, 50, 10 + i) for i in range(4)]
+    jobs.append(Job("quick_sphere", 10))
+    with SolidWorksFarm(2, backend_factory=simulator_factory(latency=0.0), quiet=True) as farm:
+        results = farm.run(jobs)
+    assert [r.index for r in results] == list(range(5))
+    assert [r.ok for r in results] == [True] * 4 + [False]
+    assert "quick_sphere" in results[-1].error
+
+
+def _supervisor(policy=None, **process):
+    return InstanceSupervisor(simulator_factory(latency=0.0, sleep=False, process=process),
+                              policy).start()
+
+
+def test_recycle_policy_decisions():
+    policy = RecyclePolicy(max_rss_mb=1000, max_gdi=500, slowdown=2.0, window=3)
+    small = ProcessSample(800 * 1024 ** 2, handles=3000, gdi=400, user=200)
+    assert policy.check(small, [0.1] * 3, [0.15] * 3) is None
+    assert policy.check(ProcessSample(1200 * 1024 ** 2), [], []).startswith("Speicher")
+    assert policy.check(ProcessSample(0, gdi=600), [], []).startswith("GDI-Objekte")
+    assert policy.check(small, [0.1] * 3, [0.25] * 3).startswith("Latenz")
+    assert policy.check(small, [0.1] * 2, [0.25] * 2) is None   # Fenster noch nicht voll
+
+
+def test_supervisor_recycles_leaking_instance(default_backend):
+    policy = RecyclePolicy(max_rss_mb=700, sample_every=1)
+    with _supervisor(policy, leak_mb=30) as supervisor:
+        results = [supervisor.run(i, Job("quick_box", 100, 50, 10)) for i in range(6)]
+        assert all(r.ok for r in results)
+        assert [r.recycled is not None for r in results] == [False, False, True] * 2
+        assert supervisor.stats()["reasons"] == {"Speicher": 2}
+
+
+def test_supervisor_replays_job_after_crash(default_backend):
+    with _supervisor(leak_mb=30, crash_mb=700) as supervisor:
+        results = [supervisor.run(i, Job("quick_box", 100, 50, 10)) for i in range(6)]
+        assert all(r.ok for r in results)
+        assert max(r.attempts for r in results) == 2
+        assert supervisor.replayed == supervisor.restarts >= 1
+        assert supervisor.stats()["reasons"] == {"Absturz": supervisor.restarts}
+
+
+def test_busy_instance_is_not_restarted(default_backend, monkeypatch):
+    with _supervisor(RecyclePolicy(max_rss_mb=10)) as supervisor:
+        sim = supervisor.backend
+        sim.busy_until = sim.simulated_time + 10.0
+        assert supervisor.alive()
+
+        def rejected(app):
+            raise SimulatedComError(RPC_E_CALL_REJECTED, "beschäftigt")
+        monkeypatch.setattr(sim, "process_sample", rejected)
+        assert supervisor.check() is None
+        assert supervisor.restarts == 0
+
+        def crashed(app):
+            raise SimulatedCrash("nicht verfügbar")
+        monkeypatch.setattr(sim, "process_sample", crashed)
+        assert supervisor.check().startswith("Absturz")
+        assert supervisor.restarts == 1 and supervisor.backend is not sim
@@ -0,0 +1,34 @@
+"""Performance-Modus."""
+
+import pytest
+
+from sw_automation import SolidWorksAutomation
+
+
+def test_fast_mode_restores_settings(sw, sim):
+    model = sim.app.active
+    with sw.fast_mode():
+        assert model._sketch_manager._prop_DisplayWhenAdded is False
+        assert model._feature_manager._prop_EnableFeatureTree is False
+    assert model._sketch_manager._prop_DisplayWhenAdded is not False
+    assert model._feature_manager._prop_EnableFeatureTree is not False
+
+
+def test_fast_mode_nests_and_restores_after_error(sw, sim):
+    model = sim.app.active
+    try:
+        with sw.fast_mode():
+            with sw.fast_mode():
+                pass
+            assert model._feature_manager._prop_EnableFeatureTree is False
+            raise KeyError("Abbruch")
+    except KeyError:
+        pass
+    assert model._feature_manager._prop_EnableFeatureTree is not False
+
+
+def test_fast_mode_without_document_raises(sim):
+    sw = SolidWorksAutomation(require_document=False, backend=sim)
+    with pytest.raises(ValueError, match="Kein Dokument"):
+        with sw.fast_mode():
+            pass
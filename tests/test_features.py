@@ -0,0 +1,25 @@
+"""Feature-Operationen."""
+
+import pytest
+
+from conftest import box, feature_names
+
+
+@pytest.mark.parametrize("mode, cuts, last", [
+    ("separate", 6, "Cut-Extrude6"),
+    ("sketch", 1, "Cut-Extrude1"),
+    ("pattern", 1, "CirPattern1"),
+])
+def test_circular_hole_pattern_returns_last_feature(sw, sim, mode, cuts, last):
+    box(sw, 200, 200, 20)
+    sim.reset_stats()
+    feature = sw.feature.circular_hole_pattern(6, 8, 120, 20, mode=mode)
+    assert sim.counts["FeatureManager.FeatureCut"] == cuts
+    assert feature is not None
+    assert feature.name == last == feature_names(sim)[-1]
+
+
+def test_extrude_registers_dimension(sw):
+    feature = box(sw, depth=20)
+    assert feature.name == "Boss-Extrude1"
+    assert sw.dimensions["extrude1.depth"].value == 20
@@ -0,0 +1,88 @@
+"""Batch-Makros und IR-Optimierung."""
+
+from sw_automation import SketchOp, SolidWorksAutomation, optimize_ops
+
+from conftest import feature_names
+
+
+def _hole(x: float, diameter: float = 10) -> list:
+    return [SketchOp("sketch", "begin", {"plane": "Front"}),
+            SketchOp("entity", "circle", {"cx": x, "cy": 0, "diameter": diameter}),
+            SketchOp("sketch", "end"),
+            SketchOp("feature", "cut", {"depth": 5})]
+
+
+def test_batch_sketch_is_one_round_trip(sim):
+    sw = SolidWorksAutomation(backend=sim, batch_sketches=True)
+    sim.reset_stats()
+    sw.new_sketch("Front")
+    sw.sketch.circle(0, 0, diameter=20)
+    sw.sketch.line(0, 0, 10, 10)
+    sw.end_sketch()
+    assert dict(sim.counts) == {"SldWorks.RunMacro2": 1}
+    assert "CreateCircle" in sw.last_macro
+
+
+def test_optimizer_merges_disjoint_profiles():
+    before = _hole(0) + _hole(50)
+    after = optimize_ops(before)
+    assert [op.name for op in after] == ["begin", "circle", "circle", "end", "cut"]
+    assert before == _hole(0) + _hole(50)       # Eingabe unverändert
+
+
+def test_optimizer_keeps_overlapping_profiles():
+    before = _hole(0, 40) + _hole(0, 10)
+    assert optimize_ops(before) == before
+
+
+def test_optimizer_drops_degenerate_and_duplicate_entities():
+    ops = _hole(0)
+    ops[2:2] = [SketchOp("entity", "circle", {"cx": 0, "cy": 0, "diameter": 10}),
+                SketchOp("entity", "line", {"x1": 5, "y1": 5, "x2": 5, "y2": 5})]
+    assert optimize_ops(ops) == _hole(0)
+
+
+def test_optimizer_removes_empty_profile_units():
+    empty = [SketchOp("sketch", "begin", {"plane": "Front"}), SketchOp("sketch", "end"),
+             SketchOp("feature", "cut", {"depth": 5})]
+    assert optimize_ops(empty + _hole(0)) == _hole(0)
+
+
+def test_flush_records_ir_before_and_after(sim):
+    sw = SolidWorksAutomation(backend=sim, optimize_ops=True)
+    for x in (0, 50):
+        sw.new_sketch("Front")
+        sw.sketch.circle(x, 0, diameter=10)
+        sw.end_sketch()
+        sw.feature.cut(5)
+    assert len(sw.ir) == 8
+    assert sim.counts["FeatureManager.FeatureCut"] == 0
+    sw.flush()
+    before, after = sw.last_ir
+    assert (len(before), len(after)) == (8, 5)
+    assert sim.counts["FeatureManager.FeatureCut"] == 1
+    assert feature_names(sim) == ["Sketch1", "Cut-Extrude1"]
+    assert sw.ir == []
+
+
+def test_deferred_results_resolve_on_use(sim):
+    sw = SolidWorksAutomation(backend=sim, optimize_ops=True)
+    sw.new_sketch("Front")
+    sw.sketch.rectangle_centered(100, 50)
+    sw.end_sketch()
+    boss = sw.feature.extrude(20)
+    cuts = []
+    for x in (-25, 25):
+        sw.new_sketch("Front")
+        sw.sketch.circle(x, 0, diameter=10)
+        sw.end_sketch()
+        cuts.append(sw.feature.cut(5))
+    sw.new_sketch("Front")
+    sw.end_sketch()
+    empty = sw.feature.cut(5)
+    assert sim.counts["FeatureManager.FeatureCut"] == 0
+    assert boss.Name == "Boss-Extrude1"             # Zugriff führt flush() aus
+    assert sw.ir == []
+    assert cuts[0].value is cuts[1].value           # verschmolzen: ein Feature
+    assert cuts[0].Name == "Cut-Extrude1"
+    assert empty.value is None and not empty
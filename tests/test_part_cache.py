@@ -0,0 +1,144 @@
+"""Inhaltsadressierter Part-Cache."""
+
+import os
+
+import pytest
+
+from sw_automation import PartCache, SketchOp, SolidWorksAutomation
+from sw_simulator import SimulatorBackend
+
+from conftest import box, feature_names
+
+
+def _ops(depth: float) -> list:
+    return [SketchOp("sketch", "begin", {"plane": "Front"}),
+            SketchOp("entity", "circle", {"cx": 0, "cy": 0, "diameter": 10}),
+            SketchOp("sketch", "end"),
+            SketchOp("feature", "extrude", {"depth": depth})]
+
+
+def test_key_depends_on_ops_template_and_revision(tmp_path):
+    cache = PartCache(str(tmp_path))
+    key = cache.key(_ops(20))
+    assert key == cache.key(_ops(20))
+    assert key != cache.key(_ops(21))
+    assert key != cache.key(_ops(20), template="a.prtdot")
+    assert key != cache.key(_ops(20), revision="30.0.0")
+    assert key == cache.key(_ops(20.0))            # int und float gleich
+
+
+def test_store_lookup_and_evict(tmp_path):
+    cache = PartCache(str(tmp_path / "cache"), max_bytes=15)
+    for i in range(3):
+        source = tmp_path / f"p{i}.sldprt"
+        source.write_text("0123456789")
+        cache.store(f"k{i}", str(source))
+    assert cache.stats()["entries"] == 1
+    assert cache.evictions == 2
+    assert cache.lookup("k0") is None
+    assert cache.lookup("k2").endswith("k2.sldprt")
+    assert PartCache(str(tmp_path / "cache")).stats()["entries"] == 1
+
+
+def test_second_session_restores_from_cache(sim, tmp_path):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=sim, part_cache=cache)
+    box(sw)
+    sw.save(str(tmp_path / "a.sldprt"))
+    assert cache.stores == 1
+
+    sw = SolidWorksAutomation(backend=sim, part_cache=cache)
+    sim.reset_stats()
+    box(sw)
+    sw.save(str(tmp_path / "b.sldprt"))
+    assert cache.hits == 1
+    assert sim.counts["FeatureManager.FeatureExtrusion3"] == 0
+    assert os.path.exists(tmp_path / "b.sldprt")
+
+
+def _hole(sw):
+    sw.new_sketch("Front")
+    sw.sketch.circle(0, 0, diameter=10)
+    sw.end_sketch()
+    return sw.feature.cut(5)
+
+
+def test_cache_hit_then_more_ops_builds_full_model(tmp_path):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw)
+    sw.save(str(tmp_path / "a.sldprt"))
+
+    sim = SimulatorBackend(sleep=False)
+    sw = SolidWorksAutomation(backend=sim, part_cache=cache)
+    extrude = box(sw)
+    sw.save(str(tmp_path / "b.sldprt"))
+    assert cache.hits == 1 and feature_names(sim) == []
+    cut = _hole(sw)
+    sw.save(str(tmp_path / "c.sldprt"))
+    assert cache.misses == 2 and cache.stores == 2
+    assert sim.counts["FeatureManager.FeatureExtrusion3"] == 1
+    assert feature_names(sim) == ["Sketch1", "Boss-Extrude1", "Sketch2", "Cut-Extrude1"]
+    assert (extrude.Name, cut.Name) == ("Boss-Extrude1", "Cut-Extrude1")
+    # Der gespeicherte Stand liegt unter dem vollständigen Verlauf im Cache
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw)
+    _hole(sw)
+    sw.save(str(tmp_path / "d.sldprt"))
+    assert cache.hits == 2
+
+
+def test_model_access_after_cache_hit_builds_model(tmp_path):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw)
+    sw.save(str(tmp_path / "a.sldprt"))
+
+    sim = SimulatorBackend(sleep=False)
+    sw = SolidWorksAutomation(backend=sim, part_cache=cache)
+    box(sw)
+    sw.save(str(tmp_path / "b.sldprt"))
+    assert feature_names(sim) == []
+    sw.model
+    assert feature_names(sim) == ["Sketch1", "Boss-Extrude1"]
+
+
+def test_missing_cache_files_are_tolerated(tmp_path):
+    cache = PartCache(str(tmp_path / "cache"), max_bytes=15)
+    for i in range(2):
+        source = tmp_path / f"p{i}.sldprt"
+        source.write_text("0123456789")
+        cache.store(f"k{i}", str(source))
+        os.remove(cache.lookup(f"k{i}"))
+    assert cache.evictions == 1
+    assert not cache.restore("k1", str(tmp_path / "out.sldprt"))
+    assert cache.stats()["entries"] == 0
+    cache.store("k2", str(tmp_path / "p0.sldprt"))
+    os.remove(cache.lookup("k2"))
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("access", [lambda sw: sw.model,
+                                    lambda sw: sw.select_face("Face1"),
+                                    lambda sw: sw.select_edge(0)])
+def test_raw_model_access_makes_document_uncacheable(tmp_path, access):
+    cache = PartCache(str(tmp_path / "cache"))
+    sw = SolidWorksAutomation(backend=SimulatorBackend(sleep=False), part_cache=cache)
+    box(sw)
+    access(sw)
+    sw.save(str(tmp_path / "a.sldprt"))
+    assert (cache.misses, cache.stores) == (0, 0)
+
+
+def test_lookup_writes_index_only_on_close(tmp_path):
+    source = tmp_path / "p.sldprt"
+    source.write_text("0123456789")
+    with PartCache(str(tmp_path / "cache")) as cache:
+        cache.store("k", str(source))
+        index = tmp_path / "cache" / PartCache.INDEX
+        stored = index.read_text()
+        assert cache.lookup("k")
+        assert index.read_text() == stored
+    assert index.read_text() != stored
+    assert PartCache(str(tmp_path / "cache")).stats()["entries"] == 1
@@ -0,0 +1,15 @@
+"""COM-Profiler."""
+
+from sw_automation import SolidWorksAutomation
+from sw_profiler import ComProfiler
+
+from conftest import box
+
+
+def test_profiler_attributes_calls_to_operations(sim):
+    profiler = ComProfiler()
+    sw = SolidWorksAutomation(backend=profiler.backend(sim))
+    with profiler:
+        box(sw)
+    assert len(profiler.durations["FeatureManager.FeatureExtrusion3"]) == 1
+    assert "FeatureOperations.extrude" in profiler.operations
@@ -0,0 +1,49 @@
+"""Wiederholung abgewiesener Aufrufe (RetryPolicy, RetryingBackend)."""
+
+import pytest
+
+from sw_automation import RetryingBackend, RetryPolicy, SolidWorksAutomation
+from sw_simulator import SimulatedComError, SimulatorBackend
+
+from conftest import box
+
+
+def _retrying(busy: dict, **options):
+    """Simulator mit beschäftigter Instanz; Wartezeiten laufen in simulierter Zeit."""
+    sim = SimulatorBackend(sleep=False, latency=0.001, busy=busy)
+    policy = RetryPolicy(clock=lambda: sim.simulated_time, sleep=sim._delay,
+                         rng=lambda: 0.5, **options)
+    return sim, policy, SolidWorksAutomation(backend=RetryingBackend(sim, policy))
+
+
+def test_rejected_calls_are_retried_until_idle():
+    sim, policy, sw = _retrying({"FeatureManager.FeatureExtrusion3": 0.25}, initial=0.02)
+    box(sw)
+    sw.rebuild()
+    stats = policy.stats()
+    assert stats["calls_retried"] == 1
+    assert stats["retries"] == sim.rejected == 4       # 20 + 40 + 80 + 160 ms
+    assert stats["time_lost"] == pytest.approx(0.3)
+    assert stats["gave_up"] == 0
+    assert sim.counts["ModelDoc2.ForceRebuild3"] == 1
+
+
+def test_deadline_gives_up_quietly(capsys):
+    sim, policy, sw = _retrying({"FeatureManager.FeatureExtrusion3": 10.0},
+                                initial=0.02, deadline=0.5)
+    box(sw)
+    capsys.readouterr()
+    with pytest.raises(SimulatedComError):
+        sw.rebuild()
+    assert policy.gave_up == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_verbose_policy_reports_give_up(capsys):
+    sim, policy, sw = _retrying({"FeatureManager.FeatureExtrusion3": 10.0},
+                                initial=0.02, deadline=0.5, verbose=True)
+    box(sw)
+    capsys.readouterr()
+    with pytest.raises(SimulatedComError):
+        sw.rebuild()
+    assert "weiter abgewiesen" in capsys.readouterr().out
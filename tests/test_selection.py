@@ -0,0 +1,67 @@
+"""B-Rep-Snapshot und Mehrfachselektion."""
+
+import pytest
+
+from sw_simulator import SimModelDocExtension, SimulatedComError
+
+from conftest import box
+
+
+def test_select_many_is_one_call(sw, sim):
+    box(sw)
+    edges = list(sw.model.GetBodies2(0, True)[0].GetEdges())
+    sim.reset_stats()
+    assert sw.selection.select_many(edges) == len(edges) == 12
+    assert sim.counts["ModelDocExtension.MultiSelect2"] == 1
+    assert sim.counts["Edge.Select4"] == 0
+
+
+def test_select_many_fallback_without_bulk(sw, sim):
+    box(sw)
+    edges = list(sw.model.GetBodies2(0, True)[0].GetEdges())
+    sim.reset_stats()
+    assert sw.selection.select_many(edges, bulk=False) == 12
+    assert sim.counts["Edge.Select4"] == 12
+
+
+def test_select_many_without_multiselect_falls_back(sw, sim, monkeypatch):
+    monkeypatch.delattr(SimModelDocExtension, "MultiSelect2")
+    box(sw)
+    edges = list(sw.model.GetBodies2(0, True)[0].GetEdges())
+    sim.reset_stats()
+    assert sw.selection.select_many(edges) == 12
+    assert sim.counts["Edge.Select4"] == 12
+    assert sw.selection._unsupported == {"MultiSelect2"}
+
+
+def test_busy_rejection_does_not_disable_multiselect(sw, sim):
+    box(sw)
+    edges = list(sw.model.GetBodies2(0, True)[0].GetEdges())
+    sim.busy_until = sim.simulated_time + 1.0     # Server beschäftigt
+    with pytest.raises(SimulatedComError):
+        sw.selection.select_many(edges)
+    sim.busy_until = 0.0
+    sim.reset_stats()
+    assert sw.selection.select_many(edges) == 12
+    assert sim.counts["ModelDocExtension.MultiSelect2"] == 1
+
+
+def test_snapshot_queries_run_locally(sw, sim):
+    box(sw, 100, 50, 20)
+    snapshot = sw.selection.snapshot()
+    sim.reset_stats()
+    along_x = snapshot.edges.parallel_to((1, 0, 0))
+    assert len(along_x) == 4
+    front = snapshot.faces.facing((0, 0, 1))
+    assert len(front) == 1
+    assert sim.call_count == 0
+    assert snapshot.select(along_x) == 4
+    assert sim.counts["ModelDocExtension.MultiSelect2"] == 1
+
+
+def test_snapshot_reports_size_via_stats(sw, sim, capsys):
+    box(sw)
+    capsys.readouterr()
+    stats = sw.selection.snapshot().stats()
+    assert (stats["faces"], stats["edges"]) == (6, 12)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,134 @@
+"""Native Sketch-Pfade, Geometrie-Kernel, Spline-Puffer, Spline-Reduktion und Profilprüfung."""
+
+import array
+import math
+
+import pytest
+
+import sw_automation
+from sw_automation import (
+    SketchProfile, SketchValidationError, _spline_buffer, decimate_points, rect_grid,
+    validate_profile,
+)
+from sw_simulator import SimSketchManager, SimulatedComError
+
+
+def test_polygon_uses_native_call(sw, sim):
+    sw.new_sketch("Front")
+    sim.reset_stats()
+    sw.sketch.polygon(0, 0, 20, 360)
+    assert dict(sim.counts) == {"SketchManager.CreatePolygon": 1}
+
+
+def test_slot_uses_native_call(sw, sim):
+    sw.new_sketch("Front")
+    sim.reset_stats()
+    sw.sketch.slot(0, 0, 40, 0, 10)
+    assert dict(sim.counts) == {"SketchManager.CreateSketchSlot": 1}
+
+
+def test_missing_native_method_falls_back_to_lines(sw, sim, monkeypatch):
+    monkeypatch.delattr(SimSketchManager, "CreatePolygon")
+    sw.new_sketch("Front")
+    sim.reset_stats()
+    sw.sketch.polygon(0, 0, 20, 6)
+    sw.sketch.polygon(50, 0, 20, 6)
+    assert sim.counts["SketchManager.CreateLine"] == 12
+    assert sw._sketch._unsupported == {"CreatePolygon"}
+
+
+def test_busy_rejection_does_not_blacklist_native_method(sw, sim):
+    sw.new_sketch("Front")
+    sim.busy_until = sim.simulated_time + 1.0     # Server beschäftigt
+    with pytest.raises(SimulatedComError):
+        sw.sketch.polygon(0, 0, 20, 6)
+    assert sw._sketch._unsupported == set()
+    sim.busy_until = 0.0
+    sim.reset_stats()
+    sw.sketch.polygon(0, 0, 20, 6)
+    assert dict(sim.counts) == {"SketchManager.CreatePolygon": 1}
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_rect_grid_matches_without_numpy(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(sw_automation, "np", None)
+    points = [tuple(p) for p in rect_grid(3, 2, 10)]
+    assert points == [(-10, -5), (0, -5), (10, -5), (-10, 5), (0, 5), (10, 5)]
+
+
+def test_circles_and_polyline_use_one_call_per_entity(sw, sim):
+    sw.new_sketch("Front")
+    sim.reset_stats()
+    sw.sketch.circles(rect_grid(4, 5, 20), diameter=5)
+    sw.sketch.polyline([(0, 0), (10, 0), (10, 10)], closed=True)
+    assert dict(sim.counts) == {"SketchManager.CreateCircle": 20,
+                                "SketchManager.CreateLine": 3}
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_spline_buffer_accepts_pairs_and_flat_buffers(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(sw_automation, "np", None)
+    expected = [0.001, 0.002, 0.0, 0.003, 0.004, 0.0]
+    assert list(_spline_buffer([(1, 2), (3, 4)])) == pytest.approx(expected)
+    assert list(_spline_buffer(array.array("d", [1, 2, 3, 4]))) == pytest.approx(expected)
+
+
+def test_decimation_respects_tolerance():
+    points = [(i * 0.1, math.sin(i * 0.1)) for i in range(1000)]
+    kept, stats = decimate_points(points, 0.01)
+    assert stats.input_points == 1000
+    assert stats.kept_points == len(kept) < 500
+    assert stats.max_deviation <= 0.01
+    assert tuple(kept[0]) == points[0] and tuple(kept[-1]) == points[-1]
+
+
+def test_douglas_peucker_stays_n_log_n_on_zigzag(monkeypatch):
+    # Wachsende Amplitude: der entfernteste Punkt liegt immer am Rand
+    count = 4096
+    points = [(float(i), float((-1) ** i * i)) for i in range(count)]
+    scanned = []
+    farthest = sw_automation._farthest
+    monkeypatch.setattr(sw_automation, "_farthest",
+                        lambda xy, a, b: scanned.append(b - a) or farthest(xy, a, b))
+    kept, stats = decimate_points(points, 0.01)
+    assert stats.kept_points == count
+    assert sum(scanned) < 2 * count * math.log2(count)     # klassisch: ~count² / 2
+
+
+def test_spline_returns_decimation_stats(sw, sim, capsys):
+    sw.new_sketch("Front")
+    capsys.readouterr()
+    points = [(i * 0.5, 0.0) for i in range(200)]
+    stats = sw.sketch.spline(points, tolerance=0.01)
+    assert stats.kept_points == 2
+    assert sim.counts["SketchManager.CreateSpline2"] == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_validate_profile_reports_open_contour():
+    profile = SketchProfile("Front")
+    profile.add("line", 0, 0, 10, 0)
+    profile.add("line", 10, 0, 10, 10)
+    report = validate_profile(profile)
+    assert not report.ok
+    assert len(report.open_points) == 2
+
+
+def test_validate_profile_accepts_closed_rectangle():
+    profile = SketchProfile("Front")
+    profile.add_polyline([(0, 0), (10, 0), (10, 10), (0, 10)], closed=True)
+    report = validate_profile(profile)
+    assert report.ok and report.loops == 1
+
+
+def test_strict_validation_blocks_feature(sim):
+    from sw_automation import SolidWorksAutomation
+    sw = SolidWorksAutomation(backend=sim, validate_sketches="strict")
+    sw.new_sketch("Front")
+    sw.sketch.line(0, 0, 10, 0)
+    sw.end_sketch()
+    with pytest.raises(SketchValidationError):
+        sw.feature.extrude(10)
+    assert sim.counts["FeatureManager.FeatureExtrusion3"] == 0